@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path, PurePosixPath
+
+from style_profile_utils import DEFAULT_EXCLUDE_GLOBS, DEFAULT_INCLUDE_GLOBS, collect_markdown_files
+
+
+def _build_tree(root: Path, rng: random.Random, docs: int, excluded: int) -> None:
+    for index in range(docs):
+        path = root / "docs" / f"section-{index % 20:02d}" / f"page-{index:05d}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# Page {index}\n", encoding="utf-8")
+    (root / "README.md").write_text("# Readme\n", encoding="utf-8")
+    for index in range(excluded):
+        # 模擬 node_modules 等大型目錄：多層套件、少量 markdown 與大量其他檔案。
+        package = root / "node_modules" / f"pkg-{index % 200:03d}" / "lib" / f"mod-{index % 7}"
+        package.mkdir(parents=True, exist_ok=True)
+        name = f"file-{index:06d}.md" if rng.random() < 0.2 else f"file-{index:06d}.js"
+        (package / name).write_text("x\n", encoding="utf-8")
+        if index % 50 == 0:
+            (root / "node_modules" / f"pkg-{index % 200:03d}" / "README.md").write_text("# pkg\n", encoding="utf-8")
+
+
+def _reference_collect(root: Path, include_globs: list[str], exclude_globs: list[str]) -> list[Path]:
+    resolved_root = root.resolve()
+    discovered: dict[Path, str] = {}
+    for pattern in include_globs:
+        for path in resolved_root.glob(pattern):
+            if not path.is_file() or path.suffix.lower() != ".md":
+                continue
+            relative = path.relative_to(resolved_root).as_posix()
+            if any(PurePosixPath(relative).match(item) for item in exclude_globs):
+                continue
+            discovered[path.resolve()] = relative
+    return sorted(discovered.keys(), key=lambda path: discovered[path].lower())
+
+
+def _inside_pruned_directory(relative: str, exclude_globs: list[str]) -> bool:
+    parents = PurePosixPath(relative).parents
+    prefixes = [pattern[: -len("/**")] for pattern in exclude_globs if pattern.endswith("/**")]
+    return any(parent.match(prefix) for parent in list(parents)[:-1] for prefix in prefixes)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the single-walk markdown collector against Path.glob")
+    parser.add_argument("--docs", type=int, default=2000, help="markdown files outside excluded directories")
+    parser.add_argument("--excluded", type=int, default=40000, help="files inside node_modules")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per implementation (best is reported)")
+    parser.add_argument("--seed", type=int, default=5, help="random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    include_globs = list(DEFAULT_INCLUDE_GLOBS)
+    exclude_globs = list(DEFAULT_EXCLUDE_GLOBS)
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        _build_tree(root, random.Random(args.seed), args.docs, args.excluded)
+
+        def best(run) -> tuple[float, list[Path]]:
+            timings: list[float] = []
+            for _ in range(max(1, args.repeat)):
+                started = time.perf_counter()
+                result = run()
+                timings.append(time.perf_counter() - started)
+            return min(timings), result
+
+        glob_elapsed, expected = best(lambda: _reference_collect(root, include_globs, exclude_globs))
+        walk_elapsed, actual = best(lambda: collect_markdown_files(root, include_globs, exclude_globs))
+
+        resolved_root = root.resolve()
+        leaked = [path for path in expected if _inside_pruned_directory(path.relative_to(resolved_root).as_posix(), exclude_globs)]
+        leaked_set = set(leaked)
+        kept = [path for path in expected if path not in leaked_set]
+        if actual != kept:
+            raise SystemExit("Single-walk collector differs from Path.glob outside excluded directories.")
+
+    print("Markdown collection benchmark")
+    print(f"- Tree: {args.docs} docs, {args.excluded} files under node_modules")
+    print(f"- Collected: {len(actual)} file(s); Path.glob also returned {len(leaked)} nested file(s) under excluded directories")
+    print(f"- Path.glob + exclude match: {glob_elapsed:.3f}s")
+    print(f"- Single walk: {walk_elapsed:.3f}s")
+    print(f"- Speedup: {glob_elapsed / walk_elapsed:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from check_terminology import check_files
+from lint_prose_zhtw import lint_files
+from phrase_matcher import ProfilePhraseMatcher
+from style_profile_utils import ParsedDocument, apply_profile_defaults, load_documents, parse_document_text
+
+
+def _build_profile(rng: random.Random, chars: list[str], terms: int, phrases: int) -> dict:
+    preferred_terms: dict[str, list[str]] = {}
+    while len(preferred_terms) < terms:
+        preferred = "".join(rng.choices(chars, k=rng.randint(2, 4)))
+        alternatives = ["".join(rng.choices(chars, k=rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        # 刻意放入前綴重疊的詞彙，驗證巢狀與重疊命中都會回報。
+        alternatives.append(alternatives[0][:2])
+        preferred_terms[preferred] = alternatives
+    discouraged = ["".join(rng.choices(chars, k=rng.randint(3, 6))) for _ in range(phrases)]
+    return apply_profile_defaults(
+        {
+            "terminologyRules": {"preferredTerms": preferred_terms},
+            "proseRules": {"discouragedPhrases": discouraged, "maxLineLength": 10000},
+        }
+    )
+
+
+def _build_corpus(rng: random.Random, chars: list[str], profile: dict, files: int, lines: int) -> list[ParsedDocument]:
+    planted = [alt for alternatives in profile["terminologyRules"]["preferredTerms"].values() for alt in alternatives]
+    planted.extend(profile["proseRules"]["discouragedPhrases"])
+    filler = chars + list("，。 abc123")
+    documents: list[ParsedDocument] = []
+    for index in range(files):
+        body: list[str] = [f"# 文件 {index}", ""]
+        for _ in range(lines):
+            text = "".join(rng.choices(filler, k=rng.randint(30, 110)))
+            if rng.random() < 0.2:
+                cut = rng.randrange(len(text))
+                text = text[:cut] + rng.choice(planted) + text[cut:]
+            body.append(text)
+        documents.append(parse_document_text(Path(f"doc-{index:05d}.md"), "\n".join(body) + "\n"))
+    return documents
+
+
+def _reference_issues(documents: list[ParsedDocument], profile: dict) -> list[dict]:
+    preferred_terms = profile["terminologyRules"]["preferredTerms"]
+    discouraged_phrases = [str(item) for item in profile["proseRules"]["discouragedPhrases"]]
+    issues: list[dict] = []
+    for document in documents:
+        for line_number, raw_line in enumerate(document.lines, start=1):
+            if document.code_mask[line_number - 1]:
+                continue
+            for preferred, alternatives in preferred_terms.items():
+                for alternative in alternatives or []:
+                    alt = str(alternative)
+                    if alt and alt != preferred and alt in raw_line:
+                        issues.append(
+                            {
+                                "path": document.path,
+                                "line": line_number,
+                                "code": "TERM_PREFERRED",
+                                "message": f"發現詞彙「{alt}」，建議改用「{preferred}」以維持一致性。",
+                            }
+                        )
+            for phrase in discouraged_phrases:
+                if phrase and phrase in raw_line:
+                    issues.append(
+                        {
+                            "path": document.path,
+                            "line": line_number,
+                            "code": "DISCOURAGED_PHRASE",
+                            "message": f"發現建議避免的句型：「{phrase}」。",
+                        }
+                    )
+    return issues
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the phrase automaton against per-term substring loops")
+    parser.add_argument("--terms", type=int, default=400, help="preferred-term entries in the synthetic glossary")
+    parser.add_argument("--phrases", type=int, default=60, help="discouraged phrases")
+    parser.add_argument("--files", type=int, default=200, help="synthetic markdown files")
+    parser.add_argument("--lines", type=int, default=100, help="lines per file")
+    parser.add_argument("--seed", type=int, default=11, help="random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    chars = [chr(code) for code in range(0x4E00, 0x4E00 + 1200)]
+    profile = _build_profile(rng, chars, args.terms, args.phrases)
+    documents = load_documents(_build_corpus(rng, chars, profile, args.files, args.lines))
+
+    started = time.perf_counter()
+    expected = _reference_issues(documents, profile)
+    loop_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = ProfilePhraseMatcher(profile)
+    compile_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    terminology = check_files(documents, profile, matcher)
+    prose = lint_files(documents, profile, matcher)
+    automaton_elapsed = time.perf_counter() - started
+
+    actual = [issue for issue in terminology if issue["code"] == "TERM_PREFERRED"]
+    actual.extend(issue for issue in prose if issue["code"] == "DISCOURAGED_PHRASE")
+    order = {"TERM_PREFERRED": 0, "DISCOURAGED_PHRASE": 1}
+    actual.sort(key=lambda issue: (str(issue["path"]), issue["line"], order[issue["code"]]))
+    if actual != expected:
+        raise SystemExit("Automaton issues differ from the per-term substring loops.")
+
+    entries = sum(len(items) for items in profile["terminologyRules"]["preferredTerms"].values())
+    print("Phrase automaton benchmark")
+    print(f"- Glossary: {args.terms} terms / {entries} alternatives, {args.phrases} discouraged phrases")
+    print(f"- Lines: {args.files * args.lines}, matches: {len(expected)}")
+    print(f"- Substring loops: {loop_elapsed:.3f}s")
+    print(f"- Automaton: {automaton_elapsed:.3f}s (compile {compile_elapsed * 1000:.1f}ms)")
+    print(f"- Speedup: {loop_elapsed / automaton_elapsed:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
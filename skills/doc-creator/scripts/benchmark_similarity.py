@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from detect_duplicate_sections import find_duplicate_sections
+from detect_similarity import detect_similar_files
+from style_profile_utils import ParsedDocument, apply_profile_defaults, parse_document_text
+
+
+def _build_corpus(size: int, lines_per_doc: int, seed: int) -> list[ParsedDocument]:
+    rng = random.Random(seed)
+    vocabulary = [f"w{index:04d}" for index in range(3000)]
+    pool = [" ".join(rng.choices(vocabulary, k=rng.randint(6, 12))) for _ in range(max(size * 4, 1000))]
+
+    bodies: list[list[str]] = []
+    for index in range(size):
+        roll = rng.random()
+        if bodies and roll < 0.03:
+            body = list(rng.choice(bodies))
+        elif bodies and roll < 0.10:
+            body = list(rng.choice(bodies))
+            for _ in range(rng.randint(1, 6)):
+                body[rng.randrange(len(body))] = rng.choice(pool)
+        else:
+            body = rng.sample(pool, lines_per_doc)
+        bodies.append(body)
+
+    documents: list[ParsedDocument] = []
+    for index, body in enumerate(bodies):
+        text = "\n".join([f"# Document {index}", ""] + body) + "\n"
+        documents.append(parse_document_text(Path(f"doc-{index:06d}.md"), text))
+    return documents
+
+
+def _pair_keys(issues: list[dict]) -> set[tuple[str, str, str]]:
+    return {(str(issue["pathA"]), str(issue["pathB"]), issue["code"]) for issue in issues}
+
+
+def _pair_names(issues: list[dict]) -> list[tuple[str, str, str]]:
+    return [(Path(issue["pathA"]).name, Path(issue["pathB"]).name, issue["code"]) for issue in issues]
+
+
+def _benchmark_index(documents: list[ParsedDocument], profile: dict, args: argparse.Namespace) -> str:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        files: list[Path] = []
+        for document in documents:
+            path = root / document.path.name
+            path.write_text(document.text, encoding="utf-8")
+            files.append(path)
+        index_path = root / "similarity-index.db"
+
+        def run() -> tuple[float, list[dict]]:
+            started = time.perf_counter()
+            issues = detect_similar_files(
+                files, profile, args.threshold, num_perm=args.num_perm, bands=args.lsh_bands, index_path=index_path
+            )
+            return time.perf_counter() - started, issues
+
+        cold, cold_issues = run()
+        warm, warm_issues = run()
+        files[0].write_text(documents[1].text, encoding="utf-8")
+        files[-1].unlink()
+        del files[-1]
+        changed, changed_issues = run()
+        expected = detect_similar_files(files, profile, args.threshold, num_perm=args.num_perm, bands=args.lsh_bands)
+        if _pair_names(cold_issues) != _pair_names(warm_issues):
+            raise SystemExit("Warm index run reported different matches than the cold run.")
+        if _pair_names(changed_issues) != _pair_names(expected):
+            raise SystemExit("Index run after edits differs from a full scan.")
+        return f"; index cold {cold:.3f}s, warm {warm * 1000:.1f}ms, 1 edit + 1 delete {changed * 1000:.1f}ms"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH similarity detection against all-pairs")
+    parser.add_argument("--sizes", default="1000,5000,10000,50000", help="comma-separated corpus sizes")
+    parser.add_argument("--lines", type=int, default=30, help="lines per synthetic document")
+    parser.add_argument("--threshold", type=float, default=0.9, help="similarity threshold")
+    parser.add_argument("--num-perm", type=int, help="MinHash permutations per document")
+    parser.add_argument("--lsh-bands", type=int, help="LSH bands; auto when omitted")
+    parser.add_argument("--exhaustive-max", type=int, default=2000, help="largest size also run all-pairs")
+    parser.add_argument("--index-max", type=int, default=0, help="largest size also run with an on-disk similarity index")
+    parser.add_argument("--seed", type=int, default=7, help="random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    profile = apply_profile_defaults({})
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+
+    print("MinHash/LSH similarity benchmark")
+    print(f"- Threshold: {args.threshold}")
+    previous: tuple[int, float] | None = None
+    for size in sizes:
+        documents = _build_corpus(size, args.lines, args.seed)
+        started = time.perf_counter()
+        issues = detect_similar_files(
+            documents, profile, args.threshold, num_perm=args.num_perm, bands=args.lsh_bands
+        )
+        elapsed = time.perf_counter() - started
+        line = f"- {size} docs: lsh {elapsed:.3f}s ({elapsed * 1e6 / size:.1f} us/doc), {len(issues)} match(es)"
+        if previous is not None:
+            line += f", x{elapsed / previous[1]:.2f} time for x{size / previous[0]:.2f} docs"
+        previous = (size, elapsed)
+
+        if size <= args.exhaustive_max:
+            started = time.perf_counter()
+            expected = detect_similar_files(documents, profile, args.threshold, exhaustive=True)
+            exhaustive_elapsed = time.perf_counter() - started
+            found = _pair_keys(issues)
+            wanted = _pair_keys(expected)
+            if found - wanted:
+                raise SystemExit(f"LSH reported pairs that all-pairs did not: {sorted(found - wanted)[:5]}")
+            missed_duplicates = [key for key in wanted - found if key[2] == "DUPLICATE"]
+            if missed_duplicates:
+                raise SystemExit(f"LSH missed exact duplicates: {missed_duplicates[:5]}")
+            recall = len(found & wanted) / len(wanted) if wanted else 1.0
+            line += f"; all-pairs {exhaustive_elapsed:.3f}s, recall {recall:.3f}"
+        started = time.perf_counter()
+        sections = find_duplicate_sections(documents, profile)
+        line += f"; sections {time.perf_counter() - started:.3f}s ({len(sections)} group(s))"
+        if size <= args.index_max:
+            line += _benchmark_index(documents, profile, args)
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -7,7 +7,14 @@ import re
 import sys
 from pathlib import Path
 
-from style_profile_utils import collect_files_from_args, load_style_profile
+from phrase_matcher import ProfilePhraseMatcher
+from style_profile_utils import (
+    ParsedDocument,
+    collect_files_from_args,
+    load_documents,
+    load_style_profile,
+    map_file_chunks,
+)
 
 
 def _compile_banned_patterns(raw_patterns: list) -> list[tuple[re.Pattern[str], str, str]]:
@@ -30,42 +37,41 @@ def _compile_banned_patterns(raw_patterns: list) -> list[tuple[re.Pattern[str],
     return compiled
 
 
-def check_files(files: list[Path], profile: dict) -> list[dict]:
+def check_files(
+    files: list[Path | ParsedDocument],
+    profile: dict,
+    matcher: ProfilePhraseMatcher | None = None,
+    document_hits: list[dict[int, set[int]]] | None = None,
+) -> list[dict]:
     issues: list[dict] = []
     terminology_rules = profile.get("terminologyRules") or {}
-    preferred_terms = terminology_rules.get("preferredTerms") or {}
+    if matcher is None:
+        matcher = ProfilePhraseMatcher(profile)
     banned_patterns = _compile_banned_patterns(terminology_rules.get("bannedPatterns") or [])
 
-    for path in files:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        in_code_block = False
+    for document_index, document in enumerate(load_documents(files)):
+        path = document.path
+        code_mask = document.code_mask
+        line_hits = document_hits[document_index] if document_hits is not None else matcher.line_hits(document)
 
-        for line_number, raw_line in enumerate(text.splitlines(), start=1):
-            line = raw_line.rstrip("\n")
-            stripped = line.strip()
-
-            if stripped.startswith("```"):
-                in_code_block = not in_code_block
-                continue
-            if in_code_block:
+        for line_number, raw_line in enumerate(document.lines, start=1):
+            if code_mask[line_number - 1]:
                 continue
+            line = raw_line.rstrip("\n")
 
-            for preferred, alternatives in preferred_terms.items():
-                for alternative in alternatives or []:
-                    alt = str(alternative)
-                    if not alt or alt == preferred:
-                        continue
-                    if alt in line:
-                        issues.append(
-                            {
-                                "path": path,
-                                "line": line_number,
-                                "code": "TERM_PREFERRED",
-                                "message": (
-                                    f"發現詞彙「{alt}」，建議改用「{preferred}」以維持一致性。"
-                                ),
-                            }
-                        )
+            hits = line_hits.get(line_number - 1)
+            if hits:
+                for preferred, alt in matcher.preferred_terms_in(hits):
+                    issues.append(
+                        {
+                            "path": path,
+                            "line": line_number,
+                            "code": "TERM_PREFERRED",
+                            "message": (
+                                f"發現詞彙「{alt}」，建議改用「{preferred}」以維持一致性。"
+                            ),
+                        }
+                    )
 
             for regex, reason, pattern in banned_patterns:
                 if not regex.search(line):
@@ -83,6 +89,18 @@ def check_files(files: list[Path], profile: dict) -> list[dict]:
     return issues
 
 
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(profile: dict) -> None:
+    _WORKER_STATE["profile"] = profile
+    _WORKER_STATE["matcher"] = ProfilePhraseMatcher(profile)
+
+
+def _check_chunk(files: list[Path]) -> list[dict]:
+    return check_files(files, _WORKER_STATE["profile"], _WORKER_STATE["matcher"])
+
+
 def _print_issues(issues: list[dict]) -> None:
     for issue in issues:
         print(
@@ -98,6 +116,7 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--style-file", help="custom style profile JSON")
     parser.add_argument("--include", action="append", default=[], help="include glob (repeatable)")
     parser.add_argument("--exclude", action="append", default=[], help="exclude glob (repeatable)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes; files are checked in chunks")
     return parser.parse_args(argv)
 
 
@@ -111,7 +130,8 @@ def main(argv: list[str]) -> int:
         print("No markdown files matched the current filters.")
         return 0
 
-    issues = check_files(files, profile)
+    chunks = map_file_chunks(_check_chunk, files, args.jobs, _init_worker, (profile,))
+    issues = [item for chunk in chunks for item in chunk]
     if not issues:
         print(f"PASS: terminology validation passed for {len(files)} files.")
         return 0
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from detect_similarity import is_fingerprint_line, normalized_body_entries
+from style_profile_utils import ParsedDocument, collect_files_from_args, load_documents, load_style_profile
+
+
+MAX_LISTED_COPIES = 5
+
+
+def section_lines(document: ParsedDocument, min_line_length: int) -> list[tuple[int, str]]:
+    return [
+        (line_number, line)
+        for line_number, line in normalized_body_entries(document)
+        if is_fingerprint_line(line, min_line_length)
+    ]
+
+
+def resolve_section_min_lines(profile: dict, min_lines: int | None = None) -> int:
+    # 0（或負數）代表停用重複段落檢查。
+    if min_lines is None:
+        min_lines = (profile.get("similarityRules") or {}).get("duplicateSectionMinLines")
+    return 5 if min_lines is None else max(0, int(min_lines))
+
+
+def _build_postings(
+    documents_lines: list[list[tuple[int, str]]],
+) -> tuple[list[list[int]], list[list[int]], list[list[tuple[int, int]]]]:
+    line_ids: dict[str, int] = {}
+    postings: list[list[tuple[int, int]]] = []
+    sequences: list[list[int]] = []
+    line_numbers: list[list[int]] = []
+    for doc_index, entries in enumerate(documents_lines):
+        sequence: list[int] = []
+        numbers: list[int] = []
+        for line_number, line in entries:
+            line_id = line_ids.get(line)
+            if line_id is None:
+                line_id = line_ids[line] = len(postings)
+                postings.append([])
+            postings[line_id].append((doc_index, len(sequence)))
+            sequence.append(line_id)
+            numbers.append(line_number)
+        sequences.append(sequence)
+        line_numbers.append(numbers)
+    return sequences, line_numbers, postings
+
+
+def _shared_windows(
+    sequences: list[list[int]],
+    postings: list[list[tuple[int, int]]],
+    min_lines: int,
+) -> dict[tuple[int, ...], list[tuple[int, int]]]:
+    windows: dict[tuple[int, ...], list[tuple[int, int]]] = defaultdict(list)
+    for doc_index, sequence in enumerate(sequences):
+        shared_run = 0
+        for position, line_id in enumerate(sequence):
+            # 只出現一次的行不可能屬於重複段落，視窗只建立在連續共用行上。
+            shared_run = shared_run + 1 if len(postings[line_id]) > 1 else 0
+            if shared_run >= min_lines:
+                start = position - min_lines + 1
+                windows[tuple(sequence[start : position + 1])].append((doc_index, start))
+    return windows
+
+
+def find_duplicate_sections(
+    files: list[Path | ParsedDocument],
+    profile: dict,
+    min_lines: int | None = None,
+    documents_lines: list[list[tuple[int, str]]] | None = None,
+    exact_duplicates: set[frozenset[str]] | None = None,
+) -> list[dict]:
+    rules = profile.get("similarityRules") or {}
+    min_line_length = int(rules.get("minLineLength") or 12)
+    min_lines = resolve_section_min_lines(profile, min_lines)
+    if min_lines == 0:
+        return []
+
+    if documents_lines is None:
+        documents = load_documents(files)
+        paths = [document.path for document in documents]
+        documents_lines = [section_lines(document, min_line_length) for document in documents]
+    else:
+        paths = [item.path if isinstance(item, ParsedDocument) else item for item in files]
+    sequences, line_numbers, postings = _build_postings(documents_lines)
+    windows = _shared_windows(sequences, postings, min_lines)
+
+    # 每個重複視窗以第一次出現的位置為來源；同一來源與副本的位移（對角線）上連續的視窗合併為最長段落。
+    diagonals: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+    for occurrences in windows.values():
+        if len(occurrences) < 2:
+            continue
+        source_doc, source_position = occurrences[0]
+        for target_doc, target_position in occurrences[1:]:
+            if target_doc == source_doc and target_position - source_position < min_lines:
+                continue
+            diagonals[(source_doc, target_doc, target_position - source_position)].append(source_position)
+
+    groups: dict[tuple[int, int, int], list[tuple[int, int, int]]] = defaultdict(list)
+    for (source_doc, target_doc, offset), positions in diagonals.items():
+        positions.sort()
+        start = previous = positions[0]
+        for position in positions[1:] + [None]:
+            if position is not None and position == previous + 1:
+                previous = position
+                continue
+            end = previous + min_lines - 1
+            groups[(source_doc, start, end)].append((target_doc, start + offset, end + offset))
+            if position is not None:
+                start = previous = position
+
+    issues: list[dict] = []
+    for (source_doc, start, end), targets in sorted(groups.items()):
+        if exact_duplicates:
+            # 整份相同的檔案已由相似度檢查回報為 DUPLICATE，不再逐段重複回報。
+            source_path = str(paths[source_doc])
+            targets = [
+                target
+                for target in targets
+                if frozenset((source_path, str(paths[target[0]]))) not in exact_duplicates
+            ]
+            if not targets:
+                continue
+        copies = [
+            {
+                "path": str(paths[target_doc]),
+                "line": line_numbers[target_doc][target_start],
+                "endLine": line_numbers[target_doc][target_end],
+            }
+            for target_doc, target_start, target_end in sorted(targets)
+        ]
+        listed = "、".join(f"{copy['path']}:{copy['line']}-{copy['endLine']}" for copy in copies[:MAX_LISTED_COPIES])
+        if len(copies) > MAX_LISTED_COPIES:
+            listed += f" 等 {len(copies)} 處"
+        issues.append(
+            {
+                "path": paths[source_doc],
+                "line": line_numbers[source_doc][start],
+                "endLine": line_numbers[source_doc][end],
+                "code": "DUPLICATE_SECTION",
+                "lineCount": end - start + 1,
+                "copies": copies,
+                "message": f"連續 {end - start + 1} 行內容重複出現於：{listed}。建議抽出共用段落或改為連結。",
+            }
+        )
+    return issues
+
+
+def _print_issues(issues: list[dict]) -> None:
+    for issue in issues:
+        print(
+            f"WARN  {issue['path']}:{issue['line']}-{issue['endLine']} "
+            f"[{issue['code']}] {issue['message']}"
+        )
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Find sections copy-pasted across markdown files")
+    parser.add_argument("--root", default=".", help="root directory to scan")
+    parser.add_argument("--style", default="google-zhtw", help="built-in style profile")
+    parser.add_argument("--style-file", help="custom style profile JSON")
+    parser.add_argument("--include", action="append", default=[], help="include glob (repeatable)")
+    parser.add_argument("--exclude", action="append", default=[], help="exclude glob (repeatable)")
+    parser.add_argument("--min-lines", type=int, help="minimum consecutive duplicated lines to report (0 disables)")
+    parser.add_argument("--strict", action="store_true", help="return non-zero when duplicates exist")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    script_dir = Path(__file__).resolve().parent
+    profile = load_style_profile(args.style, args.style_file, script_dir)
+
+    files = collect_files_from_args(args, profile)
+    if not files:
+        print("No markdown files matched the current filters.")
+        return 0
+
+    issues = find_duplicate_sections(files, profile, args.min_lines)
+    if not issues:
+        print(f"PASS: duplicate section scan passed for {len(files)} files.")
+        return 0
+
+    _print_issues(issues)
+    print(f"WARN: duplicate section scan found {len(issues)} duplicated section(s).")
+    return 1 if args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
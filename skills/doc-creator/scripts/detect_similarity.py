@@ -4,116 +4,229 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import os
 import re
 import sys
+from collections import defaultdict
 from itertools import combinations
 from pathlib import Path
 
-from style_profile_utils import collect_files_from_args, load_style_profile
+from minhash_lsh import (
+    DEFAULT_FALSE_NEGATIVE_WEIGHT,
+    DEFAULT_NUM_PERM,
+    choose_lsh_bands,
+    lsh_candidate_pairs,
+    minhash_signature,
+)
+from similarity_index import SimilarityIndex
+from style_profile_utils import ParsedDocument, collect_files_from_args, load_documents, load_style_profile
 
 
-def _strip_frontmatter(text: str) -> str:
-    lines = text.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return text
+WHITESPACE_RE = re.compile(r"\s+")
 
-    for index in range(1, len(lines)):
-        if lines[index].strip() == "---":
-            return "\n".join(lines[index + 1 :])
-    return text
 
-
-def _build_line_set(text: str, min_line_length: int) -> set[str]:
-    cleaned = _strip_frontmatter(text)
-    in_code_block = False
-    line_set: set[str] = set()
-
-    for raw_line in cleaned.splitlines():
-        stripped = raw_line.strip()
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-            continue
-        if in_code_block:
+def normalized_body_entries(document: ParsedDocument) -> list[tuple[int, str]]:
+    entries: list[tuple[int, str]] = []
+    code_mask = document.code_mask
+    for index in range(document.body_start, len(document.lines)):
+        if code_mask[index]:
             continue
-        if not stripped or stripped.startswith("#"):
+        stripped = document.lines[index].strip()
+        if not stripped:
             continue
+        entries.append((index + 1, WHITESPACE_RE.sub(" ", stripped).strip().lower()))
+    return entries
 
-        normalized = re.sub(r"\s+", " ", stripped).strip().lower()
-        if len(normalized) < min_line_length:
-            continue
-        line_set.add(normalized)
 
-    return line_set
+def is_fingerprint_line(line: str, min_line_length: int) -> bool:
+    return not line.startswith("#") and len(line) >= min_line_length
 
 
-def _content_hash(text: str) -> str:
-    cleaned = _strip_frontmatter(text)
-    normalized_lines: list[str] = []
-    in_code_block = False
+def _normalized_body_lines(document: ParsedDocument) -> list[str]:
+    return [line for _, line in normalized_body_entries(document)]
+
+
+def _build_line_set(normalized_lines: list[str], min_line_length: int) -> set[str]:
+    return {line for line in normalized_lines if is_fingerprint_line(line, min_line_length)}
 
-    for raw_line in cleaned.splitlines():
-        stripped = raw_line.strip()
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-            continue
-        if in_code_block:
-            continue
-        if not stripped:
-            continue
-        normalized_lines.append(re.sub(r"\s+", " ", stripped).strip().lower())
 
+def _content_hash(normalized_lines: list[str]) -> str:
     payload = "\n".join(normalized_lines).encode("utf-8")
     return hashlib.sha1(payload).hexdigest()
 
 
+def fingerprint_document(document: ParsedDocument, min_line_length: int) -> dict:
+    normalized_lines = _normalized_body_lines(document)
+    return {
+        "path": document.path,
+        "lineSet": _build_line_set(normalized_lines, min_line_length),
+        "hash": _content_hash(normalized_lines),
+    }
+
+
+def _line_fingerprints(line_set: set[str]) -> set[int]:
+    return {
+        int.from_bytes(hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest(), "little") for line in line_set
+    }
+
+
+def _pair_similarity(left_hash: str, left_set: set, right_hash: str, right_set: set) -> tuple[float, bool] | None:
+    if not left_set and not right_set:
+        return None
+    if left_hash == right_hash:
+        return 1.0, True
+    union_size = len(left_set | right_set)
+    if union_size == 0:
+        return None
+    return len(left_set & right_set) / union_size, False
+
+
+def _build_issue(path_a: Path, path_b: Path, similarity: float, exact: bool) -> dict:
+    return {
+        "pathA": path_a,
+        "pathB": path_b,
+        "score": similarity,
+        "exact": exact,
+        "code": "DUPLICATE" if exact else "HIGH_SIMILARITY",
+    }
+
+
+def _resolve_bands(
+    threshold: float,
+    num_perm: int,
+    bands: int | None,
+    false_negative_weight: float,
+) -> tuple[int, int]:
+    if bands:
+        bands = min(bands, num_perm)
+        return bands, num_perm // bands
+    return choose_lsh_bands(threshold, num_perm, false_negative_weight)
+
+
+def _candidate_pairs(snapshots: list[dict], num_perm: int, bands: int, rows: int) -> list[tuple[int, int]]:
+    signatures = [
+        minhash_signature(snapshot["lineSet"], num_perm) if snapshot["lineSet"] else None for snapshot in snapshots
+    ]
+    candidates = lsh_candidate_pairs(signatures, bands, rows)
+
+    by_hash: dict[str, list[int]] = defaultdict(list)
+    for index, snapshot in enumerate(snapshots):
+        by_hash[snapshot["hash"]].append(index)
+    for members in by_hash.values():
+        if len(members) > 1:
+            candidates.update(combinations(members, 2))
+    return sorted(candidates)
+
+
+def _indexed_similar_files(
+    files: list[Path | ParsedDocument],
+    index_path: str | Path,
+    threshold: float,
+    min_line_length: int,
+    num_perm: int,
+    bands: int | None,
+    false_negative_weight: float,
+) -> list[dict]:
+    items = {str(item.path if isinstance(item, ParsedDocument) else item): item for item in files}
+    stats: dict[str, tuple[int, int]] = {}
+    for key in items:
+        stat = os.stat(key)
+        stats[key] = (stat.st_size, stat.st_mtime_ns)
+
+    settings = {
+        "threshold": threshold,
+        "minLineLength": min_line_length,
+        "numPerm": num_perm,
+        "lshBands": bands,
+        "lshFalseNegativeWeight": false_negative_weight,
+    }
+    index = SimilarityIndex(index_path, settings)
+    try:
+        changed, _ = index.sync(stats)
+        fingerprints: dict[str, tuple[str, set[int]]] = {}
+        if changed:
+            band_count, rows = _resolve_bands(threshold, num_perm, bands, false_negative_weight)
+            for key, document in zip(changed, load_documents([items[key] for key in changed])):
+                normalized_lines = _normalized_body_lines(document)
+                line_set = _build_line_set(normalized_lines, min_line_length)
+                content_hash = _content_hash(normalized_lines)
+                line_hashes = _line_fingerprints(line_set)
+                signature = minhash_signature(line_set, num_perm) if line_set else None
+                index.store(key, stats[key], content_hash, line_hashes, signature, band_count, rows)
+                fingerprints[key] = (content_hash, line_hashes)
+
+        for key, (content_hash, line_hashes) in fingerprints.items():
+            for other in index.candidates(key):
+                # 兩份文件都是新的或有變更時，只由路徑較小的一方比較一次。
+                if other in fingerprints and other < key:
+                    continue
+                other_hash, other_lines = fingerprints.get(other) or index.fingerprint(other)
+                result = _pair_similarity(content_hash, line_hashes, other_hash, other_lines)
+                if result is not None and result[0] >= threshold:
+                    index.record_match(key, other, result[0], result[1])
+        index.commit()
+        matches = index.matches()
+    finally:
+        index.close()
+
+    positions = {key: position for position, key in enumerate(items)}
+    paths = {key: item.path if isinstance(item, ParsedDocument) else item for key, item in items.items()}
+    ordered: list[tuple[int, int, float, bool]] = []
+    for path_a, path_b, similarity, exact in matches:
+        if path_a not in positions or path_b not in positions:
+            continue
+        left, right = sorted((positions[path_a], positions[path_b]))
+        ordered.append((left, right, similarity, exact))
+    keys = list(items)
+    return [
+        _build_issue(paths[keys[left]], paths[keys[right]], similarity, exact)
+        for left, right, similarity, exact in sorted(ordered)
+    ]
+
+
 def detect_similar_files(
-    files: list[Path],
+    files: list[Path | ParsedDocument],
     profile: dict,
     threshold_override: float | None = None,
+    num_perm: int | None = None,
+    bands: int | None = None,
+    exhaustive: bool = False,
+    index_path: str | Path | None = None,
+    fingerprints: list[dict] | None = None,
 ) -> list[dict]:
     rules = profile.get("similarityRules") or {}
     threshold = float(threshold_override if threshold_override is not None else rules.get("similarityThreshold", 0.9))
     min_line_length = int(rules.get("minLineLength") or 12)
-
-    snapshots: list[dict] = []
-    for path in files:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        snapshots.append(
-            {
-                "path": path,
-                "lineSet": _build_line_set(text, min_line_length),
-                "hash": _content_hash(text),
-            }
+    num_perm = int(num_perm or rules.get("minhashPermutations") or DEFAULT_NUM_PERM)
+    bands = bands or rules.get("lshBands")
+    false_negative_weight = float(rules.get("lshFalseNegativeWeight", DEFAULT_FALSE_NEGATIVE_WEIGHT))
+
+    if index_path:
+        if exhaustive or threshold <= 0:
+            raise ValueError("A similarity index requires LSH candidates; drop --exhaustive and use a positive threshold.")
+        return _indexed_similar_files(
+            files, index_path, threshold, min_line_length, num_perm, bands, false_negative_weight
         )
 
-    issues: list[dict] = []
-    for left, right in combinations(snapshots, 2):
-        left_set = left["lineSet"]
-        right_set = right["lineSet"]
-        if not left_set and not right_set:
-            continue
+    if fingerprints is not None:
+        snapshots = list(fingerprints)
+    else:
+        snapshots = [fingerprint_document(document, min_line_length) for document in load_documents(files)]
 
-        exact_duplicate = left["hash"] == right["hash"]
-        if exact_duplicate:
-            similarity = 1.0
-        else:
-            union_size = len(left_set | right_set)
-            if union_size == 0:
-                continue
-            similarity = len(left_set & right_set) / union_size
+    if exhaustive or threshold <= 0:
+        pairs = combinations(range(len(snapshots)), 2)
+    else:
+        band_count, rows = _resolve_bands(threshold, num_perm, bands, false_negative_weight)
+        pairs = _candidate_pairs(snapshots, num_perm, band_count, rows)
 
-        if similarity < threshold:
+    issues: list[dict] = []
+    for left_index, right_index in pairs:
+        left = snapshots[left_index]
+        right = snapshots[right_index]
+        result = _pair_similarity(left["hash"], left["lineSet"], right["hash"], right["lineSet"])
+        if result is None or result[0] < threshold:
             continue
-
-        issues.append(
-            {
-                "pathA": left["path"],
-                "pathB": right["path"],
-                "score": similarity,
-                "exact": exact_duplicate,
-                "code": "DUPLICATE" if exact_duplicate else "HIGH_SIMILARITY",
-            }
-        )
+        issues.append(_build_issue(left["path"], right["path"], result[0], result[1]))
 
     return issues
 
@@ -134,6 +247,10 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--include", action="append", default=[], help="include glob (repeatable)")
     parser.add_argument("--exclude", action="append", default=[], help="exclude glob (repeatable)")
     parser.add_argument("--threshold", type=float, help="override similarity threshold")
+    parser.add_argument("--num-perm", type=int, help="MinHash permutations per document")
+    parser.add_argument("--lsh-bands", type=int, help="LSH bands (rows = num-perm / bands); auto when omitted")
+    parser.add_argument("--exhaustive", action="store_true", help="compare every pair instead of LSH candidates")
+    parser.add_argument("--similarity-index", help="SQLite index reused across runs; only changed docs are fingerprinted")
     parser.add_argument("--strict", action="store_true", help="return non-zero when matches exist")
     return parser.parse_args(argv)
 
@@ -148,7 +265,15 @@ def main(argv: list[str]) -> int:
         print("No markdown files matched the current filters.")
         return 0
 
-    issues = detect_similar_files(files, profile, args.threshold)
+    issues = detect_similar_files(
+        files,
+        profile,
+        args.threshold,
+        num_perm=args.num_perm,
+        bands=args.lsh_bands,
+        exhaustive=args.exhaustive,
+        index_path=args.similarity_index,
+    )
     if not issues:
         print(f"PASS: similarity scan passed for {len(files)} files.")
         return 0
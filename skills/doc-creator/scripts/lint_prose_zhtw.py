@@ -7,7 +7,15 @@ import re
 import sys
 from pathlib import Path
 
-from style_profile_utils import collect_files_from_args, extract_headings, load_style_profile, normalize_heading
+from phrase_matcher import ProfilePhraseMatcher
+from style_profile_utils import (
+    ParsedDocument,
+    collect_files_from_args,
+    load_documents,
+    load_style_profile,
+    map_file_chunks,
+    normalize_heading,
+)
 
 
 def _is_paragraph_line(line: str) -> bool:
@@ -27,23 +35,30 @@ def _is_paragraph_line(line: str) -> bool:
     return True
 
 
-def lint_files(files: list[Path], profile: dict) -> list[dict]:
+def lint_files(
+    files: list[Path | ParsedDocument],
+    profile: dict,
+    matcher: ProfilePhraseMatcher | None = None,
+    document_hits: list[dict[int, set[int]]] | None = None,
+) -> list[dict]:
     warnings: list[dict] = []
     prose_rules = profile.get("proseRules") or {}
 
     max_line_length = int(prose_rules.get("maxLineLength") or 120)
     max_paragraph_lines = int(prose_rules.get("maxParagraphLines") or 8)
-    discouraged_phrases = [str(item) for item in (prose_rules.get("discouragedPhrases") or [])]
+    if matcher is None:
+        matcher = ProfilePhraseMatcher(profile)
     generic_headings = {
         normalize_heading(str(item)) for item in (prose_rules.get("genericHeadings") or []) if str(item).strip()
     }
 
-    for path in files:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        headings = extract_headings(text)
+    for document_index, document in enumerate(load_documents(files)):
+        path = document.path
+        code_mask = document.code_mask
+        line_hits = document_hits[document_index] if document_hits is not None else matcher.line_hits(document)
 
         previous_level = 0
-        for line_number, level, heading_text, normalized in headings:
+        for line_number, level, heading_text, normalized in document.headings:
             if normalized in generic_headings:
                 warnings.append(
                     {
@@ -65,7 +80,6 @@ def lint_files(files: list[Path], profile: dict) -> list[dict]:
                 )
             previous_level = level
 
-        in_code_block = False
         paragraph_start = 0
         paragraph_count = 0
         paragraph_warning_emitted = False
@@ -89,16 +103,12 @@ def lint_files(files: list[Path], profile: dict) -> list[dict]:
             paragraph_count = 0
             paragraph_warning_emitted = False
 
-        for line_number, raw_line in enumerate(text.splitlines(), start=1):
-            line = raw_line.rstrip("\n")
-            stripped = line.strip()
-
-            if stripped.startswith("```"):
+        for line_number, raw_line in enumerate(document.lines, start=1):
+            if code_mask[line_number - 1]:
+                # 程式碼區塊內不會累積段落行，逐行 flush 與只在 fence 行 flush 的結果相同。
                 flush_paragraph()
-                in_code_block = not in_code_block
-                continue
-            if in_code_block:
                 continue
+            line = raw_line.rstrip("\n")
 
             if len(line) > max_line_length and "http://" not in line and "https://" not in line:
                 warnings.append(
@@ -110,8 +120,9 @@ def lint_files(files: list[Path], profile: dict) -> list[dict]:
                     }
                 )
 
-            for phrase in discouraged_phrases:
-                if phrase and phrase in line:
+            hits = line_hits.get(line_number - 1)
+            if hits:
+                for phrase in matcher.discouraged_phrases_in(hits):
                     warnings.append(
                         {
                             "path": path,
@@ -134,6 +145,18 @@ def lint_files(files: list[Path], profile: dict) -> list[dict]:
     return warnings
 
 
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(profile: dict) -> None:
+    _WORKER_STATE["profile"] = profile
+    _WORKER_STATE["matcher"] = ProfilePhraseMatcher(profile)
+
+
+def _check_chunk(files: list[Path]) -> list[dict]:
+    return lint_files(files, _WORKER_STATE["profile"], _WORKER_STATE["matcher"])
+
+
 def _print_warnings(warnings: list[dict]) -> None:
     for warning in warnings:
         print(
@@ -149,6 +172,7 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--style-file", help="custom style profile JSON")
     parser.add_argument("--include", action="append", default=[], help="include glob (repeatable)")
     parser.add_argument("--exclude", action="append", default=[], help="exclude glob (repeatable)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes; files are checked in chunks")
     parser.add_argument("--strict", action="store_true", help="return non-zero when warnings exist")
     return parser.parse_args(argv)
 
@@ -163,7 +187,8 @@ def main(argv: list[str]) -> int:
         print("No markdown files matched the current filters.")
         return 0
 
-    warnings = lint_files(files, profile)
+    chunks = map_file_chunks(_check_chunk, files, args.jobs, _init_worker, (profile,))
+    warnings = [item for chunk in chunks for item in chunk]
     if not warnings:
         print(f"PASS: prose lint passed for {len(files)} files.")
         return 0
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections import defaultdict
+from itertools import combinations
+from typing import Iterable, Sequence
+
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_FALSE_NEGATIVE_WEIGHT = 0.95
+EMPTY_SLOT = 0xFFFFFFFF
+
+
+def _line_hashes(line: str, num_perm: int) -> tuple[int, ...]:
+    # SHAKE-128 的輸出位元彼此獨立，每 4 bytes 即為一個獨立的 32-bit 雜湊函式。
+    digest = hashlib.shake_128(line.encode("utf-8")).digest(4 * num_perm)
+    return struct.unpack(f"<{num_perm}I", digest)
+
+
+def minhash_signature(items: Iterable[str], num_perm: int = DEFAULT_NUM_PERM) -> tuple[int, ...]:
+    rows = [_line_hashes(item, num_perm) for item in items]
+    if not rows:
+        return (EMPTY_SLOT,) * num_perm
+    return tuple(map(min, zip(*rows)))
+
+
+def _candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    return 1.0 - (1.0 - similarity**rows) ** bands
+
+
+def _integrate(function, lower: float, upper: float, steps: int = 100) -> float:
+    if upper <= lower:
+        return 0.0
+    width = (upper - lower) / steps
+    total = (function(lower) + function(upper)) / 2.0
+    for step in range(1, steps):
+        total += function(lower + step * width)
+    return total * width
+
+
+def choose_lsh_bands(
+    threshold: float,
+    num_perm: int = DEFAULT_NUM_PERM,
+    false_negative_weight: float = DEFAULT_FALSE_NEGATIVE_WEIGHT,
+) -> tuple[int, int]:
+    # 以 S 曲線在門檻兩側的面積估計漏報與誤報，權重越偏向漏報，召回率越高、候選對越多。
+    false_negative_weight = min(max(false_negative_weight, 0.0), 1.0)
+    false_positive_weight = 1.0 - false_negative_weight
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = _integrate(lambda s: _candidate_probability(s, bands, rows), 0.0, threshold)
+            false_negative = _integrate(lambda s: 1.0 - _candidate_probability(s, bands, rows), threshold, 1.0)
+            error = false_positive_weight * false_positive + false_negative_weight * false_negative
+            if error < best_error:
+                best_error = error
+                best = (bands, rows)
+    return best
+
+
+def lsh_candidate_pairs(
+    signatures: Sequence[Sequence[int] | None],
+    bands: int,
+    rows: int,
+) -> set[tuple[int, int]]:
+    candidates: set[tuple[int, int]] = set()
+    for band in range(bands):
+        start = band * rows
+        buckets: dict[tuple[int, ...], list[int]] = defaultdict(list)
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            buckets[tuple(signature[start : start + rows])].append(index)
+        for members in buckets.values():
+            if len(members) > 1:
+                candidates.update(combinations(members, 2))
+    return candidates
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Sequence
+
+from style_profile_utils import ParsedDocument
+
+
+class PhraseAutomaton:
+    def __init__(self, phrases: Sequence[str]) -> None:
+        self.phrases = list(phrases)
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[tuple[int, ...]] = [()]
+        outputs: list[list[int]] = [[]]
+
+        for phrase_id, phrase in enumerate(self.phrases):
+            state = 0
+            for char in phrase:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(phrase_id)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                outputs[next_state].extend(outputs[self.fail[next_state]])
+
+        self.output = [tuple(items) for items in outputs]
+        self.alphabet = frozenset(self.goto[0].keys()).union(*(edges.keys() for edges in self.goto))
+        # 轉移表在掃描時依需要補齊（state, char）-> state，之後同一組合只需一次 dict 查詢。
+        self.delta: list[dict[str, int]] = [dict(edges) for edges in self.goto]
+
+    def _transition(self, state: int, char: str) -> int:
+        origin = state
+        while state and char not in self.goto[state]:
+            state = self.fail[state]
+        target = self.goto[state].get(char, 0)
+        self.delta[origin][char] = target
+        return target
+
+    def search(self, text: str) -> set[int]:
+        found: set[int] = set()
+        if not self.phrases:
+            return found
+        alphabet = self.alphabet
+        delta = self.delta
+        output = self.output
+        state = 0
+        for char in text:
+            if char not in alphabet:
+                state = 0
+                continue
+            next_state = delta[state].get(char)
+            if next_state is None:
+                next_state = self._transition(state, char)
+            state = next_state
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class ProfilePhraseMatcher:
+    def __init__(self, profile: dict) -> None:
+        terminology_rules = profile.get("terminologyRules") or {}
+        prose_rules = profile.get("proseRules") or {}
+
+        phrase_ids: dict[str, int] = {}
+        phrases: list[str] = []
+
+        def intern(phrase: str) -> int:
+            phrase_id = phrase_ids.get(phrase)
+            if phrase_id is None:
+                phrase_id = phrase_ids[phrase] = len(phrases)
+                phrases.append(phrase)
+            return phrase_id
+
+        # 保留 profile 中的列舉順序：同一行命中多個詞彙時，輸出順序與逐一比對時相同。
+        self.term_entries: list[tuple[str, str]] = []
+        term_phrase_ids: list[int] = []
+        for preferred, alternatives in (terminology_rules.get("preferredTerms") or {}).items():
+            for alternative in alternatives or []:
+                alt = str(alternative)
+                if not alt or alt == preferred:
+                    continue
+                self.term_entries.append((preferred, alt))
+                term_phrase_ids.append(intern(alt))
+
+        self.discouraged_phrases: list[str] = []
+        discouraged_phrase_ids: list[int] = []
+        for item in prose_rules.get("discouragedPhrases") or []:
+            phrase = str(item)
+            if not phrase:
+                continue
+            self.discouraged_phrases.append(phrase)
+            discouraged_phrase_ids.append(intern(phrase))
+
+        self.automaton = PhraseAutomaton(phrases)
+        self.term_entries_by_phrase: list[list[int]] = [[] for _ in phrases]
+        for entry_index, phrase_id in enumerate(term_phrase_ids):
+            self.term_entries_by_phrase[phrase_id].append(entry_index)
+        self.discouraged_by_phrase: list[list[int]] = [[] for _ in phrases]
+        for entry_index, phrase_id in enumerate(discouraged_phrase_ids):
+            self.discouraged_by_phrase[phrase_id].append(entry_index)
+
+    def line_hits(self, document: ParsedDocument) -> dict[int, set[int]]:
+        # 不在 matcher 中快取：同一份文件需要多個檢查共用時，由呼叫端算一次後傳入。
+        hits: dict[int, set[int]] = {}
+        if self.automaton.phrases:
+            code_mask = document.code_mask
+            for index, raw_line in enumerate(document.lines):
+                if code_mask[index]:
+                    continue
+                found = self.automaton.search(raw_line)
+                if found:
+                    hits[index] = found
+        return hits
+
+    def preferred_terms_in(self, phrase_ids: set[int]) -> list[tuple[str, str]]:
+        indices = sorted(index for phrase_id in phrase_ids for index in self.term_entries_by_phrase[phrase_id])
+        return [self.term_entries[index] for index in indices]
+
+    def discouraged_phrases_in(self, phrase_ids: set[int]) -> list[str]:
+        indices = sorted(index for phrase_id in phrase_ids for index in self.discouraged_by_phrase[phrase_id])
+        return [self.discouraged_phrases[index] for index in indices]
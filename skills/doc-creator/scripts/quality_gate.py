@@ -8,12 +8,52 @@ import sys
 from pathlib import Path
 
 from check_terminology import check_files
-from detect_similarity import detect_similar_files
+from detect_duplicate_sections import find_duplicate_sections, resolve_section_min_lines, section_lines
+from detect_similarity import detect_similar_files, fingerprint_document
 from lint_prose_zhtw import lint_files
-from style_profile_utils import collect_files_from_args, load_style_profile
+from phrase_matcher import ProfilePhraseMatcher
+from style_profile_utils import collect_files_from_args, load_documents, load_style_profile, map_file_chunks
 from validate_structure import validate_files
 
 
+CHUNK_KEYS = ("structure", "terminology", "prose", "fingerprints", "sectionLines")
+
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(profile: dict, with_fingerprints: bool, with_sections: bool) -> None:
+    rules = profile.get("similarityRules") or {}
+    _WORKER_STATE["profile"] = profile
+    _WORKER_STATE["matcher"] = ProfilePhraseMatcher(profile)
+    _WORKER_STATE["minLineLength"] = int(rules.get("minLineLength") or 12)
+    _WORKER_STATE["withFingerprints"] = with_fingerprints
+    _WORKER_STATE["withSections"] = with_sections
+
+
+def _gate_chunk(files: list[Path]) -> dict[str, list]:
+    profile = _WORKER_STATE["profile"]
+    matcher = _WORKER_STATE["matcher"]
+    min_line_length = _WORKER_STATE["minLineLength"]
+    documents = load_documents(files)
+    # 詞彙與用語檢查共用同一次多字串比對結果；結果只在本 chunk 內存活。
+    document_hits = [matcher.line_hits(document) for document in documents]
+    # 相似度與重複段落需要全域比對，worker 只回傳逐檔指紋，由主 process 合併後比對。
+    fingerprints = (
+        [fingerprint_document(document, min_line_length) for document in documents]
+        if _WORKER_STATE["withFingerprints"]
+        else []
+    )
+    return {
+        "structure": validate_files(documents, profile),
+        "terminology": check_files(documents, profile, matcher, document_hits),
+        "prose": lint_files(documents, profile, matcher, document_hits),
+        "fingerprints": fingerprints,
+        "sectionLines": (
+            [section_lines(document, min_line_length) for document in documents] if _WORKER_STATE["withSections"] else []
+        ),
+    }
+
+
 def _print_section(title: str, items: list[dict], max_details: int) -> None:
     if not items:
         return
@@ -25,7 +65,8 @@ def _print_section(title: str, items: list[dict], max_details: int) -> None:
                 f"[{item['code']}] score={item['score']:.3f}"
             )
             continue
-        print(f"- {item['path']}:{item['line']} [{item['code']}] {item['message']}")
+        line = f"{item['line']}-{item['endLine']}" if "endLine" in item else item["line"]
+        print(f"- {item['path']}:{line} [{item['code']}] {item['message']}")
     if len(items) > max_details:
         print(f"- ... and {len(items) - max_details} more")
 
@@ -52,6 +93,12 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--exclude", action="append", default=[], help="exclude glob (repeatable)")
     parser.add_argument("--strict", action="store_true", help="promote warnings to failures")
     parser.add_argument("--threshold", type=float, help="override similarity threshold")
+    parser.add_argument("--num-perm", type=int, help="MinHash permutations per document")
+    parser.add_argument("--lsh-bands", type=int, help="LSH bands (rows = num-perm / bands); auto when omitted")
+    parser.add_argument("--exhaustive", action="store_true", help="compare every pair instead of LSH candidates")
+    parser.add_argument("--similarity-index", help="SQLite index reused across runs; only changed docs are fingerprinted")
+    parser.add_argument("--duplicate-min-lines", type=int, help="minimum consecutive lines for duplicate sections (0 disables)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes; files are checked in chunks")
     parser.add_argument("--max-details", type=int, default=20, help="max items per category to print")
     parser.add_argument("--report-json", help="write summary report to JSON file")
     return parser.parse_args(argv)
@@ -67,13 +114,39 @@ def main(argv: list[str]) -> int:
         print("No markdown files matched the current filters.")
         return 0
 
-    structure_issues = validate_files(files, profile)
-    terminology_issues = check_files(files, profile)
-    prose_warnings = lint_files(files, profile)
-    similarity_warnings = detect_similar_files(files, profile, args.threshold)
+    section_min_lines = resolve_section_min_lines(profile, args.duplicate_min_lines)
+    chunks = map_file_chunks(
+        _gate_chunk, files, args.jobs, _init_worker, (profile, not args.similarity_index, section_min_lines > 0)
+    )
+    results = {key: [item for chunk in chunks for item in chunk[key]] for key in CHUNK_KEYS}
+    structure_issues = results["structure"]
+    terminology_issues = results["terminology"]
+    prose_warnings = results["prose"]
+    similarity_warnings = detect_similar_files(
+        files,
+        profile,
+        args.threshold,
+        num_perm=args.num_perm,
+        bands=args.lsh_bands,
+        exhaustive=args.exhaustive,
+        index_path=args.similarity_index,
+        fingerprints=None if args.similarity_index else results["fingerprints"],
+    )
+    exact_duplicates = {
+        frozenset((str(item["pathA"]), str(item["pathB"])))
+        for item in similarity_warnings
+        if item["code"] == "DUPLICATE"
+    }
+    section_warnings = find_duplicate_sections(
+        files,
+        profile,
+        section_min_lines,
+        documents_lines=results["sectionLines"],
+        exact_duplicates=exact_duplicates,
+    )
 
     hard_fail_count = len(structure_issues) + len(terminology_issues)
-    warning_count = len(prose_warnings) + len(similarity_warnings)
+    warning_count = len(prose_warnings) + len(similarity_warnings) + len(section_warnings)
 
     print("Doc Creator Quality Gate")
     print(f"- Scanned files: {len(files)}")
@@ -82,11 +155,13 @@ def main(argv: list[str]) -> int:
     print(f"- Terminology errors: {len(terminology_issues)}")
     print(f"- Prose warnings: {len(prose_warnings)}")
     print(f"- Similarity warnings: {len(similarity_warnings)}")
+    print(f"- Duplicate section warnings: {len(section_warnings)}")
 
     _print_section("Structure", structure_issues, args.max_details)
     _print_section("Terminology", terminology_issues, args.max_details)
     _print_section("Prose", prose_warnings, args.max_details)
     _print_section("Similarity", similarity_warnings, args.max_details)
+    _print_section("Duplicate sections", section_warnings, args.max_details)
 
     passed = hard_fail_count == 0 and (warning_count == 0 or not args.strict)
 
@@ -106,6 +181,7 @@ def main(argv: list[str]) -> int:
                 "terminology": _to_serializable(terminology_issues),
                 "prose": _to_serializable(prose_warnings),
                 "similarity": _to_serializable(similarity_warnings),
+                "duplicateSections": _to_serializable(section_warnings),
             },
         }
         report_path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import struct
+from pathlib import Path
+from typing import Iterable
+
+
+INDEX_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    lines BLOB NOT NULL,
+    signature BLOB
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    path_a TEXT NOT NULL,
+    path_b TEXT NOT NULL,
+    score REAL NOT NULL,
+    exact INTEGER NOT NULL,
+    PRIMARY KEY (path_a, path_b)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(content_hash);
+CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket);
+CREATE INDEX IF NOT EXISTS idx_bands_path ON bands(path);
+CREATE INDEX IF NOT EXISTS idx_matches_path_b ON matches(path_b);
+"""
+
+
+def pack_ints(values: Iterable[int], width: str = "Q") -> bytes:
+    values = list(values)
+    return struct.pack(f"<{len(values)}{width}", *values)
+
+
+def unpack_ints(payload: bytes, width: str = "Q") -> tuple[int, ...]:
+    return struct.unpack(f"<{len(payload) // struct.calcsize(width)}{width}", payload)
+
+
+class SimilarityIndex:
+    def __init__(self, path: str | Path, settings: dict) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(SCHEMA)
+        self.settings = dict(settings, version=INDEX_VERSION)
+        self.rebuilt = False
+        self._reset_if_settings_changed()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _reset_if_settings_changed(self) -> None:
+        expected = json.dumps(self.settings, sort_keys=True)
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+        if row is not None and row[0] == expected:
+            return
+        # 門檻、簽章長度或分段方式改變時，既有簽章與比對結果都不再有效。
+        with self.connection:
+            for table in ("documents", "bands", "matches", "meta"):
+                self.connection.execute(f"DELETE FROM {table}")
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('settings', ?)", (expected,))
+        self.rebuilt = row is not None
+
+    def sync(self, stats: dict[str, tuple[int, int]]) -> tuple[list[str], int]:
+        indexed = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.connection.execute("SELECT path, size, mtime_ns FROM documents")
+        }
+        removed = [path for path in indexed if path not in stats]
+        changed = [path for path, stat in stats.items() if indexed.get(path) != stat]
+        stale = removed + [path for path in changed if path in indexed]
+        if stale:
+            with self.connection:
+                rows = [(path,) for path in stale]
+                self.connection.executemany("DELETE FROM documents WHERE path = ?", rows)
+                self.connection.executemany("DELETE FROM bands WHERE path = ?", rows)
+                self.connection.executemany("DELETE FROM matches WHERE path_a = ? OR path_b = ?", [(p, p) for p in stale])
+        return changed, len(removed)
+
+    def store(
+        self,
+        path: str,
+        stat: tuple[int, int],
+        content_hash: str,
+        line_hashes: set[int],
+        signature: tuple[int, ...] | None,
+        bands: int,
+        rows: int,
+    ) -> None:
+        payload = pack_ints(signature, "I") if signature is not None else None
+        self.connection.execute(
+            "INSERT INTO documents (path, size, mtime_ns, content_hash, lines, signature) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, stat[0], stat[1], content_hash, pack_ints(sorted(line_hashes)), payload),
+        )
+        if payload is None:
+            return
+        # 與 lsh_candidate_pairs 相同只取前 bands 段，其餘簽章值不參與分桶。
+        width = rows * 4
+        self.connection.executemany(
+            "INSERT INTO bands (band, bucket, path) VALUES (?, ?, ?)",
+            [(band, payload[band * width : (band + 1) * width], path) for band in range(bands)],
+        )
+
+    def candidates(self, path: str) -> set[str]:
+        found = {
+            row[0]
+            for row in self.connection.execute(
+                "SELECT DISTINCT other.path FROM bands own"
+                " JOIN bands other ON other.band = own.band AND other.bucket = own.bucket"
+                " WHERE own.path = ? AND other.path != ?",
+                (path, path),
+            )
+        }
+        found.update(
+            row[0]
+            for row in self.connection.execute(
+                "SELECT other.path FROM documents own"
+                " JOIN documents other ON other.content_hash = own.content_hash"
+                " WHERE own.path = ? AND other.path != ?",
+                (path, path),
+            )
+        )
+        return found
+
+    def fingerprint(self, path: str) -> tuple[str, set[int]]:
+        content_hash, lines = self.connection.execute(
+            "SELECT content_hash, lines FROM documents WHERE path = ?", (path,)
+        ).fetchone()
+        return content_hash, set(unpack_ints(lines))
+
+    def record_match(self, path_a: str, path_b: str, score: float, exact: bool) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO matches (path_a, path_b, score, exact) VALUES (?, ?, ?, ?)",
+            (path_a, path_b, score, int(exact)),
+        )
+
+    def matches(self) -> list[tuple[str, str, float, bool]]:
+        return [
+            (path_a, path_b, score, bool(exact))
+            for path_a, path_b, score, exact in self.connection.execute(
+                "SELECT path_a, path_b, score, exact FROM matches"
+            )
+        ]
+
+    def commit(self) -> None:
+        self.connection.commit()
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import json
+import os
 import re
-from pathlib import Path, PurePosixPath
-from typing import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Sequence, TypeVar
 
 
+T = TypeVar("T")
+
 DEFAULT_INCLUDE_GLOBS = ["**/*.md"]
 DEFAULT_EXCLUDE_GLOBS = [
     ".git/**",
@@ -137,6 +142,9 @@ def apply_profile_defaults(profile: dict) -> dict:
 
     profile["similarityRules"].setdefault("similarityThreshold", 0.9)
     profile["similarityRules"].setdefault("minLineLength", 12)
+    profile["similarityRules"].setdefault("minhashPermutations", 128)
+    profile["similarityRules"].setdefault("lshFalseNegativeWeight", 0.95)
+    profile["similarityRules"].setdefault("duplicateSectionMinLines", 5)
 
     return profile
 
@@ -154,10 +162,108 @@ def load_style_profile(style: str, style_file: str | None, script_dir: Path) ->
     return apply_profile_defaults(profile)
 
 
-def _matches_any_glob(relative_path: str, patterns: Sequence[str]) -> bool:
-    normalized = relative_path.replace("\\", "/")
-    pure = PurePosixPath(normalized)
-    return any(pure.match(pattern) for pattern in patterns)
+def _glob_part_regex(part: str) -> str:
+    pieces: list[str] = []
+    index = 0
+    while index < len(part):
+        char = part[index]
+        if char == "*":
+            pieces.append("[^/]*")
+        elif char == "?":
+            pieces.append("[^/]")
+        elif char == "[":
+            end = part.find("]", index + 2 if part[index + 1 : index + 2] in ("!", "]") else index + 1)
+            if end == -1:
+                pieces.append(re.escape(char))
+            else:
+                body = part[index + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                pieces.append(f"[{body}]")
+                index = end
+        else:
+            pieces.append(re.escape(char))
+        index += 1
+    return "".join(pieces)
+
+
+def _compile_include_globs(patterns: Sequence[str]) -> list[list[re.Pattern[str] | None]]:
+    # 與 Path.glob 相同：由根目錄起算，`**` 代表零或多層目錄（以 None 表示）；以 `**` 結尾的樣式只會得到目錄。
+    compiled: list[list[re.Pattern[str] | None]] = []
+    for pattern in patterns:
+        parts = [part for part in pattern.replace("\\", "/").split("/") if part and part != "."]
+        if not parts or parts[-1] == "**":
+            continue
+        compiled.append([None if part == "**" else re.compile(_glob_part_regex(part) + r"\Z") for part in parts])
+    return compiled
+
+
+def _compile_exclude_globs(patterns: Sequence[str]) -> tuple[re.Pattern[str] | None, re.Pattern[str] | None]:
+    # 檔案比對沿用 PurePosixPath.match 的右錨定語意；`prefix/**` 另外編譯成目錄比對，
+    # 符合的目錄在走訪時直接剪除，不再進入 node_modules 等大型目錄。
+    file_alternatives: list[str] = []
+    directory_alternatives: list[str] = []
+    for pattern in patterns:
+        parts = [part for part in pattern.replace("\\", "/").split("/") if part]
+        if not parts:
+            continue
+        file_alternatives.append("/".join(_glob_part_regex(part) for part in parts))
+        if len(parts) > 1 and parts[-1] == "**":
+            directory_alternatives.append("/".join(_glob_part_regex(part) for part in parts[:-1]))
+
+    def compile_right_anchored(alternatives: list[str]) -> re.Pattern[str] | None:
+        if not alternatives:
+            return None
+        return re.compile("(?:^|/)(?:" + "|".join(alternatives) + r")\Z")
+
+    return compile_right_anchored(file_alternatives), compile_right_anchored(directory_alternatives)
+
+
+def _expand_recursive_states(
+    states: set[tuple[int, int]],
+    include_parts: list[list[re.Pattern[str] | None]],
+) -> frozenset[tuple[int, int]]:
+    # `**` 可以不比對任何目錄，因此同時保留跳過它之後的位置。
+    expanded = set(states)
+    pending = list(states)
+    while pending:
+        pattern_index, position = pending.pop()
+        if include_parts[pattern_index][position] is None and (pattern_index, position + 1) not in expanded:
+            expanded.add((pattern_index, position + 1))
+            pending.append((pattern_index, position + 1))
+    return frozenset(expanded)
+
+
+def _advance_directory_states(
+    states: frozenset[tuple[int, int]],
+    include_parts: list[list[re.Pattern[str] | None]],
+    name: str,
+    is_symlink: bool,
+) -> frozenset[tuple[int, int]]:
+    # 與 Path.glob 相同：`**` 不進入符號連結目錄，但一般樣式片段（含萬用字元）會跟隨符號連結。
+    advanced: set[tuple[int, int]] = set()
+    for pattern_index, position in states:
+        parts = include_parts[pattern_index]
+        part = parts[position]
+        if part is None:
+            if not is_symlink:
+                advanced.add((pattern_index, position))
+        elif position < len(parts) - 1 and part.match(name):
+            advanced.add((pattern_index, position + 1))
+    return _expand_recursive_states(advanced, include_parts)
+
+
+def _matches_file_states(
+    states: frozenset[tuple[int, int]],
+    include_parts: list[list[re.Pattern[str] | None]],
+    name: str,
+) -> bool:
+    for pattern_index, position in states:
+        parts = include_parts[pattern_index]
+        part = parts[position]
+        if position == len(parts) - 1 and part is not None and part.match(name):
+            return True
+    return False
 
 
 def collect_markdown_files(
@@ -166,18 +272,47 @@ def collect_markdown_files(
     exclude_globs: Sequence[str] | None,
 ) -> list[Path]:
     resolved_root = root.resolve()
-    include = list(include_globs or DEFAULT_INCLUDE_GLOBS)
-    exclude = list(exclude_globs or DEFAULT_EXCLUDE_GLOBS)
+    include_parts = _compile_include_globs(list(include_globs or DEFAULT_INCLUDE_GLOBS))
+    exclude_file_regex, exclude_directory_regex = _compile_exclude_globs(list(exclude_globs or DEFAULT_EXCLUDE_GLOBS))
+    if not include_parts:
+        return []
 
+    # 每個待走訪目錄帶著各樣式目前比對到的位置；沒有任何位置的目錄不可能有結果，直接剪除。
+    # 經由符號連結進入的目錄以實際路徑去重，與 Path.glob 搭配 resolve() 的結果相同。
     discovered: dict[Path, str] = {}
-    for pattern in include:
-        for path in resolved_root.glob(pattern):
-            if not path.is_file() or path.suffix.lower() != ".md":
+    initial_states = _expand_recursive_states({(index, 0) for index in range(len(include_parts))}, include_parts)
+    pending: list[tuple[str, str, frozenset[tuple[int, int]], bool]] = [(str(resolved_root), "", initial_states, False)]
+    while pending:
+        directory, relative_directory, states, via_symlink = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+        for entry in entries:
+            relative = f"{relative_directory}{entry.name}"
+            try:
+                is_symlink = entry.is_symlink()
+                if entry.is_dir():
+                    if exclude_directory_regex is not None and exclude_directory_regex.search(relative):
+                        continue
+                    child_states = _advance_directory_states(states, include_parts, entry.name, is_symlink)
+                    if child_states:
+                        pending.append((entry.path, relative + "/", child_states, via_symlink or is_symlink))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            name = entry.name
+            if not name.lower().endswith(".md") or name.rfind(".") <= 0:
+                continue
+            if not _matches_file_states(states, include_parts, name):
                 continue
-            relative = path.relative_to(resolved_root).as_posix()
-            if _matches_any_glob(relative, exclude):
+            if exclude_file_regex is not None and exclude_file_regex.search(relative):
                 continue
-            discovered[path.resolve()] = relative
+            path = Path(entry.path)
+            discovered[path.resolve() if via_symlink or is_symlink else path] = relative
 
     return sorted(discovered.keys(), key=lambda path: discovered[path].lower())
 
@@ -191,9 +326,12 @@ def collect_files_from_args(args, profile: dict) -> list[Path]:
 
 
 def parse_frontmatter(text: str) -> dict[str, str]:
-    lines = text.splitlines()
+    return split_frontmatter(text.splitlines())[0]
+
+
+def split_frontmatter(lines: list[str]) -> tuple[dict[str, str], int]:
     if not lines or lines[0].strip() != "---":
-        return {}
+        return {}, 0
 
     end_index = None
     for index in range(1, len(lines)):
@@ -201,7 +339,7 @@ def parse_frontmatter(text: str) -> dict[str, str]:
             end_index = index
             break
     if end_index is None:
-        return {}
+        return {}, 0
 
     data: dict[str, str] = {}
     for raw_line in lines[1:end_index]:
@@ -213,7 +351,7 @@ def parse_frontmatter(text: str) -> dict[str, str]:
         value = value.strip().strip('"').strip("'")
         if key:
             data[key] = value
-    return data
+    return data, end_index + 1
 
 
 def normalize_heading(text: str) -> str:
@@ -227,8 +365,12 @@ def normalize_heading(text: str) -> str:
 
 
 def extract_headings(text: str) -> list[tuple[int, int, str, str]]:
+    return extract_headings_from_lines(text.splitlines())
+
+
+def extract_headings_from_lines(lines: list[str]) -> list[tuple[int, int, str, str]]:
     headings: list[tuple[int, int, str, str]] = []
-    for line_number, raw_line in enumerate(text.splitlines(), start=1):
+    for line_number, raw_line in enumerate(lines, start=1):
         match = HEADING_RE.match(raw_line)
         if not match:
             continue
@@ -238,8 +380,15 @@ def extract_headings(text: str) -> list[tuple[int, int, str, str]]:
     return headings
 
 
-def infer_doc_type(file_path: Path, text: str, profile: dict) -> str:
-    frontmatter = parse_frontmatter(text)
+def infer_doc_type(
+    file_path: Path,
+    text: str,
+    profile: dict,
+    frontmatter: dict[str, str] | None = None,
+    headings: list[tuple[int, int, str, str]] | None = None,
+) -> str:
+    if frontmatter is None:
+        frontmatter = parse_frontmatter(text)
     supported_types = set(profile.get("structureRules", {}).keys())
     for key in ("doc_type", "docType", "type"):
         value = frontmatter.get(key)
@@ -250,7 +399,8 @@ def infer_doc_type(file_path: Path, text: str, profile: dict) -> str:
     target_tokens = set(re.findall(r"[a-z0-9-]+", target_name))
     first_heading = ""
     heading_tokens: set[str] = set()
-    headings = extract_headings(text)
+    if headings is None:
+        headings = extract_headings(text)
     if headings:
         first_heading = headings[0][2].lower()
         heading_tokens = set(re.findall(r"[a-z0-9-]+", first_heading))
@@ -271,3 +421,80 @@ def infer_doc_type(file_path: Path, text: str, profile: dict) -> str:
     if isinstance(default_doc_type, str) and default_doc_type:
         return default_doc_type
     return "how-to"
+
+
+@dataclass
+class ParsedDocument:
+    path: Path
+    text: str
+    lines: list[str]
+    code_mask: list[bool]
+    frontmatter: dict[str, str]
+    body_start: int
+    headings: list[tuple[int, int, str, str]]
+    normalized_headings: set[str]
+
+
+def build_code_mask(lines: list[str]) -> list[bool]:
+    # fence 行本身也標記為 True，各檢查器一律略過 fence 與區塊內容。
+    mask: list[bool] = []
+    in_code_block = False
+    for raw_line in lines:
+        if raw_line.strip().startswith("```"):
+            in_code_block = not in_code_block
+            mask.append(True)
+            continue
+        mask.append(in_code_block)
+    return mask
+
+
+def parse_document(path: Path) -> ParsedDocument:
+    return parse_document_text(path, path.read_text(encoding="utf-8", errors="replace"))
+
+
+def parse_document_text(path: Path, text: str) -> ParsedDocument:
+    lines = text.splitlines()
+    frontmatter, body_start = split_frontmatter(lines)
+    headings = extract_headings_from_lines(lines)
+    return ParsedDocument(
+        path=path,
+        text=text,
+        lines=lines,
+        code_mask=build_code_mask(lines),
+        frontmatter=frontmatter,
+        body_start=body_start,
+        headings=headings,
+        normalized_headings={heading[3] for heading in headings},
+    )
+
+
+def load_documents(files: Sequence[Path | ParsedDocument]) -> list[ParsedDocument]:
+    return [item if isinstance(item, ParsedDocument) else parse_document(item) for item in files]
+
+
+def chunk_files(files: Sequence[Path], jobs: int) -> list[list[Path]]:
+    if not files:
+        return []
+    if jobs <= 1:
+        return [list(files)]
+    # 切成約 jobs * 4 個連續區段：各 worker 負載較平均，且依區段順序串接即為序列輸出順序。
+    size = max(1, -(-len(files) // (jobs * 4)))
+    return [list(files[start : start + size]) for start in range(0, len(files), size)]
+
+
+def map_file_chunks(
+    func: Callable[[list[Path]], T],
+    files: Sequence[Path],
+    jobs: int = 1,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> list[T]:
+    chunks = chunk_files(files, jobs)
+    if jobs <= 1 or len(chunks) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(chunk) for chunk in chunks]
+
+    # 每個 worker 只在啟動時執行一次 initializer（編譯 profile、詞彙自動機），之後處理多個區段。
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)), initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, chunks))
@@ -7,10 +7,12 @@ import sys
 from pathlib import Path
 
 from style_profile_utils import (
+    ParsedDocument,
     collect_files_from_args,
-    extract_headings,
     infer_doc_type,
+    load_documents,
     load_style_profile,
+    map_file_chunks,
     normalize_heading,
 )
 
@@ -23,16 +25,16 @@ def _matches_heading_group(heading_set: set[str], candidates: list[str]) -> bool
     return False
 
 
-def validate_files(files: list[Path], profile: dict) -> list[dict]:
+def validate_files(files: list[Path | ParsedDocument], profile: dict) -> list[dict]:
     issues: list[dict] = []
     structure_rules = profile.get("structureRules") or {}
 
-    for path in files:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        headings = extract_headings(text)
-        heading_set = {heading[3] for heading in headings}
+    for document in load_documents(files):
+        path = document.path
+        headings = document.headings
+        heading_set = document.normalized_headings
 
-        doc_type = infer_doc_type(path, text, profile)
+        doc_type = infer_doc_type(path, document.text, profile, document.frontmatter, headings)
         rule = structure_rules.get(doc_type) or {}
 
         for group in rule.get("requiredHeadingGroups") or []:
@@ -69,6 +71,17 @@ def validate_files(files: list[Path], profile: dict) -> list[dict]:
     return issues
 
 
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(profile: dict) -> None:
+    _WORKER_STATE["profile"] = profile
+
+
+def _check_chunk(files: list[Path]) -> list[dict]:
+    return validate_files(files, _WORKER_STATE["profile"])
+
+
 def _print_issues(issues: list[dict]) -> None:
     for issue in issues:
         print(
@@ -84,6 +97,7 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--style-file", help="custom style profile JSON")
     parser.add_argument("--include", action="append", default=[], help="include glob (repeatable)")
     parser.add_argument("--exclude", action="append", default=[], help="exclude glob (repeatable)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes; files are checked in chunks")
     return parser.parse_args(argv)
 
 
@@ -97,7 +111,8 @@ def main(argv: list[str]) -> int:
         print("No markdown files matched the current filters.")
         return 0
 
-    issues = validate_files(files, profile)
+    chunks = map_file_chunks(_check_chunk, files, args.jobs, _init_worker, (profile,))
+    issues = [item for chunk in chunks for item in chunk]
     if not issues:
         print(f"PASS: structure validation passed for {len(files)} files.")
         return 0
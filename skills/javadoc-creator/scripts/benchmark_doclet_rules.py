@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+benchmark_doclet_rules 模組的主要功能。
+
+說明以合成 Javadoc 語料比較「每個區塊重新讀取 docletSpec」與「預先編譯 DocletRuleEngine」
+兩種驗證方式的耗時，並確認兩者輸出完全一致。
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from javadoc_utils import ScriptArgs
+from lint_javadocs import DocletRuleEngine, parse_javadoc_block, validate_doclet_structure
+from style_profile_utils import load_style_profile
+
+
+SUMMARIES = [
+    "取得使用者資料。",
+    "This method loads the value",
+    "此方法處理請求",
+    "Returns the configured timeout.",
+    "",
+]
+TAG_LINES = [
+    "@param name 使用者名稱。",
+    "@param timeout",
+    "@return 設定值。",
+    "@return",
+    "@throws IOException 讀取失敗時拋出。",
+    "@exception IllegalStateException",
+    "@deprecated 請改用 {@link Client#open()}。",
+    "@deprecated",
+    "@see Client",
+    "@since 1.2",
+]
+METHODS = [
+    {"name": "load", "returnType": "String", "params": ["String name"], "throwsList": ["IOException"]},
+    {"name": "close", "returnType": "void", "params": [], "throwsList": []},
+    {"name": "open", "returnType": "Client", "params": ["int timeout", "String name"], "throwsList": []},
+    {"name": "Client", "returnType": None, "params": ["String name"], "throwsList": [], "isConstructor": True},
+]
+
+
+def parse_benchmark_args(argv):
+    """
+    解析 benchmark 參數。
+
+    說明支援 `--blocks`、`--style` 與 `--json`，其餘參數忽略。
+
+    :param argv: 命令列參數。
+    :returns: (區塊數量, 風格名稱, 是否輸出 JSON)。
+    """
+    blocks = 100000
+    style = "vertx"
+    as_json = False
+    index = 0
+    while index < len(argv):
+        token = argv[index]
+        if token == "--blocks" and index + 1 < len(argv):
+            try:
+                blocks = max(1, int(argv[index + 1]))
+            except ValueError:
+                pass
+            index += 2
+            continue
+        if token == "--style" and index + 1 < len(argv):
+            style = argv[index + 1]
+            index += 2
+            continue
+        if token == "--json":
+            as_json = True
+        index += 1
+    return blocks, style, as_json
+
+
+def build_corpus(count, seed=7):
+    """
+    建立合成 Javadoc 語料。
+
+    說明每個區塊先組成原始註解行，再經 `parse_javadoc_block` 解析，
+    與實際 lint 流程使用相同的資料形狀。
+
+    :param count: 區塊數量。
+    :param seed: 亂數種子，固定後語料可重現。
+    :returns: (block, declaration_kind, method_info) 清單。
+    """
+    rnd = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        lines = ["/**", f" * {rnd.choice(SUMMARIES)}"]
+        if rnd.random() < 0.8:
+            lines.append(" *")
+        for _ in range(rnd.randint(0, 5)):
+            lines.append(f" * {rnd.choice(TAG_LINES)}")
+        lines.append(" */")
+        block = parse_javadoc_block(lines, 0, len(lines) - 1)
+
+        if rnd.random() < 0.75:
+            method_info = dict(rnd.choice(METHODS))
+            method_info["line"] = len(lines) + 1
+            corpus.append((block, "method", method_info))
+        else:
+            corpus.append((block, "type", None))
+    return corpus
+
+
+def time_run(corpus, doclet_spec):
+    """
+    計時一次完整驗證。
+
+    :param corpus: 合成語料。
+    :param doclet_spec: 原始 docletSpec 或已編譯的 DocletRuleEngine。
+    :returns: (秒數, 問題清單)。
+    """
+    issues = []
+    started = time.perf_counter()
+    for block, declaration_kind, method_info in corpus:
+        issues.extend(validate_doclet_structure("Bench.java", block, declaration_kind, method_info, doclet_spec))
+    return time.perf_counter() - started, issues
+
+
+def main():
+    """
+    執行 main 的核心流程並回傳結果。
+
+    說明此函式的主要流程、輸入限制與輸出語意。
+
+    :raises SystemExit: 當兩種驗證方式輸出不一致時拋出。
+    """
+    block_count, style, as_json = parse_benchmark_args(sys.argv[1:])
+    profile = load_style_profile(ScriptArgs(style=style), Path(__file__).resolve().parent)
+    doclet_spec = profile.get("docletSpec") or {}
+    corpus = build_corpus(block_count)
+
+    per_block_seconds, per_block_issues = time_run(corpus, doclet_spec)
+    started = time.perf_counter()
+    rules = DocletRuleEngine(doclet_spec)
+    compile_seconds = time.perf_counter() - started
+    compiled_seconds, compiled_issues = time_run(corpus, rules)
+
+    if per_block_issues != compiled_issues:
+        raise SystemExit("precompiled rule engine output differs from per-block validation")
+
+    result = {
+        "style": profile.get("name") or style,
+        "blocks": block_count,
+        "issues": len(compiled_issues),
+        "perBlockSeconds": round(per_block_seconds, 4),
+        "compileSeconds": round(compile_seconds, 6),
+        "compiledSeconds": round(compiled_seconds, 4),
+        "speedup": round(per_block_seconds / compiled_seconds, 2) if compiled_seconds else None,
+    }
+
+    if as_json:
+        sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    sys.stdout.write("Doclet rule benchmark\n")
+    sys.stdout.write(f"Style: {result['style']}\n")
+    sys.stdout.write(f"Blocks: {result['blocks']}\n")
+    sys.stdout.write(f"Issues: {result['issues']}\n")
+    sys.stdout.write(f"Per-block spec: {result['perBlockSeconds']}s\n")
+    sys.stdout.write(f"Precompiled engine: {result['compiledSeconds']}s (compile {result['compileSeconds']}s)\n")
+    sys.stdout.write(f"Speedup: {result['speedup']}x\n")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except SystemExit:
+        raise
+    except Exception as error:  # noqa: BLE001
+        sys.stderr.write(f"[benchmark_doclet_rules] {error}\n")
+        raise SystemExit(1)
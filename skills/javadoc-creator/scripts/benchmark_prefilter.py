@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+"""
+benchmark_prefilter 模組的主要功能。
+
+說明以合成 Java 語料（可另外加上實際專案）比較啟用與停用位元組前置過濾時
+`scan_missing_javadocs` 與 `lint_javadocs` 的輸出，確認前置過濾從不隱藏任何問題，並回報略過數量與耗時。
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lint_javadocs
+import scan_missing_javadocs
+from javadoc_utils import ScriptArgs, list_java_files, resolve_root
+from style_profile_utils import load_style_profile
+
+
+FRAGMENTS = [
+    "package com.example;",
+    "import java.util.List;",
+    "/** 操作結果。 */",
+    "/**\n * 參數 name。\n */",
+    "/** 執行 {@code run} 操作。 */",
+    "/** 回傳此方法對應的值。 */",
+    "// public class Hidden {}",
+    "/* protected void hidden() {} */",
+    "class Impl {\n    void run() {}\n}",
+    "/** 實作。 */\nclass Documented {\n    void run() {}\n}",
+    "public void orphan() {}",
+    "private void secret() {}",
+    "protected int size() { return 0; }",
+    "void helper() {}",
+    'String text = "/** 方法輸入參數。 */";',
+    "interface Api {\n    void call();\n}",
+    "@interface Marker {}",
+    "enum Mode { A, B }",
+    "record Point(int x, int y) {}",
+    "module demo { requires java.base; }",
+    "/**\n * Shared helper classes; see the record types in the parent package.\n */\npackage com.example.util;",
+    "static { }",
+    "",
+]
+
+
+def parse_benchmark_args(argv):
+    """
+    解析 benchmark 參數。
+
+    說明支援 `--files`、`--root`、`--style` 與 `--json`，其餘參數忽略。
+
+    :param argv: 命令列參數。
+    :returns: (合成檔案數量, 額外驗證的根目錄或 None, 風格名稱, 是否輸出 JSON)。
+    """
+    count = 2000
+    root = None
+    style = "vertx"
+    as_json = False
+    index = 0
+    while index < len(argv):
+        token = argv[index]
+        if token == "--files" and index + 1 < len(argv):
+            try:
+                count = max(1, int(argv[index + 1]))
+            except ValueError:
+                pass
+            index += 2
+            continue
+        if token == "--root" and index + 1 < len(argv):
+            root = argv[index + 1]
+            index += 2
+            continue
+        if token == "--style" and index + 1 < len(argv):
+            style = argv[index + 1]
+            index += 2
+            continue
+        if token == "--json":
+            as_json = True
+        index += 1
+    return count, root, style, as_json
+
+
+def write_corpus(directory, count, seed=11):
+    """
+    寫出合成 Java 語料。
+
+    說明每個檔案隨機組合 0 到 4 個片段，涵蓋 package-info（含 `classes` 等字的說明）、module-info、頂層方法、
+    只含 package-private 成員的型別、字串中的 `/**` 與 banned 句型等情況。
+
+    :param directory: 輸出目錄。
+    :param count: 檔案數量。
+    :param seed: 亂數種子，固定後語料可重現。
+    :returns: 檔案路徑清單。
+    """
+    rnd = random.Random(seed)
+    files = []
+    for position in range(count):
+        fragments = [rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, 4))]
+        path = Path(directory) / f"Sample{position}.java"
+        path.write_text("\n".join(fragments) + "\n", encoding="utf-8")
+        files.append(str(path))
+    return files
+
+
+def run_tool(module, files, root, initargs, prefilter):
+    """
+    以單一 process 執行 scan 或 lint worker。
+
+    :param module: `scan_missing_javadocs` 或 `lint_javadocs`。
+    :param files: 檔案路徑清單。
+    :param root: 掃描根目錄。
+    :param initargs: root 之後、prefilter 之前的 initializer 參數。
+    :param prefilter: 是否啟用前置過濾。
+    :returns: (秒數, 各檔結果清單, 略過數量)。
+    """
+    if module is scan_missing_javadocs:
+        module.init_scan_worker(root, *initargs, prefilter)
+        worker = module.scan_worker_file
+    else:
+        module.init_lint_worker(root, *initargs, prefilter)
+        worker = module.lint_worker_file
+
+    started = time.perf_counter()
+    outputs = [worker(file_path) for file_path in files]
+    seconds = time.perf_counter() - started
+    return seconds, [output[0] for output in outputs], sum(1 for output in outputs if output[2])
+
+
+def compare_tool(name, module, files, root, initargs):
+    """
+    比較單一工具啟用與停用前置過濾的輸出。
+
+    :param name: 工具名稱。
+    :param module: 工具模組。
+    :param files: 檔案路徑清單。
+    :param root: 掃描根目錄。
+    :param initargs: root 之後、prefilter 之前的 initializer 參數。
+    :returns: 比較結果字典。
+    :raises SystemExit: 當兩種模式輸出不一致時拋出。
+    """
+    full_seconds, full_results, _ = run_tool(module, files, root, initargs, False)
+    filtered_seconds, filtered_results, skipped = run_tool(module, files, root, initargs, True)
+    for file_path, full, filtered in zip(files, full_results, filtered_results):
+        if full != filtered:
+            raise SystemExit(f"{name}: prefilter changed results for {file_path}")
+    return {
+        "tool": name,
+        "files": len(files),
+        "skipped": skipped,
+        "results": sum(len(result) for result in full_results),
+        "fullSeconds": round(full_seconds, 4),
+        "prefilterSeconds": round(filtered_seconds, 4),
+    }
+
+
+def verify_tree(label, files, root, profile):
+    """
+    在同一批檔案上驗證 scan 與 lint，包含與不包含 private 宣告兩種設定。
+
+    :param label: 語料名稱。
+    :param files: 檔案路徑清單。
+    :param root: 掃描根目錄。
+    :param profile: 已載入的 style profile。
+    :returns: 比較結果清單。
+    """
+    results = []
+    for include_private in (False, True):
+        for name, module, initargs in (
+            ("scan", scan_missing_javadocs, (include_private, None)),
+            ("lint", lint_javadocs, (include_private, profile, None, None)),
+        ):
+            result = compare_tool(name, module, files, root, initargs)
+            result["corpus"] = label
+            result["includePrivate"] = include_private
+            results.append(result)
+    return results
+
+
+def main():
+    """
+    執行 main 的核心流程並回傳結果。
+
+    說明此函式的主要流程、輸入限制與輸出語意。
+
+    :raises SystemExit: 當前置過濾改變任何輸出時拋出。
+    """
+    count, extra_root, style, as_json = parse_benchmark_args(sys.argv[1:])
+    profile = load_style_profile(ScriptArgs(style=style), Path(__file__).resolve().parent)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="prefilter-") as directory:
+        root = str(Path(directory).resolve())
+        results.extend(verify_tree("synthetic", write_corpus(root, count), root, profile))
+    if extra_root:
+        root = resolve_root(extra_root, allow_archives=True)
+        results.extend(verify_tree(root, list_java_files(root), root, profile))
+
+    if as_json:
+        sys.stdout.write(json.dumps({"style": profile.get("name") or style, "runs": results}, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    sys.stdout.write("Source prefilter benchmark (outputs identical)\n")
+    sys.stdout.write(f"Style: {profile.get('name') or style}\n")
+    for result in results:
+        sys.stdout.write(
+            f"- {result['corpus']} {result['tool']} includePrivate={result['includePrivate']}: "
+            f"{result['skipped']}/{result['files']} skipped, {result['results']} results, "
+            f"{result['fullSeconds']}s -> {result['prefilterSeconds']}s\n"
+        )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except SystemExit:
+        raise
+    except Exception as error:  # noqa: BLE001
+        sys.stderr.write(f"[benchmark_prefilter] {error}\n")
+        raise SystemExit(1)
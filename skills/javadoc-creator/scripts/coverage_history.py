@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+"""
+coverage_history 模組的主要功能。
+
+以本機 SQLite 保存每個 commit 的 Javadoc 覆蓋率快照（模組與 Java package 兩個層級）。
+同一個 commit 重複記錄時取代舊快照；模組與 package 欄位建有索引，
+查詢某模組最近 N 個 commit 的趨勢不需要重新掃描歷史版本。
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT NOT NULL UNIQUE,
+    commit_time INTEGER,
+    recorded_at INTEGER NOT NULL,
+    root TEXT NOT NULL,
+    include_private INTEGER NOT NULL,
+    documentable INTEGER NOT NULL,
+    documented INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS module_coverage (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    module TEXT NOT NULL,
+    documentable INTEGER NOT NULL,
+    documented INTEGER NOT NULL,
+    PRIMARY KEY (run_id, module)
+);
+CREATE TABLE IF NOT EXISTS package_coverage (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    module TEXT NOT NULL,
+    package TEXT NOT NULL,
+    documentable INTEGER NOT NULL,
+    documented INTEGER NOT NULL,
+    PRIMARY KEY (run_id, module, package)
+);
+CREATE INDEX IF NOT EXISTS idx_module_coverage_module ON module_coverage(module, run_id);
+CREATE INDEX IF NOT EXISTS idx_package_coverage_package ON package_coverage(package, run_id);
+CREATE INDEX IF NOT EXISTS idx_package_coverage_module ON package_coverage(module, run_id);
+"""
+
+
+def coverage_percent(documented, documentable):
+    """
+    計算覆蓋率百分比。
+
+    :param documented: 已有 Javadoc 的宣告數量。
+    :param documentable: 需要 Javadoc 的宣告數量。
+    :returns: 百分比（小數兩位）；沒有需要文件的宣告時為 100.0。
+    """
+    if not documentable:
+        return 100.0
+    return round(documented * 100.0 / documentable, 2)
+
+
+class CoverageAggregator:
+    """
+    CoverageAggregator 的核心行為實作。
+
+    說明逐檔累加時同時更新 package 與模組兩層計數，整個掃描只需一次彙總。
+    """
+
+    def __init__(self):
+        """
+        建立空的彙總器。
+        """
+        self.packages = {}
+        self.modules = {}
+        self.documentable = 0
+        self.documented = 0
+
+    def add(self, module, package, documentable, documented):
+        """
+        累加單一檔案的計數。
+
+        :param module: 模組路徑。
+        :param package: Java package 名稱。
+        :param documentable: 需要 Javadoc 的宣告數量。
+        :param documented: 已有 Javadoc 的宣告數量。
+        """
+        for counts in (
+            self.packages.setdefault((module, package), [0, 0]),
+            self.modules.setdefault(module, [0, 0]),
+        ):
+            counts[0] += documentable
+            counts[1] += documented
+        self.documentable += documentable
+        self.documented += documented
+
+    def module_rows(self):
+        """
+        回傳模組層級的覆蓋率。
+
+        :returns: 依模組名稱排序的字典清單。
+        """
+        return [
+            {
+                "module": module,
+                "documentable": documentable,
+                "documented": documented,
+                "coverage": coverage_percent(documented, documentable),
+            }
+            for module, (documentable, documented) in sorted(self.modules.items())
+        ]
+
+    def package_rows(self):
+        """
+        回傳 package 層級的覆蓋率。
+
+        :returns: 依模組與 package 名稱排序的字典清單。
+        """
+        return [
+            {
+                "module": module,
+                "package": package,
+                "documentable": documentable,
+                "documented": documented,
+                "coverage": coverage_percent(documented, documentable),
+            }
+            for (module, package), (documentable, documented) in sorted(self.packages.items())
+        ]
+
+    def summary(self):
+        """
+        回傳整體覆蓋率。
+
+        :returns: 包含計數與百分比的字典。
+        """
+        return {
+            "documentable": self.documentable,
+            "documented": self.documented,
+            "coverage": coverage_percent(self.documented, self.documentable),
+        }
+
+
+class CoverageHistory:
+    """
+    CoverageHistory 的核心行為實作。
+
+    說明管理 SQLite 歷史資料庫；連線開啟時自動建立資料表與索引。
+    """
+
+    def __init__(self, path):
+        """
+        開啟（必要時建立）歷史資料庫。
+
+        :param path: SQLite 檔案路徑。
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """
+        關閉資料庫連線。
+        """
+        self.connection.close()
+
+    def record(self, commit, commit_time, root, include_private, aggregator):
+        """
+        寫入單一 commit 的覆蓋率快照。
+
+        說明整份快照在同一個 transaction 中寫入；同一個 commit 已有快照時先刪除再寫入。
+
+        :param commit: commit SHA 或其他識別字串。
+        :param commit_time: commit 時間（Unix 秒）；未知時為 None。
+        :param root: 掃描根目錄。
+        :param include_private: 是否包含 private 宣告。
+        :param aggregator: 已完成彙總的 CoverageAggregator。
+        :returns: 新快照的 run id。
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE commit_sha = ?", (commit,))
+            cursor = self.connection.execute(
+                "INSERT INTO runs (commit_sha, commit_time, recorded_at, root, include_private, documentable, documented)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    commit,
+                    commit_time,
+                    int(time.time()),
+                    str(root),
+                    int(bool(include_private)),
+                    aggregator.documentable,
+                    aggregator.documented,
+                ),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO module_coverage (run_id, module, documentable, documented) VALUES (?, ?, ?, ?)",
+                [(run_id, module, counts[0], counts[1]) for module, counts in aggregator.modules.items()],
+            )
+            self.connection.executemany(
+                "INSERT INTO package_coverage (run_id, module, package, documentable, documented)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, module, package, counts[0], counts[1])
+                    for (module, package), counts in aggregator.packages.items()
+                ],
+            )
+        return run_id
+
+    def trend(self, module=None, package=None, limit=50):
+        """
+        查詢最近 `limit` 個 commit 的覆蓋率趨勢。
+
+        說明依 commit 時間（未知時依寫入順序）取最近的快照，再以由舊到新的順序回傳。
+        指定 `package` 時回傳 package 層級（可再以 `module` 限定），只指定 `module` 時回傳模組層級，
+        兩者皆未指定時回傳整體覆蓋率。該層級在某個 commit 不存在時不會出現在結果中。
+
+        :param module: 模組路徑；None 表示不限定。
+        :param package: Java package 名稱；None 表示不限定。
+        :param limit: 最多回傳的 commit 數量。
+        :returns: 由舊到新的字典清單。
+        """
+        recent = (
+            "SELECT id, commit_sha, commit_time, COALESCE(commit_time, recorded_at) AS sort_time FROM runs"
+            " ORDER BY sort_time DESC, id DESC LIMIT ?"
+        )
+        columns = "SELECT r.id AS run_id, r.sort_time, r.commit_sha, r.commit_time"
+        if package is not None:
+            query = (
+                f"{columns}, SUM(p.documentable) AS documentable, SUM(p.documented) AS documented"
+                f" FROM ({recent}) r JOIN package_coverage p ON p.run_id = r.id AND p.package = ?"
+            )
+            params = [limit, package]
+            if module is not None:
+                query += " AND p.module = ?"
+                params.append(module)
+            query += " GROUP BY r.id"
+        elif module is not None:
+            query = (
+                f"{columns}, m.documentable, m.documented"
+                f" FROM ({recent}) r JOIN module_coverage m ON m.run_id = r.id AND m.module = ?"
+            )
+            params = [limit, module]
+        else:
+            query = f"{columns}, runs.documentable, runs.documented FROM ({recent}) r JOIN runs ON runs.id = r.id"
+            params = [limit]
+
+        rows = self.connection.execute(
+            f"SELECT * FROM ({query}) ORDER BY sort_time, run_id", params
+        ).fetchall()
+        return [
+            {
+                "commit": row["commit_sha"],
+                "commitTime": row["commit_time"],
+                "documentable": row["documentable"],
+                "documented": row["documented"],
+                "coverage": coverage_percent(row["documented"], row["documentable"]),
+            }
+            for row in rows
+        ]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""
+coverage_trend 模組的主要功能。
+
+說明讀取 `scan_missing_javadocs.py --history` 寫入的 SQLite 歷史資料庫，
+輸出整體、模組或 package 最近 N 個 commit 的 Javadoc 覆蓋率趨勢，不需要重新掃描。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from coverage_history import CoverageHistory
+from javadoc_utils import parse_args
+
+
+def main():
+    """
+    執行 main 的核心流程並回傳結果。
+
+    說明此函式的主要流程、輸入限制與輸出語意。
+
+    :raises ValueError: 當未指定或找不到歷史資料庫時拋出。
+    """
+    args = parse_args(sys.argv[1:])
+    if not args.history:
+        raise ValueError("--history is required")
+    if not Path(args.history).is_file():
+        raise ValueError(f"History database does not exist: {args.history}")
+
+    history = CoverageHistory(args.history)
+    try:
+        points = history.trend(args.module, args.package, args.limit)
+    finally:
+        history.close()
+
+    result = {
+        "history": args.history,
+        "module": args.module,
+        "package": args.package,
+        "limit": args.limit,
+        "points": points,
+    }
+
+    if args.json:
+        sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    scope = "project"
+    if args.package:
+        scope = f"package {args.package}" + (f" in {args.module}" if args.module else "")
+    elif args.module:
+        scope = f"module {args.module}"
+    sys.stdout.write("Javadoc coverage trend\n")
+    sys.stdout.write(f"Scope: {scope}\n")
+    sys.stdout.write(f"Commits: {len(points)}\n")
+    for point in points:
+        sys.stdout.write(
+            f"- {point['commit'][:12]}: {point['coverage']}% ({point['documented']}/{point['documentable']})\n"
+        )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as error:  # noqa: BLE001
+        sys.stderr.write(f"[coverage_trend] {error}\n")
+        raise SystemExit(1)
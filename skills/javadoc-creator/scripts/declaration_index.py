@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+"""
+declaration_index 模組的主要功能。
+
+以檔案內容雜湊為鍵，將每個 Java 檔的宣告掃描結果保存在磁碟上。
+內容未變的檔案可直接取用索引中的宣告種類、方法資訊、行號、插入點與
+Javadoc 區塊範圍，不必重新執行 lexer。工具版本或 `include_private`
+改變時，整份索引自動失效。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+from java_lexer import JavaDeclaration, scan_java_declarations
+from javadoc_utils import declaration_method_info, read_source_bytes, read_source_text
+
+
+INDEX_FORMAT = 1
+VERSION_SOURCES = ("java_lexer.py", "javadoc_utils.py", "declaration_index.py")
+
+
+def tool_version():
+    """
+    計算目前掃描工具的版本指紋。
+
+    說明以索引格式版本與 lexer、宣告解析相關原始碼的雜湊組成，
+    任何一個檔案改動都會讓既有索引失效。
+
+    :returns: 十六進位版本字串。
+    """
+    digest = hashlib.blake2b(str(INDEX_FORMAT).encode("ascii"), digest_size=16)
+    base = Path(__file__).resolve().parent
+    for name in VERSION_SOURCES:
+        digest.update(b"\0" + name.encode("ascii") + b"\0")
+        digest.update((base / name).read_bytes())
+    return digest.hexdigest()
+
+
+def content_hash(data):
+    """
+    計算檔案內容雜湊。
+
+    :param data: 檔案原始位元組。
+    :returns: 十六進位雜湊字串。
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def decode_source(data):
+    """
+    將原始位元組解碼為 Java 原始碼文字。
+
+    說明換行處理與 `Path.read_text` 的 universal newlines 相同，
+    確保索引命中與否不影響後續行號。
+
+    :param data: 檔案原始位元組。
+    :returns: 以 `\\n` 分行的文字。
+    """
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def build_index_entry(digest, content, class_name, include_private):
+    """
+    掃描原始碼並建立單一檔案的索引項目。
+
+    說明只保存在目前 `include_private` 設定下需要文件的宣告；
+    方法宣告另外保存 `parse_method_declaration` 的解析結果。
+
+    :param digest: 檔案內容雜湊。
+    :param content: Java 原始碼文字。
+    :param class_name: 由檔名推得的類別名稱。
+    :param include_private: 是否包含 private 宣告。
+    :returns: 可序列化為 JSON 的索引項目。
+    """
+    declarations, doc_blocks = scan_java_declarations(content)
+    records = []
+    for declaration in declarations:
+        if not declaration.is_documentable(include_private):
+            continue
+        record = asdict(declaration)
+        record["methodInfo"] = (
+            declaration_method_info(declaration, class_name) if declaration.kind == "method" else None
+        )
+        records.append(record)
+    return {
+        "hash": digest,
+        "declarations": records,
+        "docBlocks": [list(block) for block in doc_blocks],
+    }
+
+
+def entry_declarations(entry):
+    """
+    由索引項目還原宣告清單。
+
+    :param entry: 索引項目。
+    :returns: (JavaDeclaration, method_info) 清單，型別宣告的 method_info 為 None。
+    """
+    restored = []
+    for record in entry["declarations"]:
+        fields = dict(record)
+        method_info = fields.pop("methodInfo", None)
+        restored.append((JavaDeclaration(**fields), method_info))
+    return restored
+
+
+def load_file_declarations(file_path, rel_file, include_private, index=None, data=None):
+    """
+    讀取檔案並取得需要文件的宣告與 Javadoc 區塊範圍。
+
+    說明提供 `index` 時優先使用索引；否則直接以 lexer 掃描，不產生索引項目。
+
+    :param file_path: 檔案路徑。
+    :param rel_file: 相對於根目錄的路徑。
+    :param include_private: 是否包含 private 宣告。
+    :param index: DeclarationIndex；None 表示不使用索引。
+    :param data: 已讀取的檔案原始位元組；None 時由 `file_path` 讀取。
+    :returns: (原始碼文字, (JavaDeclaration, method_info) 清單, Javadoc 區塊範圍清單)。
+    """
+    if index is not None:
+        content, entry = index.resolve(file_path, rel_file, data)
+        return content, entry_declarations(entry), entry["docBlocks"]
+
+    content = read_source_text(file_path) if data is None else decode_source(data)
+    declarations, doc_blocks = scan_java_declarations(content)
+    class_name = Path(file_path).stem
+    records = []
+    for declaration in declarations:
+        if not declaration.is_documentable(include_private):
+            continue
+        method_info = declaration_method_info(declaration, class_name) if declaration.kind == "method" else None
+        records.append((declaration, method_info))
+    return content, records, doc_blocks
+
+
+class DeclarationIndex:
+    """
+    DeclarationIndex 的核心行為實作。
+
+    說明管理磁碟上的宣告索引：載入時檢查工具版本與 `include_private`，
+    掃描時回傳命中或重新建立的項目，結束時只保留本次掃描到的檔案並以原子方式寫回。
+    未指定路徑時仍可使用，只是不會讀寫磁碟。
+    """
+
+    def __init__(self, path=None, include_private=False):
+        """
+        建立物件並載入既有索引。
+
+        :param path: 索引檔路徑；None 表示不使用持久化索引。
+        :param include_private: 是否包含 private 宣告。
+        """
+        self.path = path
+        self.include_private = include_private
+        self.version = tool_version()
+        self.entries = {}
+        self.updated = {}
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.load()
+
+    def load(self):
+        """
+        讀取索引檔。
+
+        說明檔案不存在、格式損毀、工具版本或 `include_private` 不符時，
+        視為空索引重新建立。
+        """
+        path = Path(self.path)
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("toolVersion") != self.version or data.get("includePrivate") != self.include_private:
+            return
+        files = data.get("files")
+        if isinstance(files, dict):
+            self.entries = files
+
+    def resolve(self, file_path, rel_file, data=None):
+        """
+        取得檔案內容與宣告索引項目。
+
+        說明內容雜湊與索引相同時直接沿用，否則重新掃描並記錄在 `updated`。
+
+        :param file_path: 檔案路徑。
+        :param rel_file: 相對於根目錄的路徑，作為索引鍵。
+        :param data: 已讀取的檔案原始位元組；None 時由 `file_path` 讀取。
+        :returns: (原始碼文字, 索引項目)。
+        """
+        if data is None:
+            data = read_source_bytes(file_path)
+        digest = content_hash(data)
+        content = decode_source(data)
+        cached = self.entries.get(rel_file)
+        if cached is not None and cached.get("hash") == digest:
+            return content, cached
+
+        entry = build_index_entry(digest, content, Path(file_path).stem, self.include_private)
+        self.updated[rel_file] = entry
+        return content, entry
+
+    def take_update(self, rel_file):
+        """
+        取出單一檔案本次新建立的索引項目。
+
+        說明供 worker process 將結果送回主程序合併。
+
+        :param rel_file: 索引鍵。
+        :returns: 索引項目；命中既有索引時回傳 None。
+        """
+        return self.updated.pop(rel_file, None)
+
+    def record(self, rel_file, entry):
+        """
+        合併 `take_update` 的結果並累計命中統計。
+
+        :param rel_file: 索引鍵。
+        :param entry: 新建立的索引項目；命中既有索引時為 None。
+        """
+        if entry is None:
+            self.hits += 1
+            return
+        self.misses += 1
+        self.updated[rel_file] = entry
+
+    def save(self, rel_files, prune=True):
+        """
+        寫回索引檔。
+
+        說明預設只保留本次掃描到的檔案，已刪除或不再掃描的檔案會被移除；
+        增量模式（`prune=False`）只更新本次掃描的檔案，其餘項目原樣保留。
+        先寫入同目錄暫存檔再以 `os.replace` 取代，避免留下寫一半的索引。
+
+        :param rel_files: 本次掃描的相對路徑清單。
+        :param prune: 是否移除本次未掃描的檔案。
+        :returns: 寫入的檔案項目數量。
+        """
+        if not self.path:
+            return 0
+
+        files = {} if prune else dict(self.entries)
+        for rel_file in rel_files:
+            entry = self.updated.get(rel_file) or self.entries.get(rel_file)
+            if entry is not None:
+                files[rel_file] = entry
+
+        payload = {
+            "toolVersion": self.version,
+            "includePrivate": self.include_private,
+            "files": files,
+        }
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(payload, stream, ensure_ascii=False, separators=(",", ":"))
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        self.entries = files
+        self.updated = {}
+        return len(files)
+
+    def summary(self):
+        """
+        回傳索引使用統計。
+
+        :returns: 包含索引路徑與命中/重新掃描數量的字典。
+        """
+        return {"file": self.path, "hits": self.hits, "rescanned": self.misses}
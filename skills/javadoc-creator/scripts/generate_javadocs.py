@@ -11,22 +11,21 @@ import re
 import sys
 from pathlib import Path
 
+from java_lexer import scan_java_declarations
+from javadoc_pipeline import run_pipeline
 from javadoc_utils import (
-    collect_method_signature,
+    apply_doc_reorders,
+    declaration_method_info,
     detect_eol,
     extract_param_name,
-    find_insertion_index,
-    has_javadoc,
-    is_method_declaration,
-    is_method_start_line,
-    is_type_declaration,
-    list_java_files,
+    insert_line_blocks,
     parse_args,
-    parse_method_declaration,
-    parse_type_declaration,
+    plan_doc_reorders,
+    read_source_text,
     relative_path,
-    reorder_doc_before_annotations,
     resolve_root,
+    select_java_files,
+    write_source_text,
 )
 from style_profile_utils import (
     choose_method_summary,
@@ -37,6 +36,9 @@ from style_profile_utils import (
 )
 
 
+_WORKER_STATE = {}
+
+
 def ensure_summary_sentence(text):
     """
     執行 ensure_summary_sentence 的核心流程並回傳結果。
@@ -126,101 +128,120 @@ def build_method_javadoc(method_info, indent, profile):
     return lines
 
 
-def process_file(file_path, root, include_private, profile):
+def generate_source(file_path, raw, include_private, profile):
     """
-    執行 process_file 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param file_path: 檔案路徑。
-    :param root: 此參數會影響函式的執行行為。
+    為單一檔案內容補上缺漏的 Javadoc。
+
+    說明只處理記憶體中的文字，不讀寫檔案，可在管線的轉換階段或 worker process 中執行。
+
+    :param file_path: 檔案路徑，用於推得類別名稱。
+    :param raw: 檔案內容。
     :param include_private: 此參數會影響函式的執行行為。
     :param profile: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    :returns: (新內容, 插入數量)；內容未變時新內容為 None。
     """
-    raw = Path(file_path).read_text(encoding="utf-8")
     eol = detect_eol(raw)
     lines = re.split(r"\r?\n", raw)
     class_name = Path(file_path).stem
 
-    changed = reorder_doc_before_annotations(lines)
-    inserted = 0
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        if is_type_declaration(line) and not has_javadoc(lines, i):
-            type_info = parse_type_declaration(line)
-            if type_info:
-                indent = leading_indent(line)
-                doc = build_type_javadoc(type_info, indent, profile)
-                lines[i:i] = doc
-                inserted += 1
-                changed = True
-                i += len(doc)
-            i += 1
+    reorders = plan_doc_reorders(lines)
+    if reorders:
+        lines = apply_doc_reorders(lines, reorders)
+    changed = bool(reorders)
+
+    declarations, _ = scan_java_declarations("\n".join(lines))
+    insertions = []
+    occupied_lines = set()
+
+    for declaration in declarations:
+        # 同一行已有較早的宣告（例如單行 enum/record 與其成員）時不補：插入的區塊只會附掛到
+        # 較早的宣告，重跑會不斷疊加，因此每個實體行最多產生一個區塊。
+        blocked = declaration.insertion_index in occupied_lines
+        occupied_lines.update(range(declaration.insertion_index, declaration.line_index + 1))
+        if blocked or declaration.has_javadoc or not declaration.is_documentable(include_private):
             continue
 
-        if not is_method_start_line(line, include_private):
-            i += 1
-            continue
+        indent = leading_indent(lines[declaration.line_index])
+        if declaration.kind == "type":
+            doc = build_type_javadoc(declaration.type_info(), indent, profile)
+        else:
+            method_info = declaration_method_info(declaration, class_name)
+            if not method_info:
+                continue
+            doc = build_method_javadoc(method_info, indent, profile)
+        insertions.append((declaration.insertion_index, doc))
+
+    inserted = len(insertions)
+    if inserted:
+        lines = insert_line_blocks(lines, insertions)
+        changed = True
 
-        collected = collect_method_signature(lines, i)
-        if not is_method_declaration(collected["signature"], include_private):
-            i = collected["end_index"] + 1
-            continue
+    return (eol.join(lines) if changed else None), inserted
 
-        insertion_index = find_insertion_index(lines, i)
-        if has_javadoc(lines, insertion_index):
-            i = collected["end_index"] + 1
-            continue
 
-        method_info = parse_method_declaration(collected["signature"], class_name)
-        if not method_info:
-            i = collected["end_index"] + 1
-            continue
+def init_generate_worker(include_private, profile):
+    """
+    初始化轉換階段的共用狀態。
 
-        indent = leading_indent(lines[i])
-        doc = build_method_javadoc(method_info, indent, profile)
-        lines[insertion_index:insertion_index] = doc
-        inserted += 1
-        changed = True
-        i = collected["end_index"] + len(doc) + 1
+    :param include_private: 是否包含 private 宣告。
+    :param profile: 已載入的 style profile。
+    """
+    _WORKER_STATE["include_private"] = include_private
+    _WORKER_STATE["profile"] = profile
 
-    if changed:
-        Path(file_path).write_text(eol.join(lines), encoding="utf-8")
 
-    return {
-        "file": relative_path(file_path, root),
-        "inserted": inserted,
-        "changed": changed,
-    }
+def generate_worker(file_path, raw):
+    """
+    管線轉換階段：以共用狀態處理單一檔案內容。
+
+    :param file_path: 檔案路徑。
+    :param raw: 檔案內容。
+    :returns: (新內容, (是否變更, 插入數量))。
+    """
+    content, inserted = generate_source(file_path, raw, _WORKER_STATE["include_private"], _WORKER_STATE["profile"])
+    return content, (content is not None, inserted)
 
 
 def main():
     """
     執行 main 的核心流程並回傳結果。
     
-    說明此函式的主要流程、輸入限制與輸出語意。
+    說明讀取、轉換與寫回以管線方式重疊執行，summary 仍依檔案順序輸出。
     
     :returns: 函式回傳結果。
     """
     args = parse_args(sys.argv[1:])
     root = resolve_root(args.root)
     profile = load_style_profile(args, Path(__file__).resolve().parent)
-    files = list_java_files(root)
+    files = select_java_files(root, args)
 
     changed_files = 0
     inserted_total = 0
     per_file = []
 
-    for file_path in files:
-        result = process_file(file_path, root, args.include_private, profile)
-        if result["changed"]:
+    results = run_pipeline(
+        files,
+        read_source_text,
+        generate_worker,
+        write_source_text,
+        readers=args.readers,
+        jobs=args.jobs,
+        writers=args.writers,
+        queue_depth=args.queue_depth,
+        initializer=init_generate_worker,
+        initargs=(args.include_private, profile),
+    )
+    for file_path, (changed, inserted) in zip(files, results):
+        if changed:
             changed_files += 1
-            inserted_total += result["inserted"]
-            per_file.append(result)
+            inserted_total += inserted
+            per_file.append(
+                {
+                    "file": relative_path(file_path, root),
+                    "inserted": inserted,
+                    "changed": True,
+                }
+            )
 
     summary = {
         "root": root,
@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+
+"""
+java_lexer 模組的主要功能。
+
+以單次順向掃描將 Java 原始碼切成 token，並辨識型別與方法宣告、
+其 annotation 以及附掛的 Javadoc 區塊範圍。字串、text block、
+註解與泛型都在 token 層處理，因此不會把字串或註解內容誤判為宣告。
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<nl>\n)
+    |(?P<ws>[ \t\f\r]+)
+    |(?P<doc>/\*\*(?!/)[\s\S]*?(?:\*/|\Z))
+    |(?P<comment>/\*[\s\S]*?(?:\*/|\Z)|//[^\n]*)
+    |(?P<textblock>\"\"\"(?:[^"\\]|\\[\s\S]|"(?!""))*(?:\"\"\"|\Z))
+    |(?P<string>"(?:[^"\\\n]|\\.)*"?)
+    |(?P<char>'(?:[^'\\\n]|\\.)*'?)
+    |(?P<ident>[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*)
+    |(?P<number>\.?\d[\w.]*)
+    |(?P<symbol>.)
+    """,
+    re.VERBOSE,
+)
+
+MULTILINE_KINDS = {"doc", "comment", "textblock"}
+
+MODIFIERS = {
+    "public",
+    "protected",
+    "private",
+    "static",
+    "final",
+    "abstract",
+    "synchronized",
+    "native",
+    "default",
+    "strictfp",
+    "transient",
+    "volatile",
+    "sealed",
+}
+
+TYPE_KEYWORDS = {"class", "interface", "enum", "record"}
+
+VISIBILITY_MODIFIERS = ("public", "protected", "private")
+
+OPENING = {"(": ")", "{": "}", "[": "]"}
+
+
+@dataclass
+class JavaToken:
+    """
+    JavaToken 的核心行為實作。
+
+    說明 token 種類、原始文字、所在行（0-based）與字元位移。
+    空白與一般註解不會產生 token；Javadoc 註解以 `doc` 種類保留。
+    """
+    kind: str
+    text: str
+    line: int
+    start: int
+    end: int
+    end_line: int
+
+
+@dataclass
+class JavaDeclaration:
+    """
+    JavaDeclaration 的核心行為實作。
+
+    說明單一型別或方法宣告的位置與結構資訊，行號皆為 0-based 索引。
+    `insertion_index` 為第一個 annotation（或宣告本身）所在行，即補 Javadoc 的插入點；
+    `doc_start`/`doc_end` 為附掛 Javadoc 區塊的行範圍，沒有時為 None。
+    """
+    kind: str
+    name: str
+    line_index: int
+    end_index: int
+    insertion_index: int
+    signature: str
+    modifiers: list = field(default_factory=list)
+    annotations: list = field(default_factory=list)
+    doc_start: Optional[int] = None
+    doc_end: Optional[int] = None
+    doc_after_annotations: bool = False
+    type_kind: Optional[str] = None
+    enclosing_type: Optional[str] = None
+    enclosing_kind: Optional[str] = None
+
+    @property
+    def has_javadoc(self):
+        """
+        判斷宣告是否已附掛 Javadoc。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :returns: 條件判斷結果。
+        """
+        return self.doc_start is not None
+
+    @property
+    def visibility(self):
+        """
+        回傳宣告的存取層級。
+
+        說明介面與 annotation 型別的成員未標示時視為 `public`，其餘未標示者為 `package`。
+
+        :returns: `public`、`protected`、`private` 或 `package`。
+        """
+        for modifier in VISIBILITY_MODIFIERS:
+            if modifier in self.modifiers:
+                return modifier
+        if self.enclosing_kind in {"interface", "@interface"}:
+            return "public"
+        return "package"
+
+    @property
+    def is_override(self):
+        """
+        判斷宣告是否標註 `@Override`。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :returns: 條件判斷結果。
+        """
+        return any(annotation["name"] in {"Override", "java.lang.Override"} for annotation in self.annotations)
+
+    def is_documentable(self, include_private=False):
+        """
+        判斷宣告是否屬於需要 Javadoc 的範圍。
+
+        說明型別宣告排除 private；方法只納入 public/protected。
+        `include_private` 為 True 時兩者都納入 private。
+
+        :param include_private: 是否納入 private 宣告。
+        :returns: 條件判斷結果。
+        """
+        visibility = self.visibility
+        if visibility == "private":
+            return include_private
+        if self.kind == "type":
+            return True
+        return visibility in {"public", "protected"}
+
+    def type_info(self):
+        """
+        回傳型別宣告摘要資訊。
+
+        說明格式與 style profile 的 `choose_type_summary` 相容。
+
+        :returns: 含 `kind` 與 `name` 的字典。
+        """
+        return {"kind": self.type_kind, "name": self.name}
+
+
+def tokenize_java(content):
+    """
+    將 Java 原始碼切成 token 串流。
+
+    說明空白與一般註解直接略過，只追蹤行號；Javadoc 註解保留為 `doc` token。
+    未結束的字串或註解會吃到行尾或檔尾，不會拋出例外。
+
+    :param content: Java 原始碼內容。
+    :returns: 依序產生 JavaToken 的 generator。
+    """
+    line = 0
+    for match in TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == "nl":
+            line += 1
+            continue
+        if kind == "ws":
+            continue
+
+        text = match.group()
+        end_line = line
+        if kind in MULTILINE_KINDS:
+            end_line = line + text.count("\n")
+
+        if kind != "comment":
+            yield JavaToken(kind, text, line, match.start(), match.end(), end_line)
+        line = end_line
+
+
+class JavaDeclarationParser:
+    """
+    JavaDeclarationParser 的核心行為實作。
+
+    說明消費 `tokenize_java` 的 token 串流，以遞迴下降方式辨識型別成員，
+    方法本體、欄位初始值與列舉常數直接以括號配對略過。整體只順向走訪一次。
+    解析過程中遇到的所有 Javadoc 區塊範圍會收集在 `doc_blocks`，
+    頂層的 `package` 與非 static `import` 則收集在 `package` 與 `imports`。
+    """
+
+    def __init__(self, content):
+        """
+        建立物件並初始化必要狀態。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :param content: Java 原始碼內容。
+        """
+        self.tokens = tokenize_java(content)
+        self.lookahead = deque()
+        self.doc_blocks = []
+        self.package = ""
+        self.imports = []
+
+    def peek(self, offset=0):
+        """
+        預看後續 token 而不消耗。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :param offset: 相對目前位置的位移。
+        :returns: token；已到檔尾時回傳 None。
+        """
+        while len(self.lookahead) <= offset:
+            token = next(self.tokens, None)
+            if token is None:
+                return None
+            if token.kind == "doc":
+                self.doc_blocks.append((token.line, token.end_line))
+            self.lookahead.append(token)
+        return self.lookahead[offset]
+
+    def advance(self):
+        """
+        消耗並回傳目前 token。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :returns: token；已到檔尾時回傳 None。
+        """
+        token = self.peek()
+        if token is not None:
+            self.lookahead.popleft()
+        return token
+
+    def peek_code(self, offset=0):
+        """
+        預看後續非 Javadoc 的 token。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :param offset: 相對目前位置、僅計算程式碼 token 的位移。
+        :returns: token；已到檔尾時回傳 None。
+        """
+        index = 0
+        remaining = offset
+        while True:
+            token = self.peek(index)
+            if token is None:
+                return None
+            if token.kind != "doc":
+                if remaining == 0:
+                    return token
+                remaining -= 1
+            index += 1
+
+    def skip_balanced(self):
+        """
+        略過一組成對括號及其內容。
+
+        說明目前 token 必須是 `(`、`{` 或 `[`；不成對的關閉符號會被忽略。
+
+        :returns: 最後消耗的 token。
+        """
+        stack = []
+        last = None
+        while True:
+            token = self.advance()
+            if token is None:
+                return last
+            last = token
+            if token.kind != "symbol":
+                continue
+            if token.text in OPENING:
+                stack.append(OPENING[token.text])
+            elif stack and token.text == stack[-1]:
+                stack.pop()
+                if not stack:
+                    return token
+
+    def parse(self):
+        """
+        依原始碼順序產生所有型別與方法宣告。
+
+        說明此函式的主要流程、輸入限制與輸出語意。
+
+        :returns: 依序產生 JavaDeclaration 的 generator。
+        """
+        while self.peek() is not None:
+            token = self.peek_code()
+            if token is not None and token.text == "}":
+                self.advance()
+                continue
+            yield from self.parse_member(None, None)
+
+    def parse_body(self, type_name, type_kind):
+        """
+        解析型別本體直到對應的 `}`。
+
+        說明列舉會先略過常數清單，再解析其餘成員。
+
+        :param type_name: 外層型別名稱。
+        :param type_kind: 外層型別種類。
+        :returns: 依序產生 JavaDeclaration 的 generator。
+        """
+        if type_kind == "enum":
+            self.skip_enum_constants()
+        while True:
+            token = self.peek_code()
+            if token is None:
+                return
+            if token.text == "}":
+                while self.peek().kind == "doc":
+                    self.advance()
+                self.advance()
+                return
+            yield from self.parse_member(type_name, type_kind)
+
+    def skip_enum_constants(self):
+        """
+        略過列舉常數清單。
+
+        說明遇到 `;` 時消耗並結束，遇到 `}` 時保留給呼叫端處理。
+        """
+        while True:
+            token = self.peek()
+            if token is None:
+                return
+            if token.text == ";":
+                self.advance()
+                return
+            if token.text == "}":
+                return
+            if token.text in OPENING:
+                self.skip_balanced()
+                continue
+            self.advance()
+
+    def parse_annotation(self):
+        """
+        解析一個 annotation（含參數）。
+
+        說明目前 token 必須是 `@`。
+
+        :returns: 含 `name` 與 `line_index` 的 annotation 資訊。
+        """
+        at_token = self.advance()
+        parts = []
+        while True:
+            token = self.peek()
+            if token is None or token.kind != "ident":
+                break
+            parts.append(self.advance().text)
+            dot = self.peek()
+            if dot is None or dot.text != "." or (self.peek(1) is not None and self.peek(1).kind != "ident"):
+                break
+            self.advance()
+        token = self.peek()
+        if token is not None and token.text == "(":
+            self.skip_balanced()
+        return {"name": ".".join(parts), "line_index": at_token.line}
+
+    def parse_member(self, type_name, type_kind):
+        """
+        解析單一成員（型別、方法、建構子、欄位或初始化區塊）。
+
+        說明先收集前置的 Javadoc、annotation 與修飾詞，再依後續 token 判斷成員種類。
+        只有型別與方法會產生宣告，其他成員直接略過。
+
+        :param type_name: 外層型別名稱；頂層時為 None。
+        :param type_kind: 外層型別種類；頂層時為 None。
+        :returns: 依序產生 JavaDeclaration 的 generator。
+        """
+        doc = None
+        doc_after_annotations = False
+        annotations = []
+        modifiers = []
+        first_modifier = None
+
+        while True:
+            token = self.peek()
+            if token is None:
+                return
+            if token.kind == "doc":
+                doc = self.advance()
+                doc_after_annotations = bool(annotations)
+                continue
+            if token.text == ";":
+                self.advance()
+                return
+            if token.text == "@":
+                following = self.peek(1)
+                if following is not None and following.text == "interface":
+                    break
+                annotations.append(self.parse_annotation())
+                continue
+            if token.kind == "ident" and token.text in MODIFIERS:
+                first_modifier = first_modifier or token
+                modifiers.append(self.advance().text)
+                continue
+            if token.text == "non" and self.peek(1) is not None and self.peek(1).text == "-":
+                first_modifier = first_modifier or token
+                self.advance()
+                self.advance()
+                self.advance()
+                modifiers.append("non-sealed")
+                continue
+            break
+
+        token = self.peek()
+        if token.text == "{":
+            self.skip_balanced()
+            return
+        if token.text == "}":
+            return
+        if type_name is None and token.text in {"package", "import"}:
+            self.parse_header_statement()
+            return
+
+        context = {
+            "doc": doc,
+            "doc_after_annotations": doc_after_annotations,
+            "annotations": annotations,
+            "modifiers": modifiers,
+            "first_modifier": first_modifier,
+            "type_name": type_name,
+            "type_kind": type_kind,
+        }
+
+        if self.is_type_start(token):
+            yield from self.parse_type(context)
+            return
+
+        yield from self.parse_method_or_field(context)
+
+    def parse_header_statement(self):
+        """
+        解析頂層 `package` 或 `import` 敘述。
+
+        說明 static import 不指向型別，因此只消耗不記錄。
+        """
+        keyword = self.advance().text
+        parts = []
+        while True:
+            token = self.peek()
+            if token is None:
+                break
+            self.advance()
+            if token.text == ";":
+                break
+            if token.kind != "doc":
+                parts.append(token.text)
+
+        if keyword == "package":
+            self.package = "".join(parts)
+        elif parts and parts[0] != "static":
+            self.imports.append("".join(parts))
+
+    def is_type_start(self, token):
+        """
+        判斷目前 token 是否為型別宣告開頭。
+
+        說明 `record` 是情境關鍵字，只有後面接著名稱與 `(` 或 `<` 時才視為型別宣告。
+
+        :param token: 目前 token。
+        :returns: 條件判斷結果。
+        """
+        if token.text == "@":
+            following = self.peek(1)
+            return following is not None and following.text == "interface"
+        if token.text == "record":
+            name = self.peek(1)
+            following = self.peek(2)
+            return (
+                name is not None
+                and name.kind == "ident"
+                and following is not None
+                and following.text in {"(", "<"}
+            )
+        return token.text in TYPE_KEYWORDS
+
+    def parse_type(self, context):
+        """
+        解析型別宣告並遞迴解析其本體。
+
+        說明 record 的元件清單與泛型參數會在 header 中一併略過。
+
+        :param context: `parse_member` 收集的前置資訊。
+        :returns: 依序產生 JavaDeclaration 的 generator。
+        """
+        keyword = self.advance()
+        header = [keyword]
+        type_kind = keyword.text
+        if keyword.text == "@":
+            header.append(self.advance())
+            type_kind = "@interface"
+
+        name_token = self.peek()
+        if name_token is None or name_token.kind != "ident":
+            return
+        name = name_token.text
+
+        end_token = None
+        while True:
+            token = self.peek()
+            if token is None:
+                break
+            if token.kind == "doc":
+                self.advance()
+                continue
+            if token.text == "{":
+                end_token = self.advance()
+                header.append(end_token)
+                break
+            if token.text == ";":
+                self.advance()
+                break
+            if token.text == "(":
+                start = len(header)
+                header.extend(self.collect_balanced())
+                if len(header) == start:
+                    break
+                continue
+            header.append(self.advance())
+
+        yield self.build_declaration("type", name, context, keyword, header, type_kind=type_kind)
+
+        if end_token is not None:
+            yield from self.parse_body(name, type_kind)
+
+    def collect_balanced(self):
+        """
+        消耗一組成對括號並回傳其中的程式碼 token。
+
+        說明 Javadoc token 不會出現在回傳結果中。
+
+        :returns: token 清單。
+        """
+        collected = []
+        stack = []
+        while True:
+            token = self.advance()
+            if token is None:
+                return collected
+            if token.kind == "doc":
+                continue
+            collected.append(token)
+            if token.kind != "symbol":
+                continue
+            if token.text in OPENING:
+                stack.append(OPENING[token.text])
+            elif stack and token.text == stack[-1]:
+                stack.pop()
+                if not stack:
+                    return collected
+
+    def parse_method_or_field(self, context):
+        """
+        解析方法、建構子或欄位宣告。
+
+        說明在 `=` 或 `;` 之前先遇到 `(` 且其前一個 token 為識別字時視為方法，
+        否則視為欄位並略過至結尾 `;`。record 本體中只有型別名稱接著 `{` 時為精簡建構子
+        （compact constructor），同樣視為方法。
+
+        :param context: `parse_member` 收集的前置資訊。
+        :returns: 依序產生 JavaDeclaration 的 generator（最多一個）。
+        """
+        header = []
+        while True:
+            token = self.peek()
+            if token is None:
+                return
+            if token.kind == "doc":
+                self.advance()
+                continue
+            if token.text == "}":
+                return
+            if token.text == ";":
+                self.advance()
+                return
+            if token.text == "=":
+                self.skip_statement()
+                return
+            if token.text == "{":
+                if self.is_compact_constructor(context, header):
+                    header.append(token)
+                    yield self.build_declaration("method", header[0].text, context, header[0], header)
+                self.skip_balanced()
+                return
+            if token.text == "(":
+                if not header or header[-1].kind != "ident":
+                    self.skip_balanced()
+                    continue
+                name_token = header[-1]
+                header.extend(self.collect_balanced())
+                yield from self.finish_method(context, header, name_token)
+                return
+            header.append(self.advance())
+
+    def is_compact_constructor(self, context, header):
+        """
+        判斷 `{` 之前的 token 是否構成 record 的精簡建構子。
+
+        :param context: `parse_member` 收集的前置資訊。
+        :param header: `{` 之前已收集的宣告 token。
+        :returns: 條件判斷結果。
+        """
+        return (
+            context["type_kind"] == "record"
+            and len(header) == 1
+            and header[0].kind == "ident"
+            and header[0].text == context["type_name"]
+        )
+
+    def finish_method(self, context, header, name_token):
+        """
+        讀取方法參數後的 throws 子句並略過方法本體。
+
+        說明 annotation 型別元素的 `default` 值會略過至 `;`，簽章止於 `default` 之前。
+
+        :param context: `parse_member` 收集的前置資訊。
+        :param header: 已收集的宣告 token（含參數列）。
+        :param name_token: 方法名稱 token。
+        :returns: 依序產生 JavaDeclaration 的 generator（一個）。
+        """
+        has_body = False
+        while True:
+            token = self.peek()
+            if token is None:
+                break
+            if token.kind == "doc":
+                self.advance()
+                continue
+            if token.text == "default":
+                self.skip_statement()
+                break
+            if token.text in {"{", ";"}:
+                header.append(token)
+                has_body = token.text == "{"
+                break
+            if token.text == "}":
+                break
+            header.append(self.advance())
+
+        yield self.build_declaration("method", name_token.text, context, header[0], header)
+
+        if has_body:
+            self.skip_balanced()
+        elif self.peek() is not None and self.peek().text == ";":
+            self.advance()
+
+    def skip_statement(self):
+        """
+        略過至同層的 `;`。
+
+        說明欄位初始值中的陣列、lambda 與匿名類別本體會以括號配對略過；
+        遇到外層 `}` 時停止且不消耗。
+        """
+        while True:
+            token = self.peek()
+            if token is None or token.text == "}":
+                return
+            if token.text in OPENING:
+                self.skip_balanced()
+                continue
+            self.advance()
+            if token.text == ";":
+                return
+
+    def build_declaration(self, kind, name, context, keyword, header, type_kind=None):
+        """
+        依收集到的 token 建立宣告資料。
+
+        說明簽章文字由修飾詞起算至 `{` 或 `;`，token 之間原本有空白或註解時以單一空白連接。
+
+        :param kind: `type` 或 `method`。
+        :param name: 宣告名稱。
+        :param context: `parse_member` 收集的前置資訊。
+        :param keyword: 宣告主體的第一個 token（型別關鍵字或回傳型別）。
+        :param header: 宣告主體 token 清單。
+        :param type_kind: 型別種類；方法時為 None。
+        :returns: JavaDeclaration。
+        """
+        annotations = context["annotations"]
+        modifiers = context["modifiers"]
+        first_modifier = context["first_modifier"]
+
+        start_line = first_modifier.line if first_modifier is not None else keyword.line
+        insertion_index = annotations[0]["line_index"] if annotations else start_line
+        insertion_index = min(insertion_index, start_line)
+        end_index = header[-1].line if header else start_line
+
+        parts = list(modifiers) if modifiers else []
+        signature = " ".join(parts + [join_tokens(header)]) if parts else join_tokens(header)
+
+        doc = context["doc"]
+        return JavaDeclaration(
+            kind=kind,
+            name=name,
+            line_index=start_line,
+            end_index=end_index,
+            insertion_index=insertion_index,
+            signature=signature,
+            modifiers=modifiers,
+            annotations=annotations,
+            doc_start=doc.line if doc is not None else None,
+            doc_end=doc.end_line if doc is not None else None,
+            doc_after_annotations=context["doc_after_annotations"] if doc is not None else False,
+            type_kind=type_kind,
+            enclosing_type=context["type_name"],
+            enclosing_kind=context["type_kind"],
+        )
+
+
+def join_tokens(tokens):
+    """
+    將 token 串回精簡的原始碼文字。
+
+    說明相鄰 token 在原始碼中緊貼時直接相連，否則以單一空白分隔。
+
+    :param tokens: token 清單。
+    :returns: 文字內容。
+    """
+    parts = []
+    previous = None
+    for token in tokens:
+        if previous is not None and token.start != previous.end:
+            parts.append(" ")
+        parts.append(token.text)
+        previous = token
+    return "".join(parts)
+
+
+def scan_java_file(content):
+    """
+    解析 Java 原始碼並回傳宣告、Javadoc 區塊範圍與檔案層級資訊。
+
+    說明與 `scan_java_declarations` 相同只走訪一次，另外回傳 `package` 與 `imports`。
+
+    :param content: Java 原始碼內容。
+    :returns: 含 `declarations`、`doc_blocks`、`package`、`imports` 的字典。
+    """
+    parser = JavaDeclarationParser(content)
+    declarations = list(parser.parse())
+    return {
+        "declarations": declarations,
+        "doc_blocks": parser.doc_blocks,
+        "package": parser.package,
+        "imports": parser.imports,
+    }
+
+
+def scan_java_declarations(content):
+    """
+    解析 Java 原始碼並回傳全部宣告與 Javadoc 區塊範圍。
+
+    說明此函式的主要流程、輸入限制與輸出語意。
+
+    :param content: Java 原始碼內容。
+    :returns: (宣告清單, Javadoc 區塊 (start, end) 行範圍清單)。
+    """
+    parser = JavaDeclarationParser(content)
+    declarations = list(parser.parse())
+    return declarations, parser.doc_blocks
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+
+"""
+java_symbol_index 模組的主要功能。
+
+建立整個專案的 Java 符號索引：宣告的型別、方法名稱、`package`/`import`
+與型別繼承關係（extends/implements）。索引以檔案內容雜湊為鍵保存在磁碟上，
+內容未變的檔案不會重新解析；載入後轉為字典查詢表，供 lint 以常數時間
+驗證 `{@link}` 目標與 `@throws` 例外型別。
+
+外部相依（JDK 或第三方函式庫）的型別不在索引內，因此只有能確定不存在的參照才會回報，
+無法判斷的參照一律視為有效。
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from java_lexer import scan_java_file
+from javadoc_utils import read_source_bytes, relative_path
+
+
+SYMBOL_INDEX_FORMAT = 2
+
+JAVA_LANG_TYPES = {
+    "Object", "String", "Class", "Enum", "Record", "Iterable", "Comparable", "Runnable", "AutoCloseable",
+    "CharSequence", "Cloneable", "Number", "Integer", "Long", "Short", "Byte", "Double", "Float",
+    "Character", "Boolean", "Void", "Math", "StrictMath", "System", "Thread", "ThreadLocal",
+    "StringBuilder", "StringBuffer", "Process", "ProcessBuilder", "Runtime", "Override", "Deprecated",
+    "FunctionalInterface", "SafeVarargs", "SuppressWarnings", "Throwable", "Exception", "Error",
+    "RuntimeException", "ArithmeticException", "ArrayIndexOutOfBoundsException", "ArrayStoreException",
+    "ClassCastException", "ClassNotFoundException", "CloneNotSupportedException",
+    "IllegalAccessException", "IllegalArgumentException", "IllegalMonitorStateException",
+    "IllegalStateException", "IndexOutOfBoundsException", "InstantiationException",
+    "InterruptedException", "NegativeArraySizeException", "NoSuchFieldException",
+    "NoSuchMethodException", "NullPointerException", "NumberFormatException", "ReflectiveOperationException",
+    "SecurityException", "StringIndexOutOfBoundsException", "UnsupportedOperationException",
+    "AssertionError", "OutOfMemoryError", "StackOverflowError", "LinkageError", "VirtualMachineError",
+    "ExceptionInInitializerError", "NoClassDefFoundError",
+}
+
+UNCHECKED_EXCEPTION_BASES = {
+    "RuntimeException", "Error", "IllegalArgumentException", "IllegalStateException",
+    "NullPointerException", "UnsupportedOperationException", "IndexOutOfBoundsException",
+    "ArithmeticException", "ClassCastException", "NumberFormatException", "SecurityException",
+    "ArrayIndexOutOfBoundsException", "StringIndexOutOfBoundsException", "NegativeArraySizeException",
+    "ArrayStoreException", "IllegalMonitorStateException", "ConcurrentModificationException",
+    "NoSuchElementException", "UncheckedIOException", "DateTimeException", "CompletionException",
+    "CancellationException", "RejectedExecutionException", "AssertionError",
+}
+
+CHECKED_EXCEPTION_BASES = {
+    "Exception", "Throwable", "IOException", "FileNotFoundException", "InterruptedException",
+    "ReflectiveOperationException", "ClassNotFoundException", "CloneNotSupportedException",
+    "TimeoutException", "ExecutionException", "GeneralSecurityException", "SQLException",
+    "URISyntaxException", "ParseException",
+}
+
+OBJECT_METHODS = {"equals", "hashCode", "toString", "getClass", "clone", "finalize", "notify", "notifyAll", "wait"}
+
+# 未寫出 extends 的型別仍隱含繼承 Object／Enum／Record／Annotation；這些 JDK 型別的方法集合固定，
+# 直接列出即可，不必把整個型別視為無法確認。
+IMPLICIT_MEMBERS = {
+    "class": OBJECT_METHODS,
+    "interface": OBJECT_METHODS,
+    "enum": OBJECT_METHODS | {
+        "values", "valueOf", "name", "ordinal", "compareTo", "getDeclaringClass", "describeConstable",
+    },
+    "record": OBJECT_METHODS,
+    "@interface": OBJECT_METHODS | {"annotationType"},
+}
+
+LINK_PATTERN = re.compile(r"\{@link(?:plain)?\s+([^\s}]+)")
+SEE_PATTERN = re.compile(r"^@see\s+([^\s\"<{][^\s]*)")
+GENERIC_PATTERN = re.compile(r"<[^<>]*>")
+
+
+def strip_generics(text):
+    """
+    移除型別文字中的泛型參數。
+
+    :param text: 型別文字。
+    :returns: 去除 `<...>` 後的文字。
+    """
+    previous = None
+    while previous != text:
+        previous = text
+        text = GENERIC_PATTERN.sub("", text)
+    return text
+
+
+def parse_supertypes(signature):
+    """
+    由型別宣告簽章解析 extends/implements 清單。
+
+    :param signature: 型別宣告簽章（例如 `public class A<T> extends B implements C, D {`）。
+    :returns: 父型別名稱清單（保留原始的簡名或完整名稱）。
+    """
+    text = strip_generics(signature).rstrip("{;").strip()
+    text = re.sub(r"@[\w.]+(?:\([^)]*\))?\s*", "", text)
+    text = re.sub(r"\bpermits\b.*$", "", text)
+    names = []
+    for keyword in ("extends", "implements"):
+        match = re.search(rf"\b{keyword}\b(.*?)(?:\bimplements\b|$)", text)
+        if not match:
+            continue
+        for part in match.group(1).split(","):
+            name = part.strip()
+            if name:
+                names.append(name)
+    return names
+
+
+def parse_record_components(signature):
+    """
+    由 record 宣告簽章解析元件名稱。
+
+    說明每個元件都有同名的隱含存取方法（accessor）。
+
+    :param signature: record 宣告簽章（例如 `public record Point(int x, int y) {`）。
+    :returns: 元件名稱清單。
+    """
+    text = strip_generics(signature)
+    text = re.sub(r"@[\w.]+(?:\([^)]*\))?\s*", "", text)
+    match = re.search(r"\brecord\s+\w+\s*\(([^)]*)\)", text)
+    if not match:
+        return []
+    names = []
+    for part in match.group(1).split(","):
+        identifiers = re.findall(r"\w+", part)
+        if identifiers:
+            names.append(identifiers[-1])
+    return names
+
+
+def extract_file_symbols(content):
+    """
+    解析單一 Java 檔的符號資訊。
+
+    說明巢狀型別以外層型別名稱串接為完整名稱；方法以所屬型別的完整名稱歸類。
+
+    :param content: Java 原始碼文字。
+    :returns: 含 `package`、`imports`、`types`、`methods` 的字典。
+    """
+    scanned = scan_java_file(content)
+    package = scanned["package"]
+    types = []
+    methods = {}
+    qualified_by_simple = {}
+
+    for declaration in scanned["declarations"]:
+        if declaration.kind == "type":
+            if declaration.enclosing_type and declaration.enclosing_type in qualified_by_simple:
+                qualified = f"{qualified_by_simple[declaration.enclosing_type]}.{declaration.name}"
+            else:
+                qualified = f"{package}.{declaration.name}" if package else declaration.name
+            qualified_by_simple[declaration.name] = qualified
+            types.append(
+                {
+                    "name": declaration.name,
+                    "qualified": qualified,
+                    "kind": declaration.type_kind,
+                    "supertypes": parse_supertypes(declaration.signature),
+                }
+            )
+            if declaration.type_kind == "record":
+                methods[qualified] = parse_record_components(declaration.signature)
+            continue
+
+        owner = qualified_by_simple.get(declaration.enclosing_type or "")
+        if owner:
+            methods.setdefault(owner, [])
+            if declaration.name not in methods[owner]:
+                methods[owner].append(declaration.name)
+
+    return {
+        "package": package,
+        "imports": scanned["imports"],
+        "types": types,
+        "methods": methods,
+    }
+
+
+def build_symbol_entry(file_path):
+    """
+    讀取檔案並建立符號索引項目。
+
+    說明供 `iter_java_files` 在 worker process 中呼叫。
+
+    :param file_path: 檔案路徑。
+    :returns: 含 `hash` 的符號索引項目。
+    """
+    data = read_source_bytes(file_path)
+    entry = extract_file_symbols(data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n"))
+    entry["hash"] = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return entry
+
+
+class JavaSymbolIndex:
+    """
+    JavaSymbolIndex 的核心行為實作。
+
+    說明負責磁碟上的符號索引增量更新，以及建立記憶體中的查詢表。
+    查詢表只包含字典與集合，可直接 pickle 給 worker process 使用。
+    """
+
+    def __init__(self, path=None):
+        """
+        建立物件並載入既有索引。
+
+        :param path: 索引檔路徑；None 表示只在記憶體中建立。
+        """
+        self.path = path
+        self.files = {}
+        self.rescanned = 0
+        self.types = {}
+        self.types_by_simple = {}
+        self.packages = set()
+        self.methods = {}
+        self.supertypes = {}
+        if path:
+            self.load()
+
+    def load(self):
+        """
+        讀取索引檔；格式版本不符或檔案損毀時視為空索引。
+        """
+        path = Path(self.path)
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != SYMBOL_INDEX_FORMAT:
+            return
+        files = data.get("files")
+        if isinstance(files, dict):
+            self.files = files
+
+    def refresh(self, files, root, mapper, prune=True):
+        """
+        依目前檔案清單增量更新索引。
+
+        說明先計算每個檔案的內容雜湊，只有新增或變更的檔案交給 `mapper` 重新解析；
+        預設不在清單中的檔案會被移除。`prune=False` 時 `files` 只是變更檔案，
+        其餘項目原樣保留，已刪除的檔案留待下次完整掃描時移除。
+
+        :param files: Java 檔路徑清單。
+        :param root: 掃描根目錄。
+        :param mapper: `(func, files) -> iterable` 的執行器，例如綁定 `--jobs` 的 `iter_java_files`。
+        :param prune: 是否移除不在 `files` 中的項目。
+        """
+        refreshed = {} if prune else dict(self.files)
+        stale = []
+        for file_path in files:
+            rel_file = relative_path(file_path, root)
+            cached = self.files.get(rel_file)
+            if cached is not None:
+                digest = hashlib.blake2b(read_source_bytes(file_path), digest_size=16).hexdigest()
+                if cached.get("hash") == digest:
+                    refreshed[rel_file] = cached
+                    continue
+            stale.append((rel_file, file_path))
+
+        for (rel_file, _), entry in zip(stale, mapper(build_symbol_entry, [file_path for _, file_path in stale])):
+            refreshed[rel_file] = entry
+
+        self.rescanned = len(stale)
+        self.files = refreshed
+        self.build_lookup()
+
+    def save(self):
+        """
+        以原子方式寫回索引檔。
+
+        :returns: 寫入的檔案項目數量。
+        """
+        if not self.path:
+            return 0
+        payload = {"format": SYMBOL_INDEX_FORMAT, "files": self.files}
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(payload, stream, ensure_ascii=False, separators=(",", ":"))
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return len(self.files)
+
+    def build_lookup(self):
+        """
+        由檔案項目建立查詢表。
+
+        說明父型別在此時依宣告檔的 package 與 import 解析為完整名稱，
+        無法解析（外部型別）時保留原始名稱。
+        """
+        self.types = {}
+        self.types_by_simple = {}
+        self.packages = set()
+        self.methods = {}
+        self.supertypes = {}
+
+        for entry in self.files.values():
+            if entry.get("package"):
+                self.packages.add(entry["package"])
+            for type_info in entry.get("types", []):
+                self.types[type_info["qualified"]] = type_info["kind"]
+                self.types_by_simple.setdefault(type_info["name"], set()).add(type_info["qualified"])
+            for owner, names in entry.get("methods", {}).items():
+                self.methods.setdefault(owner, set()).update(names)
+
+        for rel_file, entry in self.files.items():
+            context = self.file_context(rel_file)
+            for type_info in entry.get("types", []):
+                resolved = []
+                for name in type_info.get("supertypes", []):
+                    resolved.append(self.resolve_type(name, context) or name)
+                self.supertypes[type_info["qualified"]] = resolved
+
+    def file_context(self, rel_file):
+        """
+        取得單一檔案的名稱解析環境。
+
+        :param rel_file: 相對於根目錄的路徑。
+        :returns: 含 `package`、`imports`、`local` 的字典；檔案不在索引中時回傳 None。
+        """
+        entry = self.files.get(rel_file)
+        if entry is None:
+            return None
+        local = {}
+        for type_info in entry.get("types", []):
+            local.setdefault(type_info["name"], type_info["qualified"])
+        return {
+            "package": entry.get("package", ""),
+            "imports": entry.get("imports", []),
+            "local": local,
+        }
+
+    def resolve_type(self, name, context):
+        """
+        將參照中的型別名稱解析為索引中的完整名稱。
+
+        說明依序嘗試：完整名稱、同檔型別、明確 import、同 package、萬用 import；
+        `Outer.Inner` 形式會先解析最外層名稱再串接。
+
+        :param name: 型別名稱（可含 package 或外層型別）。
+        :param context: `file_context` 回傳的解析環境。
+        :returns: 完整名稱；無法在索引中找到時回傳 None。
+        """
+        name = strip_generics(name).replace("[]", "").replace("...", "").strip()
+        if not name:
+            return None
+        if name in self.types:
+            return name
+
+        head, _, rest = name.partition(".")
+        suffix = f".{rest}" if rest else ""
+        candidates = []
+        if head in context["local"]:
+            candidates.append(context["local"][head])
+        for imported in context["imports"]:
+            if imported.endswith("." + head):
+                candidates.append(imported)
+        if context["package"]:
+            candidates.append(f"{context['package']}.{head}")
+        else:
+            candidates.append(head)
+        for imported in context["imports"]:
+            if imported.endswith(".*"):
+                candidates.append(f"{imported[:-2]}.{head}")
+
+        for candidate in candidates:
+            qualified = candidate + suffix
+            if qualified in self.types:
+                return qualified
+        return None
+
+    def is_external(self, name, context):
+        """
+        判斷無法解析的型別名稱是否可能來自外部相依。
+
+        說明明確 import、`java.lang` 型別、未建立索引的 package，
+        以及存在指向外部 package 的萬用 import 時，都無法確定參照錯誤。
+
+        :param name: 型別名稱。
+        :param context: `file_context` 回傳的解析環境。
+        :returns: 可能為外部型別時回傳 True。
+        """
+        name = strip_generics(name).replace("[]", "").replace("...", "").strip()
+        head = name.split(".", 1)[0]
+        if head in JAVA_LANG_TYPES:
+            return True
+        for imported in context["imports"]:
+            if imported.endswith("." + head):
+                return True
+            if imported.endswith(".*") and imported[:-2] not in self.packages:
+                return True
+        if head[:1].islower():
+            package = name.rsplit(".", 1)[0] if "." in name else name
+            while package:
+                if package in self.packages:
+                    return False
+                package = package.rpartition(".")[0]
+            return True
+        return False
+
+    def ancestors(self, qualified):
+        """
+        依繼承關係走訪所有祖先型別。
+
+        :param qualified: 型別完整名稱。
+        :returns: 祖先名稱清單（索引外的型別以原始名稱表示）。
+        """
+        seen = []
+        pending = list(self.supertypes.get(qualified, []))
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.append(current)
+            pending.extend(self.supertypes.get(current, []))
+        return seen
+
+    def has_member(self, qualified, member):
+        """
+        判斷型別（含索引內的父型別）是否宣告指定方法。
+
+        說明繼承鏈上出現索引外的型別時無法確認，視為存在；依型別種類隱含繼承的
+        `Object`、`Enum`、`Record` 與 `Annotation` 方法一律視為存在。
+
+        :param qualified: 型別完整名稱。
+        :param member: 方法名稱。
+        :returns: 條件判斷結果。
+        """
+        if member == qualified.rsplit(".", 1)[-1]:
+            return True
+        for name in [qualified] + self.ancestors(qualified):
+            if name not in self.types:
+                return True
+            if member in self.methods.get(name, ()):
+                return True
+            if member in IMPLICIT_MEMBERS.get(self.types[name], ()):
+                return True
+        return False
+
+    def exception_category(self, qualified):
+        """
+        判斷例外型別屬於 checked 或 unchecked。
+
+        :param qualified: 例外型別完整名稱。
+        :returns: `checked`、`unchecked` 或無法判斷時的 `unknown`。
+        """
+        names = [qualified] + self.ancestors(qualified)
+        simple_names = {name.rsplit(".", 1)[-1] for name in names}
+        if simple_names & UNCHECKED_EXCEPTION_BASES:
+            return "unchecked"
+        if simple_names & CHECKED_EXCEPTION_BASES:
+            return "checked"
+        return "unknown"
+
+    def is_assignable(self, qualified, declared_names):
+        """
+        判斷例外型別是否為宣告 throws 中任一型別或其子型別。
+
+        :param qualified: 例外型別完整名稱。
+        :param declared_names: 宣告 throws 的簡名集合。
+        :returns: 條件判斷結果。
+        """
+        for name in [qualified] + self.ancestors(qualified):
+            if name.rsplit(".", 1)[-1] in declared_names:
+                return True
+        return False
+
+    def summary(self):
+        """
+        回傳索引統計資訊。
+
+        :returns: 含索引路徑、檔案數、型別數與重新解析數的字典。
+        """
+        return {
+            "file": self.path,
+            "files": len(self.files),
+            "types": len(self.types),
+            "rescanned": self.rescanned,
+        }
+
+
+def iter_doc_references(lines, doc_start, doc_end):
+    """
+    列出 Javadoc 區塊中的 `{@link}` 與 `@see` 參照。
+
+    :param lines: 原始碼行清單。
+    :param doc_start: 區塊起始行（0-based）。
+    :param doc_end: 區塊結束行（0-based）。
+    :returns: 依序產生 (行號, 參照文字) 的 generator，行號為 1-based。
+    """
+    for index in range(doc_start, min(doc_end, len(lines) - 1) + 1):
+        line = lines[index]
+        for match in LINK_PATTERN.finditer(line):
+            yield index + 1, match.group(1)
+        stripped = line.strip().lstrip("/*").strip()
+        see = SEE_PATTERN.match(stripped)
+        if see:
+            yield index + 1, see.group(1)
+
+
+def split_reference(reference):
+    """
+    將 Javadoc 參照拆成型別與成員。
+
+    :param reference: 例如 `Foo`、`Foo#bar(int)`、`#bar`。
+    :returns: (型別名稱, 成員名稱, 是否為方法參照)；沒有型別或成員時為空字串。
+    """
+    type_name, _, member = reference.partition("#")
+    is_method = "(" in member
+    member = member.split("(", 1)[0].strip()
+    return type_name.strip(), member, is_method
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+javadoc_pipeline 模組的主要功能。
+
+以有界佇列串接「讀取 → 轉換 → 寫回」三個階段：讀取與寫回由執行緒池處理，
+讓檔案 I/O 與轉換重疊；轉換可在目前 process 或 worker process 中執行。
+任一時刻在途的檔案數量受佇列深度限制，因此峰值記憶體與檔案總數無關。
+"""
+
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+DEFAULT_READERS = 4
+DEFAULT_WRITERS = 2
+DEFAULT_QUEUE_DEPTH = 32
+
+_DONE = object()
+
+
+def run_pipeline(
+    paths,
+    read,
+    transform,
+    write,
+    readers=DEFAULT_READERS,
+    jobs=1,
+    writers=DEFAULT_WRITERS,
+    queue_depth=DEFAULT_QUEUE_DEPTH,
+    initializer=None,
+    initargs=(),
+):
+    """
+    以管線方式處理檔案並依原始順序回傳結果。
+
+    說明 `transform(path, data)` 回傳 `(content, result)`；`content` 不為 None 時
+    交給寫回階段以 `write(path, content)` 寫出。`jobs` 大於 1 時 `transform`
+    在 process pool 中執行（需為可 pickle 的頂層函式），`initializer` 於每個 worker
+    啟動時執行一次；否則在目前 process 內先呼叫 `initializer` 再逐一轉換。
+    任一階段失敗時會停止接收新工作，等待在途工作結束後拋出第一個錯誤。
+
+    :param paths: 檔案路徑清單。
+    :param read: 讀取函式，`read(path) -> data`。
+    :param transform: 轉換函式，`transform(path, data) -> (content, result)`。
+    :param write: 寫回函式，`write(path, content)`。
+    :param readers: 讀取執行緒數量。
+    :param jobs: 轉換 worker 數量。
+    :param writers: 寫回執行緒數量。
+    :param queue_depth: 每個佇列的最大深度，同時限制在途的轉換數量。
+    :param initializer: 轉換階段的初始化函式。
+    :param initargs: 傳給 `initializer` 的參數。
+    :returns: 與 `paths` 順序一致的 `result` 清單。
+    :raises Exception: 任一階段發生的第一個錯誤。
+    """
+    readers = max(1, readers)
+    writers = max(1, writers)
+    queue_depth = max(1, queue_depth)
+
+    pending = queue.Queue()
+    for item in enumerate(paths):
+        pending.put(item)
+
+    read_queue = queue.Queue(maxsize=queue_depth)
+    write_queue = queue.Queue(maxsize=queue_depth)
+    results = [None] * len(paths)
+    errors = []
+    stop = threading.Event()
+
+    def fail(error):
+        errors.append(error)
+        stop.set()
+
+    def reader_loop():
+        while not stop.is_set():
+            try:
+                sequence, path = pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                read_queue.put((sequence, path, read(path)))
+            except Exception as error:  # noqa: BLE001
+                fail(error)
+        read_queue.put(_DONE)
+
+    def writer_loop():
+        while True:
+            item = write_queue.get()
+            if item is _DONE:
+                return
+            sequence, path, content, result = item
+            if stop.is_set():
+                continue
+            try:
+                if content is not None:
+                    write(path, content)
+                results[sequence] = result
+            except Exception as error:  # noqa: BLE001
+                fail(error)
+
+    reader_threads = [threading.Thread(target=reader_loop, daemon=True) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer_loop, daemon=True) for _ in range(writers)]
+    for thread in reader_threads + writer_threads:
+        thread.start()
+
+    finished_readers = [0]
+
+    def read_items():
+        while finished_readers[0] < readers:
+            item = read_queue.get()
+            if item is _DONE:
+                finished_readers[0] += 1
+                continue
+            yield item
+
+    try:
+        if jobs <= 1:
+            if initializer is not None:
+                initializer(*initargs)
+            for sequence, path, data in read_items():
+                if stop.is_set():
+                    continue
+                try:
+                    content, result = transform(path, data)
+                except Exception as error:  # noqa: BLE001
+                    fail(error)
+                    continue
+                write_queue.put((sequence, path, content, result))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+                in_flight = {}
+
+                def drain():
+                    done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sequence, path = in_flight.pop(future)
+                        try:
+                            content, result = future.result()
+                        except Exception as error:  # noqa: BLE001
+                            fail(error)
+                            continue
+                        write_queue.put((sequence, path, content, result))
+
+                for sequence, path, data in read_items():
+                    if stop.is_set():
+                        continue
+                    in_flight[executor.submit(transform, path, data)] = (sequence, path)
+                    if len(in_flight) >= queue_depth:
+                        drain()
+                while in_flight:
+                    drain()
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        # 讓仍在等待佇列空間的讀取執行緒能夠結束。
+        while finished_readers[0] < readers:
+            if read_queue.get() is _DONE:
+                finished_readers[0] += 1
+        for _ in writer_threads:
+            write_queue.put(_DONE)
+        for thread in reader_threads + writer_threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    return results
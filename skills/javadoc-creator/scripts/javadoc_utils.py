@@ -8,9 +8,56 @@ javadoc_utils 模組的主要功能。
 
 import os
 import re
-from dataclasses import dataclass
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+DEFAULT_SOURCE_ROOTS = ["src/main/java"]
+DEFAULT_TEST_SOURCE_ROOTS = ["src/test/java"]
+
+SKIP_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".gradle",
+    ".idea",
+    ".mvn",
+    "node_modules",
+    "target",
+    "build",
+    "out",
+    "bin",
+    "generated-sources",
+    "generated-test-sources",
+}
+
+MODULE_MARKERS = (
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "settings.gradle",
+    "settings.gradle.kts",
+    "build.xml",
+    "package.json",
+)
+
+ARCHIVE_SUFFIXES = (".jar", ".zip")
+ARCHIVE_SEPARATOR = "!/"
+
+_OPEN_ARCHIVES = {}
+
+SOURCE_SKIP_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    "generated-sources",
+    "generated-test-sources",
+}
 
 
 @dataclass
@@ -26,6 +73,27 @@ class ScriptArgs:
     top: int = 20
     style: str = "vertx"
     style_file: Optional[str] = None
+    jobs: int = 1
+    source_roots: List[str] = field(default_factory=list)
+    include_tests: bool = False
+    include_archives: bool = False
+    index_cache: Optional[str] = None
+    symbol_index: Optional[str] = None
+    prefilter: bool = True
+    changed_since: Optional[str] = None
+    staged: bool = False
+    files_from: Optional[str] = None
+    history: Optional[str] = None
+    commit: Optional[str] = None
+    module: Optional[str] = None
+    package: Optional[str] = None
+    limit: int = 50
+    readers: int = 4
+    writers: int = 2
+    queue_depth: int = 32
+    profile_rules: bool = False
+    report_format: Optional[str] = None
+    output: Optional[str] = None
 
 
 def parse_args(argv):
@@ -70,17 +138,100 @@ def parse_args(argv):
             args.style_file = argv[i + 1]
             i += 2
             continue
+        if token == "--source-root" and i + 1 < len(argv):
+            for value in argv[i + 1].split(","):
+                value = value.strip().strip("/")
+                if value and value not in args.source_roots:
+                    args.source_roots.append(value)
+            i += 2
+            continue
+        if token == "--changed-since" and i + 1 < len(argv):
+            args.changed_since = argv[i + 1]
+            i += 2
+            continue
+        if token == "--staged":
+            args.staged = True
+            i += 1
+            continue
+        if token == "--files-from" and i + 1 < len(argv):
+            args.files_from = argv[i + 1]
+            i += 2
+            continue
+        if token in {"--history", "--commit", "--module", "--package"} and i + 1 < len(argv):
+            setattr(args, token[2:], argv[i + 1])
+            i += 2
+            continue
+        if token == "--limit" and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value > 0:
+                    args.limit = value
+            except ValueError:
+                pass
+            i += 2
+            continue
+        if token == "--no-prefilter":
+            args.prefilter = False
+            i += 1
+            continue
+        if token == "--profile-rules":
+            args.profile_rules = True
+            i += 1
+            continue
+        if token == "--include-tests":
+            args.include_tests = True
+            i += 1
+            continue
+        if token == "--include-archives":
+            args.include_archives = True
+            i += 1
+            continue
+        if token == "--format" and i + 1 < len(argv):
+            args.report_format = argv[i + 1].lower()
+            i += 2
+            continue
+        if token == "--output" and i + 1 < len(argv):
+            args.output = argv[i + 1]
+            i += 2
+            continue
+        if token == "--symbol-index" and i + 1 < len(argv):
+            args.symbol_index = argv[i + 1]
+            i += 2
+            continue
+        if token == "--index-cache" and i + 1 < len(argv):
+            args.index_cache = argv[i + 1]
+            i += 2
+            continue
+        if token in {"--readers", "--writers", "--queue-depth"} and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value > 0:
+                    setattr(args, token[2:].replace("-", "_"), value)
+            except ValueError:
+                pass
+            i += 2
+            continue
+        if token == "--jobs" and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value > 0:
+                    args.jobs = value
+            except ValueError:
+                pass
+            i += 2
+            continue
         i += 1
     return args
 
 
-def resolve_root(root_arg):
+def resolve_root(root_arg, allow_archives=False):
     """
     執行 resolve_root 的核心流程並回傳結果。
     
-    說明此函式的主要流程、輸入限制與輸出語意。
+    說明 `allow_archives` 為 True 時，`.jar`/`.zip` 檔也可作為根目錄。
     
     :param root_arg: 此參數會影響函式的執行行為。
+    :param allow_archives: 是否接受壓縮檔作為根目錄。
     :returns: 函式回傳結果。
     :raises ValueError: 當輸入不合法或處理失敗時拋出。
     """
@@ -88,133 +239,588 @@ def resolve_root(root_arg):
     if not root.is_absolute():
         root = Path.cwd() / root
     root = root.resolve()
+    if allow_archives and is_archive_path(str(root)) and root.is_file():
+        return str(root)
     if not root.exists() or not root.is_dir():
         raise ValueError(f"Root path does not exist or is not a directory: {root}")
     return str(root)
 
 
-def list_java_files(directory):
+def is_archive_path(path):
     """
-    執行 list_java_files 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param directory: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    判斷路徑是否為支援的壓縮檔（`.jar`、`.zip`）。
+
+    :param path: 檔案路徑。
+    :returns: 條件判斷結果。
+    """
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def split_archive_path(file_path):
+    """
+    拆解 `archive!/entry` 形式的路徑。
+
+    :param file_path: 檔案路徑。
+    :returns: (壓縮檔路徑, entry 名稱)；一般檔案時 entry 為 None。
+    """
+    archive, separator, entry = file_path.partition(ARCHIVE_SEPARATOR)
+    if separator and is_archive_path(archive):
+        return archive, entry
+    return file_path, None
+
+
+def open_archive(archive):
+    """
+    取得已開啟的壓縮檔物件。
+
+    說明同一 process 內每個壓縮檔只開啟一次，之後的 entry 讀取共用同一個物件。
+    快取以 process id 區分：fork 出的 worker 會繼承父 process 的檔案描述元與檔案位置，
+    共用同一個 handle 會互相干擾讀取位置，因此每個 process 各自開啟。
+
+    :param archive: 壓縮檔路徑。
+    :returns: `zipfile.ZipFile`。
+    """
+    key = (os.getpid(), archive)
+    handle = _OPEN_ARCHIVES.get(key)
+    if handle is None:
+        handle = zipfile.ZipFile(archive)
+        _OPEN_ARCHIVES[key] = handle
+    return handle
+
+
+def list_archive_entries(archive):
+    """
+    列出壓縮檔中的 Java 原始碼 entry。
+
+    :param archive: 壓縮檔路徑。
+    :returns: 依 entry 名稱排序的 `archive!/entry` 路徑清單。
+    """
+    names = [
+        info.filename
+        for info in open_archive(archive).infolist()
+        if not info.is_dir() and info.filename.endswith(".java")
+    ]
+    return [f"{archive}{ARCHIVE_SEPARATOR}{name}" for name in sorted(names)]
+
+
+def read_source_bytes(file_path):
+    """
+    讀取 Java 原始碼的原始位元組。
+
+    說明 `archive!/entry` 路徑直接在記憶體中讀取壓縮檔 entry，不會解壓到磁碟。
+
+    :param file_path: 檔案路徑或 `archive!/entry` 路徑。
+    :returns: 檔案內容位元組。
+    """
+    archive, entry = split_archive_path(file_path)
+    if entry is None:
+        return Path(file_path).read_bytes()
+    return open_archive(archive).read(entry)
+
+
+def read_source_text(file_path):
+    """
+    讀取 Java 原始碼文字。
+
+    說明換行處理與 `Path.read_text` 的 universal newlines 相同。
+
+    :param file_path: 檔案路徑或 `archive!/entry` 路徑。
+    :returns: 以 `\\n` 分行的文字。
+    """
+    return read_source_bytes(file_path).decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def write_source_text(file_path, content):
+    """
+    將 Java 原始碼文字寫回檔案。
+
+    :param file_path: 檔案路徑。
+    :param content: 檔案內容。
+    """
+    Path(file_path).write_text(content, encoding="utf-8")
+
+
+def list_archives(directory):
+    """
+    列出目錄下的 `.jar`/`.zip` 檔。
+
+    說明走訪時同樣剪除 VCS 與建置輸出目錄。
+
+    :param directory: 掃描根目錄。
+    :returns: 排序後的壓縮檔路徑清單。
+    """
+    archives = []
+    for current_root, dir_names, file_names in os.walk(directory):
+        dir_names[:] = [name for name in sorted(dir_names) if name not in SKIP_DIRS and not name.startswith(".")]
+        for name in sorted(file_names):
+            if is_archive_path(name):
+                archives.append(str(Path(current_root) / name))
+    return archives
+
+
+def configured_source_roots(args):
+    """
+    取得本次掃描要使用的 source root 版面設定。
+
+    說明未指定 `--source-root` 時使用 Maven/Gradle 慣例 `src/main/java`；
+    加上 `--include-tests` 時再附加 `src/test/java`。
+
+    :param args: 解析後的 ScriptArgs。
+    :returns: 相對於模組目錄的 source root 清單。
+    """
+    roots = list(args.source_roots) or list(DEFAULT_SOURCE_ROOTS)
+    if args.include_tests:
+        for value in DEFAULT_TEST_SOURCE_ROOTS:
+            if value not in roots:
+                roots.append(value)
+    return roots
+
+
+def walk_source_tree(directory):
+    """
+    走訪單一 source root 下的 Java 檔。
+
+    說明 source root 內的目錄名稱可能與 Java package 相同（例如 `build`），
+    因此只略過 VCS 與 generated-sources 目錄。
+
+    :param directory: source root 路徑。
+    :returns: 依目錄與檔名排序的 Java 檔路徑清單。
     """
-    root = Path(directory)
     files = []
-    for current_root, dir_names, file_names in os.walk(root):
-        dir_names.sort()
+    for current_root, dir_names, file_names in os.walk(directory):
+        dir_names[:] = [name for name in sorted(dir_names) if name not in SOURCE_SKIP_DIRS]
         for name in sorted(file_names):
             if name.endswith(".java"):
                 files.append(str(Path(current_root) / name))
     return files
 
 
-def relative_path(file_path, root):
+def iter_source_roots(directory, source_roots):
     """
-    執行 relative_path 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param file_path: 檔案路徑。
-    :param root: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    在 Maven/Gradle（含多模組）專案中依走訪順序產生 source root。
+
+    說明由 `directory` 往下走訪，每個目錄檢查是否存在設定的 source root；
+    建置輸出、VCS 與 generated 目錄在進入前就會被剪除，
+    已命中的 source root 所在的第一層目錄（例如 `src`）不再重複走訪，
+    但仍會繼續尋找巢狀子模組。只需要知道是否存在 source root 時可在第一筆就停止。
+
+    :param directory: 專案或模組根目錄。
+    :param source_roots: 相對於模組目錄的 source root 清單。
+    :returns: 產生 source root 絕對路徑的 generator。
     """
-    return os.path.relpath(file_path, root).replace("\\", "/")
+    layout_heads = {Path(value).parts[0] for value in source_roots if Path(value).parts}
+    for current_root, dir_names, _ in os.walk(directory):
+        matched = False
+        for value in source_roots:
+            candidate = Path(current_root) / value
+            if candidate.is_dir():
+                yield str(candidate)
+                matched = True
+        pruned = []
+        for name in sorted(dir_names):
+            if name in SKIP_DIRS or name.startswith("."):
+                continue
+            if matched and name in layout_heads:
+                continue
+            pruned.append(name)
+        dir_names[:] = pruned
+
+
+def find_source_roots(directory, source_roots):
+    """
+    在 Maven/Gradle（含多模組）專案中尋找 source root。
 
+    說明走訪規則見 `iter_source_roots`。
 
-def detect_eol(content):
+    :param directory: 專案或模組根目錄。
+    :param source_roots: 相對於模組目錄的 source root 清單。
+    :returns: 排序後的 source root 絕對路徑清單。
     """
-    執行 detect_eol 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param content: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    return list(iter_source_roots(directory, source_roots))
+
+
+def is_module_level(directory, root, file_names=None):
     """
-    return "\r\n" if "\r\n" in content else "\n"
+    判斷目錄是否位於專案或模組層級。
 
+    說明含有建置描述檔（`pom.xml`、`build.gradle` 等）的目錄，以及本身不含 Java 檔的掃描根目錄
+    視為模組層級；其下的 `build`、`out`、`bin` 等才是建置輸出。更深的目錄可能是 Java package，
+    同名目錄（例如 `com/acme/build/`）不可剪除。
 
-def has_javadoc(lines, index):
+    :param directory: 目錄路徑。
+    :param root: 掃描根目錄。
+    :param file_names: 目錄中的檔名；None 時自行列出。
+    :returns: 條件判斷結果。
     """
-    判斷是否具備指定條件。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param lines: 此參數會影響函式的執行行為。
-    :param index: 此參數會影響函式的執行行為。
+    directory = Path(directory)
+    if any((directory / marker).is_file() for marker in MODULE_MARKERS):
+        return True
+    if directory != Path(root):
+        return False
+    if file_names is None:
+        file_names = os.listdir(directory)
+    return not any(name.endswith(".java") for name in file_names)
+
+
+def skip_fallback_dir(name, module_level):
+    """
+    判斷無 source root 的整棵掃描是否略過子目錄。
+
+    :param name: 子目錄名稱。
+    :param module_level: 所在目錄是否為模組層級（見 `is_module_level`）。
     :returns: 條件判斷結果。
     """
-    i = index - 1
-    while i >= 0:
-        line = lines[i].strip()
-        if not line or line.startswith("@"):
-            i -= 1
+    if name.startswith(".") or name in SOURCE_SKIP_DIRS:
+        return True
+    return module_level and name in SKIP_DIRS
+
+
+def list_java_files(directory, source_roots=None, include_archives=False):
+    """
+    列出要處理的 Java 原始碼檔。
+
+    說明若 `directory` 本身就是 source root（路徑以設定的 source root 結尾），
+    或其下找不到任何 source root，會直接走訪整個目錄，並只在模組層級剪除建置輸出；
+    否則只進入各模組的 source root，`target/`、`build/`、`.gradle/` 等目錄不會被走訪。
+    `directory` 為壓縮檔時直接展開為 `archive!/entry` 路徑；`include_archives` 為 True 時，
+    目錄下的 `.jar`/`.zip` 也會展開並附加在一般檔案之後。
+
+    :param directory: 掃描根目錄或壓縮檔。
+    :param source_roots: 相對於模組目錄的 source root 清單；None 時使用 `src/main/java`。
+    :param include_archives: 是否包含目錄下壓縮檔中的 Java 檔。
+    :returns: 排序後的 Java 檔路徑清單。
+    """
+    if is_archive_path(str(directory)) and os.path.isfile(directory):
+        return list_archive_entries(str(directory))
+    if include_archives:
+        files = list_java_files(directory, source_roots)
+        for archive in list_archives(directory):
+            files.extend(list_archive_entries(archive))
+        return files
+
+    root = Path(directory)
+    layouts = source_roots or DEFAULT_SOURCE_ROOTS
+    normalized_root = root.as_posix().rstrip("/")
+    if any(normalized_root.endswith("/" + value) or normalized_root == value for value in layouts):
+        return walk_source_tree(root)
+
+    found = find_source_roots(root, layouts)
+    if not found:
+        files = []
+        for current_root, dir_names, file_names in os.walk(root):
+            module_level = is_module_level(current_root, root, file_names)
+            dir_names[:] = [name for name in sorted(dir_names) if not skip_fallback_dir(name, module_level)]
+            for name in sorted(file_names):
+                if name.endswith(".java"):
+                    files.append(str(Path(current_root) / name))
+        return files
+
+    files = []
+    for source_root in sorted(found):
+        files.extend(walk_source_tree(source_root))
+    return files
+
+
+def is_incremental(args):
+    """
+    判斷是否只處理指定或變更的檔案。
+
+    :param args: 解析後的 ScriptArgs。
+    :returns: 指定 `--changed-since`、`--staged` 或 `--files-from` 時為 True。
+    """
+    return bool(args.changed_since or args.staged or args.files_from)
+
+
+def run_git(directory, *arguments):
+    """
+    在指定目錄執行 git 並回傳標準輸出。
+
+    :param directory: 執行 git 的目錄。
+    :param arguments: git 子命令與參數。
+    :returns: 標準輸出文字。
+    :raises ValueError: 當 git 不存在或指令失敗時拋出。
+    """
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(directory), *arguments],
+            capture_output=True,
+            check=True,
+        )
+    except FileNotFoundError as error:
+        raise ValueError("git executable not found") from error
+    except subprocess.CalledProcessError as error:
+        message = error.stderr.decode("utf-8", "replace").strip()
+        raise ValueError(f"git {arguments[0]} failed: {message}") from error
+    return os.fsdecode(completed.stdout)
+
+
+def git_changed_files(directory, changed_since=None, staged=False):
+    """
+    取得 git 回報的新增、修改或更名檔案。
+
+    說明 `changed_since` 以 `merge-base <ref> HEAD` 為基準與工作目錄比較，
+    涵蓋分支上已提交與尚未提交的變更；`staged` 只取暫存區的變更。兩者可同時使用。
+
+    :param directory: 位於 git 工作目錄內的路徑。
+    :param changed_since: 比較基準 ref；None 表示不使用。
+    :param staged: 是否加入暫存區的變更。
+    :returns: 絕對路徑清單。
+    :raises ValueError: 當 git 指令失敗時拋出。
+    """
+    top = run_git(directory, "rev-parse", "--show-toplevel").strip()
+    names = []
+    if changed_since:
+        base = run_git(top, "merge-base", changed_since, "HEAD").strip()
+        names.extend(run_git(top, "diff", "--name-only", "-z", "--diff-filter=ACMR", base).split("\0"))
+    if staged:
+        names.extend(run_git(top, "diff", "--cached", "--name-only", "-z", "--diff-filter=ACMR").split("\0"))
+    return [os.path.join(top, name) for name in names if name]
+
+
+def resolve_commit(directory, ref=None):
+    """
+    取得 commit SHA 與 commit 時間。
+
+    說明 `ref` 無法由 git 解析（例如不在 git 工作目錄中）時，直接以 `ref` 作為識別字串，
+    commit 時間為 None。
+
+    :param directory: 掃描根目錄或壓縮檔路徑。
+    :param ref: commit ref；None 表示 `HEAD`。
+    :returns: (commit 識別字串, Unix 秒或 None)。
+    :raises ValueError: 當未指定 `ref` 且無法取得 git `HEAD` 時拋出。
+    """
+    location = directory if os.path.isdir(directory) else os.path.dirname(os.path.abspath(directory))
+    try:
+        output = run_git(location, "log", "-1", "--format=%H %ct", ref or "HEAD", "--")
+    except ValueError:
+        if ref:
+            return ref, None
+        raise ValueError("--history requires a git checkout or an explicit --commit")
+    sha, timestamp = output.split()
+    return sha, int(timestamp)
+
+
+def read_file_list(source):
+    """
+    讀取檔案清單。
+
+    說明 `-` 表示標準輸入；內容含有 NUL 時以 NUL 分隔（`git diff -z`、`find -print0`），
+    否則以換行分隔。相對路徑以目前工作目錄為基準。
+
+    :param source: 清單檔路徑或 `-`。
+    :returns: 絕對路徑清單。
+    """
+    data = sys.stdin.buffer.read() if source == "-" else Path(source).read_bytes()
+    entries = data.split(b"\0") if b"\0" in data else data.splitlines()
+    return [os.path.abspath(os.fsdecode(entry)) for entry in entries if entry.strip()]
+
+
+def walk_order_key(parts):
+    """
+    產生與 `os.walk` 排序走訪相同順序的排序鍵。
+
+    說明同一目錄中的檔案排在子目錄之前，檔名與目錄名各自依字典順序。
+
+    :param parts: 相對路徑的各段名稱，最後一段為檔名。
+    :returns: 排序鍵。
+    """
+    return tuple((1, name) for name in parts[:-1]) + ((0, parts[-1]),)
+
+
+def filter_java_files(directory, candidates, source_roots=None):
+    """
+    以 `list_java_files` 的規則篩選指定的檔案。
+
+    說明不走訪目錄樹，而是逐一檢查候選路徑：必須是位於 `directory` 內、仍存在的 `.java` 檔，
+    且位於設定的 source root 中並避開同樣的略過目錄。只有候選檔不在任何 source root 內時，
+    才會走訪到第一個 source root 為止，確認專案是否採用「無 source root、整棵掃描」的模式。
+    結果依完整掃描時的走訪順序排列，重複路徑只保留一次。
+
+    :param directory: 掃描根目錄。
+    :param candidates: 候選檔案路徑清單。
+    :param source_roots: 相對於模組目錄的 source root 清單；None 時使用 `src/main/java`。
+    :returns: 排序後的 Java 檔路徑清單。
+    """
+    root = Path(directory)
+    root_real = Path(os.path.realpath(directory))
+    layouts = source_roots or DEFAULT_SOURCE_ROOTS
+    layout_parts = [Path(value).parts for value in layouts]
+    normalized_root = root.as_posix().rstrip("/")
+    root_is_source = any(normalized_root.endswith("/" + value) or normalized_root == value for value in layouts)
+    has_source_roots = None
+
+    selected = {}
+    for candidate in candidates:
+        path = Path(os.path.realpath(candidate))
+        if path.suffix != ".java" or not path.is_file():
+            continue
+        try:
+            parts = path.relative_to(root_real).parts
+        except ValueError:
             continue
+        dirs = parts[:-1]
+
+        if root_is_source:
+            listed = not any(name in SOURCE_SKIP_DIRS for name in dirs)
+        else:
+            listed = False
+            in_layout = False
+            for layout in layout_parts:
+                for start in range(len(dirs) - len(layout) + 1):
+                    if dirs[start : start + len(layout)] != layout:
+                        continue
+                    in_layout = True
+                    module_dirs = dirs[:start]
+                    package_dirs = dirs[start + len(layout) :]
+                    if not any(name in SKIP_DIRS or name.startswith(".") for name in module_dirs) and not any(
+                        name in SOURCE_SKIP_DIRS for name in package_dirs
+                    ):
+                        listed = True
+            if not in_layout:
+                if has_source_roots is None:
+                    has_source_roots = next(iter_source_roots(root, layouts), None) is not None
+                listed = not has_source_roots and not any(
+                    skip_fallback_dir(name, is_module_level(root.joinpath(*dirs[:index]), root))
+                    for index, name in enumerate(dirs)
+                )
+
+        if listed:
+            selected[parts] = str(root.joinpath(*parts))
+
+    return [selected[parts] for parts in sorted(selected, key=walk_order_key)]
+
+
+def select_java_files(directory, args, include_archives=False):
+    """
+    依命令列參數決定要處理的 Java 檔。
 
-        if line.startswith("/**"):
-            return True
-
-        if line.endswith("*/"):
-            j = i - 1
-            while j >= 0:
-                current = lines[j].strip()
-                if not current:
-                    j -= 1
-                    continue
-                if current.startswith("/**"):
-                    return True
-                if current.startswith("*") or current.startswith("/*"):
-                    j -= 1
-                    continue
-                return False
+    說明未指定增量參數時等同 `list_java_files`；指定 `--changed-since`、`--staged`
+    或 `--files-from` 時改由 git 或檔案清單取得候選檔，再以 `filter_java_files` 篩選，
+    不走訪整個專案。
 
-        return False
+    :param directory: 掃描根目錄。
+    :param args: 解析後的 ScriptArgs。
+    :param include_archives: 完整掃描時是否包含目錄下壓縮檔中的 Java 檔。
+    :returns: Java 檔路徑清單。
+    :raises ValueError: 當增量模式的根目錄是壓縮檔或 git 指令失敗時拋出。
+    """
+    source_roots = configured_source_roots(args)
+    if not is_incremental(args):
+        return list_java_files(directory, source_roots, include_archives)
+    if not os.path.isdir(directory):
+        raise ValueError("--changed-since, --staged and --files-from require a directory root")
 
-    return False
+    candidates = []
+    if args.files_from:
+        candidates.extend(read_file_list(args.files_from))
+    if args.changed_since or args.staged:
+        candidates.extend(git_changed_files(directory, args.changed_since, args.staged))
+    return filter_java_files(directory, candidates, source_roots)
 
 
-def is_type_declaration(line):
+def iter_java_files(func, files, jobs=1, initializer=None, initargs=()):
     """
-    判斷是否符合條件。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
+    依檔案順序對每個 Java 檔執行 `func`，必要時分散到多個 process。
+
+    說明 `initializer` 在每個 worker 啟動時執行一次，用來建立已編譯的 profile、
+    banned patterns 等共用狀態；序列模式也會先呼叫一次，確保兩種模式行為一致。
+    結果依 `files` 原始順序逐一產出，呼叫端可邊處理邊輸出。
+
+    :param func: 接收單一檔案路徑的頂層函式（需可被 pickle）。
+    :param files: 檔案路徑清單。
+    :param jobs: worker 數量；小於等於 1 時在目前 process 內執行。
+    :param initializer: worker 初始化函式。
+    :param initargs: 傳給 `initializer` 的參數。
+    :returns: 依 `files` 順序產出結果的 generator。
+    """
+    if jobs <= 1 or len(files) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for file_path in files:
+            yield func(file_path)
+        return
+
+    workers = min(jobs, len(files))
+    chunksize = max(1, min(64, len(files) // (workers * 8)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        yield from executor.map(func, files, chunksize=chunksize)
+
+
+def map_java_files(func, files, jobs=1, initializer=None, initargs=()):
+    """
+    依檔案順序對每個 Java 檔執行 `func` 並收集全部結果。
+
+    說明行為與 `iter_java_files` 相同，結果依 `files` 原始順序回傳，
+    因此合併後的輸出與序列執行完全相同。
+
+    :param func: 接收單一檔案路徑的頂層函式（需可被 pickle）。
+    :param files: 檔案路徑清單。
+    :param jobs: worker 數量；小於等於 1 時在目前 process 內執行。
+    :param initializer: worker 初始化函式。
+    :param initargs: 傳給 `initializer` 的參數。
+    :returns: 與 `files` 順序一致的結果清單。
+    """
+    return list(iter_java_files(func, files, jobs, initializer, initargs))
+
+
+def relative_path(file_path, root):
+    """
+    執行 relative_path 的核心流程並回傳結果。
     
-    :param line: 此參數會影響函式的執行行為。
-    :returns: 條件判斷結果。
+    說明壓縮檔 entry 以 `archive!/path/To.java` 表示；根目錄本身是壓縮檔時，
+    以其所在目錄為基準，保留壓縮檔名稱。
+
+    :param file_path: 檔案路徑。
+    :param root: 此參數會影響函式的執行行為。
+    :returns: 函式回傳結果。
     """
-    trimmed = line.strip()
-    return bool(
-        re.match(
-            r"^(?:public\s+)?(?:abstract\s+|final\s+)?(?:class|interface|enum)\s+[A-Za-z_]\w*",
-            trimmed,
-        )
-    )
+    if is_archive_path(root) and os.path.isfile(root):
+        root = os.path.dirname(root)
+    return os.path.relpath(file_path, root).replace("\\", "/")
 
 
-def parse_type_declaration(line):
+def source_location(rel_file, source_roots=None):
     """
-    解析輸入內容。
+    由相對路徑推得模組與 Java package。
+
+    說明模組為 source root 之前的目錄（根目錄本身為 `.`），package 為 source root 之後的目錄；
+    路徑中沒有 source root 時，整段目錄都視為 package。壓縮檔 entry 以壓縮檔名稱作為模組。
+
+    :param rel_file: `relative_path` 產生的相對路徑。
+    :param source_roots: 相對於模組目錄的 source root 清單；None 時使用 `src/main/java`。
+    :returns: (模組路徑, package 名稱；default package 為 `(default)`)。
+    """
+    archive = None
+    if ARCHIVE_SEPARATOR in rel_file:
+        archive, rel_file = rel_file.split(ARCHIVE_SEPARATOR, 1)
+    dirs = tuple(rel_file.split("/")[:-1])
+
+    module_dirs = ()
+    package_dirs = dirs
+    for value in source_roots or DEFAULT_SOURCE_ROOTS:
+        layout = Path(value).parts
+        starts = [start for start in range(len(dirs) - len(layout) + 1) if dirs[start : start + len(layout)] == layout]
+        if starts:
+            module_dirs = dirs[: starts[0]]
+            package_dirs = dirs[starts[0] + len(layout) :]
+            break
+
+    module = "/".join(module_dirs)
+    if archive is not None:
+        module = archive + (ARCHIVE_SEPARATOR + module if module else "")
+    return module or ".", ".".join(package_dirs) or "(default)"
+
+
+def detect_eol(content):
+    """
+    執行 detect_eol 的核心流程並回傳結果。
     
     說明此函式的主要流程、輸入限制與輸出語意。
     
-    :param line: 此參數會影響函式的執行行為。
+    :param content: 此參數會影響函式的執行行為。
     :returns: 函式回傳結果。
     """
-    trimmed = line.strip()
-    match = re.match(
-        r"^(?:public\s+)?(?:abstract\s+|final\s+)?(class|interface|enum)\s+([A-Za-z_]\w*)",
-        trimmed,
-    )
-    if not match:
-        return None
-
-    return {
-        "kind": match.group(1),
-        "name": match.group(2),
-    }
+    return "\r\n" if "\r\n" in content else "\n"
 
 
 def split_params(raw):
@@ -278,79 +884,6 @@ def extract_param_name(param):
     return name
 
 
-def is_method_start_line(line, include_private=False):
-    """
-    判斷是否符合條件。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param line: 此參數會影響函式的執行行為。
-    :param include_private: 此參數會影響函式的執行行為。
-    :returns: 條件判斷結果。
-    """
-    trimmed = line.strip()
-    visibility = r"(public|protected|private)" if include_private else r"(public|protected)"
-    if not re.match(rf"^{visibility}\s+", trimmed):
-        return False
-    if re.search(r"\b(class|interface|enum)\b", trimmed):
-        return False
-    return "(" in trimmed
-
-
-def collect_method_signature(lines, start_index):
-    """
-    執行 collect_method_signature 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param lines: 此參數會影響函式的執行行為。
-    :param start_index: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
-    """
-    end_index = start_index
-    signature = lines[start_index].strip()
-
-    while (
-        end_index + 1 < len(lines)
-        and not (
-            lines[end_index].strip().endswith("{")
-            or lines[end_index].strip().endswith(";")
-        )
-    ):
-        end_index += 1
-        signature += f" {lines[end_index].strip()}"
-        if end_index - start_index > 30:
-            break
-
-    return {
-        "signature": signature,
-        "end_index": end_index,
-    }
-
-
-def is_method_declaration(signature, include_private=False):
-    """
-    判斷是否符合條件。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param signature: 此參數會影響函式的執行行為。
-    :param include_private: 此參數會影響函式的執行行為。
-    :returns: 條件判斷結果。
-    """
-    trimmed = signature.strip()
-    visibility = r"(public|protected|private)" if include_private else r"(public|protected)"
-    if not re.match(rf"^{visibility}\s+", trimmed):
-        return False
-    if "(" not in trimmed or ")" not in trimmed:
-        return False
-    if not (trimmed.endswith("{") or trimmed.endswith(";")):
-        return False
-    if re.search(r"\b(class|interface|enum)\b", trimmed):
-        return False
-    return True
-
-
 def parse_method_declaration(signature, class_name):
     """
     解析輸入內容。
@@ -364,6 +897,15 @@ def parse_method_declaration(signature, class_name):
     trimmed = re.sub(r"[;{]\s*$", "", signature.strip()).strip()
     open_index = trimmed.find("(")
     close_index = trimmed.rfind(")")
+    if open_index < 0 and class_name and trimmed.split()[-1:] == [class_name]:
+        # record 的精簡建構子（`public Point {`）沒有參數列，元件即為隱含參數。
+        return {
+            "name": class_name,
+            "returnType": None,
+            "params": [],
+            "throwsList": [],
+            "isConstructor": True,
+        }
     if open_index < 0 or close_index < 0 or close_index < open_index:
         return None
 
@@ -409,63 +951,105 @@ def parse_method_declaration(signature, class_name):
     }
 
 
-def find_insertion_index(lines, method_start):
+def declaration_method_info(declaration, class_name):
     """
-    執行 find_insertion_index 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param lines: 此參數會影響函式的執行行為。
-    :param method_start: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    由 lexer 產生的方法宣告解析方法資訊。
+
+    說明建構子判斷以宣告所屬型別名稱為準，缺少時退回使用檔名推得的類別名稱。
+
+    :param declaration: `java_lexer.JavaDeclaration`。
+    :param class_name: 備用類別名稱。
+    :returns: 方法資訊字典（含 `line`）；無法解析時回傳 None。
     """
-    insertion_index = method_start
-    while insertion_index > 0 and lines[insertion_index - 1].strip().startswith("@"):
-        insertion_index -= 1
-    return insertion_index
+    method_info = parse_method_declaration(declaration.signature, declaration.enclosing_type or class_name)
+    if method_info:
+        method_info["line"] = declaration.line_index + 1
+    return method_info
 
 
-def reorder_doc_before_annotations(lines):
+def plan_doc_reorders(lines):
     """
-    執行 reorder_doc_before_annotations 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param lines: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    找出需要把 Javadoc 移到 annotation 之前的區段。
+
+    說明只讀取 `lines`、不做任何修改；每個區段為
+    `(annotation_start, annotation_end, doc_start, doc_end)`，依行號遞增排列且互不重疊。
+
+    :param lines: 原始碼行清單。
+    :returns: 區段清單。
     """
-    changed = False
+    reorders = []
     i = 0
-    while i < len(lines):
+    total = len(lines)
+    while i < total:
         if not lines[i].strip().startswith("@"):
             i += 1
             continue
 
         annotation_start = i
         annotation_end = i
-        while annotation_end + 1 < len(lines) and lines[annotation_end + 1].strip().startswith("@"):
+        while annotation_end + 1 < total and lines[annotation_end + 1].strip().startswith("@"):
             annotation_end += 1
 
         probe = annotation_end + 1
-        while probe < len(lines) and not lines[probe].strip():
+        while probe < total and not lines[probe].strip():
             probe += 1
 
-        if probe >= len(lines) or not lines[probe].strip().startswith("/**"):
+        if probe >= total or not lines[probe].strip().startswith("/**"):
             i = annotation_end + 1
             continue
 
         doc_end = probe
-        while doc_end < len(lines) and "*/" not in lines[doc_end]:
+        while doc_end < total and "*/" not in lines[doc_end]:
             doc_end += 1
-        if doc_end >= len(lines):
+        if doc_end >= total:
             i = annotation_end + 1
             continue
 
-        annotations = lines[annotation_start : annotation_end + 1]
-        spacing = lines[annotation_end + 1 : probe]
-        javadoc = lines[probe : doc_end + 1]
-        lines[annotation_start : doc_end + 1] = javadoc + spacing + annotations
-        changed = True
-        i = annotation_start + len(javadoc) + len(spacing) + len(annotations)
+        reorders.append((annotation_start, annotation_end, probe, doc_end))
+        i = doc_end + 1
+
+    return reorders
 
-    return changed
+
+def apply_doc_reorders(lines, reorders):
+    """
+    依 `plan_doc_reorders` 的結果一次建立重新排列後的行清單。
+
+    說明每個區段改為 Javadoc、原本的空白行、annotation 的順序，其餘行原樣複製，
+    整體只線性走訪一次。
+
+    :param lines: 原始碼行清單。
+    :param reorders: `plan_doc_reorders` 回傳的區段清單。
+    :returns: 新的行清單。
+    """
+    output = []
+    cursor = 0
+    for annotation_start, annotation_end, doc_start, doc_end in reorders:
+        output.extend(lines[cursor:annotation_start])
+        output.extend(lines[doc_start : doc_end + 1])
+        output.extend(lines[annotation_end + 1 : doc_start])
+        output.extend(lines[annotation_start : annotation_end + 1])
+        cursor = doc_end + 1
+    output.extend(lines[cursor:])
+    return output
+
+
+def insert_line_blocks(lines, insertions):
+    """
+    一次將多個行區塊插入到指定位置。
+
+    說明 `insertions` 為 `(index, block_lines)`，插入點指的是原始 `lines` 的索引；
+    同一插入點的多個區塊依清單順序排列。以單次線性合併取代逐次切片插入。
+
+    :param lines: 原始行清單。
+    :param insertions: 插入點與行區塊清單。
+    :returns: 新的行清單。
+    """
+    output = []
+    cursor = 0
+    for index, block in sorted(insertions, key=lambda item: item[0]):
+        output.extend(lines[cursor:index])
+        output.extend(block)
+        cursor = index
+    output.extend(lines[cursor:])
+    return output
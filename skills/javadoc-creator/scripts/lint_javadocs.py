@@ -9,22 +9,26 @@ lint_javadocs 模組的主要功能。
 import json
 import re
 import sys
+from functools import partial
 from pathlib import Path
 
+from declaration_index import DeclarationIndex, load_file_declarations
+from java_symbol_index import JavaSymbolIndex, iter_doc_references, split_reference
 from javadoc_utils import (
-    collect_method_signature,
+    configured_source_roots,
     extract_param_name,
-    find_insertion_index,
-    has_javadoc,
-    is_method_declaration,
-    is_method_start_line,
-    is_type_declaration,
+    is_incremental,
+    iter_java_files,
     list_java_files,
     parse_args,
-    parse_method_declaration,
+    read_source_bytes,
     relative_path,
     resolve_root,
+    select_java_files,
 )
+from lint_report_writers import NdjsonReportWriter, SarifReportWriter
+from rule_profiler import RuleProfiler, write_cost_table
+from source_prefilter import SourcePrefilter
 from style_profile_utils import load_style_profile, normalize_banned_patterns
 
 
@@ -38,6 +42,38 @@ DEFAULT_SUMMARY_DISALLOW_PATTERNS = [
     r"^這個方法",
 ]
 
+LINT_RULES = [
+    ("missing-javadoc", "公開型別或方法缺少 Javadoc。", None),
+    ("missing-summary", "Javadoc 缺少摘要句。", "enforceSummarySentence"),
+    ("summary-punctuation", "摘要句應以句號結尾。", "enforceSummarySentence"),
+    ("summary-fragment", "摘要句不應使用模板開頭。", "enforceSummaryFragment"),
+    ("missing-blank-before-tags", "主描述與 block tags 之間應有空行。", None),
+    ("text-after-tags", "block tags 之後不應再出現主描述文字。", None),
+    ("tag-order", "block tags 需符合設定的順序。", "enforceTagOrder"),
+    ("missing-tag-argument", "@param/@throws 缺少目標名稱。", "requireNonEmptyTagDescription"),
+    ("empty-tag-description", "block tag 不可使用空白描述。", "requireNonEmptyTagDescription"),
+    ("duplicate-deprecated-tag", "@deprecated 不可重複出現。", None),
+    ("missing-deprecated-description", "@deprecated 需包含棄用原因與替代方案。", "requireDeprecatedDescription"),
+    ("missing-deprecated-link", "@deprecated 建議以 {@link ...} 指向替代 API。", "requireDeprecatedReplacementLink"),
+    ("missing-param-tag", "方法參數缺少 @param。", "requireParamTags"),
+    ("duplicate-param-tag", "@param 重複出現。", "requireParamTags"),
+    ("unexpected-param-tag", "@param 找不到對應的方法參數。", "requireParamTags"),
+    ("missing-return-tag", "非 void 方法缺少 @return。", "requireReturnTagForNonVoid"),
+    ("unexpected-return-tag", "void 或建構子不應出現 @return。", "forbidReturnTagForVoidOrConstructor"),
+    ("duplicate-return-tag", "@return 不可重複出現。", None),
+    ("duplicate-throws-tag", "@throws/@exception 重複出現。", None),
+    ("missing-throws-tag", "宣告的 throws 缺少 @throws。", "requireDeclaredThrowsTags"),
+    ("weak-text", "Javadoc 含有 profile 禁用的低資訊句型。", "bannedPatterns"),
+    ("unresolved-link", "{@link}/@see 參照的型別不存在。", "symbolIndex"),
+    ("unresolved-link-member", "{@link}/@see 參照的方法不存在。", "symbolIndex"),
+    ("unresolved-throws-type", "@throws 參照的例外型別不存在。", "symbolIndex"),
+    ("undeclared-throws-tag", "@throws 的 checked 例外未在方法宣告中 throws。", "symbolIndex"),
+]
+
+REPORT_FORMATS = {"text", "json", "sarif", "ndjson"}
+
+_WORKER_STATE = {}
+
 
 def normalize_exception_name(value):
     """
@@ -73,43 +109,6 @@ def extract_doc_content(line):
     return text
 
 
-def locate_javadoc_block_before(lines, insertion_index):
-    """
-    執行 locate_javadoc_block_before 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param lines: 此參數會影響函式的執行行為。
-    :param insertion_index: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
-    """
-    probe = insertion_index - 1
-    while probe >= 0:
-        text = lines[probe].strip()
-        if not text or text.startswith("@"):
-            probe -= 1
-            continue
-        break
-
-    if probe < 0:
-        return None
-
-    if "*/" not in lines[probe]:
-        return None
-
-    end = probe
-    start = end
-    while start >= 0 and "/**" not in lines[start]:
-        start -= 1
-
-    if start < 0:
-        return None
-    return {
-        "start": start,
-        "end": end,
-    }
-
-
 def parse_javadoc_block(lines, start, end):
     """
     解析輸入內容。
@@ -266,149 +265,230 @@ def contains_link_reference(text):
     return bool(re.search(r"\{@link\s+[^}]+\}", text))
 
 
-def has_override_annotation(lines, start_index, declaration_index):
+class DocletRuleEngine:
     """
-    判斷是否具備指定條件。
-
-    說明此函式的主要流程、輸入限制與輸出語意。
+    DocletRuleEngine 的核心行為實作。
 
-    :param lines: 此參數會影響函式的執行行為。
-    :param start_index: 此參數會影響函式的執行行為。
-    :param declaration_index: 此參數會影響函式的執行行為。
-    :returns: 條件判斷結果。
+    說明在啟動時把 `docletSpec` 編譯為可重複使用的規則：預先編譯摘要禁用樣式、
+    建立 tag 排序表並產生固定訊息字串。逐區塊驗證時只需走訪一次已解析的 tags。
     """
-    for index in range(start_index, declaration_index):
-        text = lines[index].strip()
-        if not text or not text.startswith("@"):
-            continue
-        if re.match(r"^@Override\b", text):
-            return True
-    return False
-
 
-def validate_doclet_structure(file_path, block, declaration_kind, method_info, doclet_spec):
-    """
-    驗證輸入資料是否符合規範。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param file_path: 檔案路徑。
-    :param block: 此參數會影響函式的執行行為。
-    :param declaration_kind: 此參數會影響函式的執行行為。
-    :param method_info: 此參數會影響函式的執行行為。
-    :param doclet_spec: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
-    """
-    issues = []
-    summary = block.get("summary")
-    tags = block.get("tags", [])
-    block_start_line = block.get("startLine") or (tags[0]["line"] if tags else 1)
-
-    if doclet_spec.get("enforceSummarySentence", True):
-        if not summary:
-            issues.append(
-                build_issue(
-                    file_path,
-                    block_start_line,
-                    "missing-summary",
-                    "Javadoc 缺少摘要句（summary sentence）。",
-                )
-            )
-        elif not summary.endswith(SUMMARY_END_PUNCTUATION):
-            issues.append(
-                build_issue(
-                    file_path,
-                    block_start_line,
-                    "summary-punctuation",
-                    "摘要句建議以句號結尾，符合 Standard Doclet 可讀性慣例。",
-                )
-            )
-
-    if doclet_spec.get("enforceSummaryFragment", False) and summary:
-        configured_patterns = doclet_spec.get("summaryDisallowPatterns")
+    def __init__(self, doclet_spec):
+        """
+        編譯 doclet 規格。
+
+        說明無法編譯的 `summaryDisallowPatterns` 項目會被略過，與逐區塊編譯時的行為一致。
+
+        :param doclet_spec: profile 中的 `docletSpec` 設定。
+        """
+        self.spec = doclet_spec or {}
+        spec = self.spec
+
+        self.enforce_summary_sentence = bool(spec.get("enforceSummarySentence", True))
+        self.enforce_summary_fragment = bool(spec.get("enforceSummaryFragment", False))
+        self.enforce_tag_order = bool(spec.get("enforceTagOrder", True))
+        self.require_non_empty_tag_description = bool(spec.get("requireNonEmptyTagDescription", True))
+        self.require_deprecated_description = bool(spec.get("requireDeprecatedDescription", False))
+        self.require_deprecated_link = bool(spec.get("requireDeprecatedReplacementLink", False))
+        self.require_param_tags = bool(spec.get("requireParamTags", True))
+        self.require_return_tag = bool(spec.get("requireReturnTagForNonVoid", True))
+        self.forbid_return_tag = bool(spec.get("forbidReturnTagForVoidOrConstructor", True))
+        self.require_declared_throws = bool(spec.get("requireDeclaredThrowsTags", True))
+
+        configured_patterns = spec.get("summaryDisallowPatterns")
         if isinstance(configured_patterns, list) and configured_patterns:
             summary_patterns = configured_patterns
         else:
             summary_patterns = DEFAULT_SUMMARY_DISALLOW_PATTERNS
 
+        self.summary_patterns = []
         for pattern in summary_patterns:
             try:
-                regex = re.compile(pattern)
+                self.summary_patterns.append((pattern, re.compile(pattern)))
             except re.error:
                 continue
 
-            if regex.search(summary):
+        raw_tag_order = spec.get("tagOrder")
+        if isinstance(raw_tag_order, list) and raw_tag_order:
+            tag_order = [normalize_tag_name(str(name).lower()) for name in raw_tag_order]
+        else:
+            tag_order = list(DEFAULT_TAG_ORDER)
+
+        self.tag_rank = build_tag_rank(tag_order)
+        order_display = []
+        for name in tag_order:
+            if name not in order_display:
+                order_display.append(name)
+        expected_tag_order = " -> ".join(f"@{name}" for name in order_display)
+        self.tag_order_message = f"核心 tags 順序需為 {expected_tag_order}。"
+        self.profiler = None
+
+    def rule_metadata(self, banned_patterns=None, symbol_index=False):
+        """
+        依已編譯的規格產生目前啟用的規則清單。
+
+        說明供 SARIF 等報告格式一次寫出規則中繼資料；
+        未啟用的 docletSpec 規則不會產生問題，因此不列入。
+
+        :param banned_patterns: 已編譯的 banned patterns；為空時不列入 `weak-text`。
+        :param symbol_index: 是否啟用符號索引驗證。
+        :returns: 規則清單，每筆包含 `id`、`description`、`level` 與 `properties`。
+        """
+        enabled = {
+            "enforceSummarySentence": self.enforce_summary_sentence,
+            "enforceSummaryFragment": self.enforce_summary_fragment,
+            "enforceTagOrder": self.enforce_tag_order,
+            "requireNonEmptyTagDescription": self.require_non_empty_tag_description,
+            "requireDeprecatedDescription": self.require_deprecated_description,
+            "requireDeprecatedReplacementLink": self.require_deprecated_link,
+            "requireParamTags": self.require_param_tags,
+            "requireReturnTagForNonVoid": self.require_return_tag,
+            "forbidReturnTagForVoidOrConstructor": self.forbid_return_tag,
+            "requireDeclaredThrowsTags": self.require_declared_throws,
+            "bannedPatterns": bool(banned_patterns),
+            "symbolIndex": bool(symbol_index),
+        }
+        rules = []
+        for kind, description, spec_key in LINT_RULES:
+            if spec_key is not None and not enabled.get(spec_key, False):
+                continue
+            rule = {
+                "id": kind,
+                "description": description,
+                "level": "note" if kind == "weak-text" else "warning",
+            }
+            if spec_key is not None:
+                rule["properties"] = {"docletSpec": spec_key}
+            rules.append(rule)
+        return rules
+
+    def validate(self, file_path, block, declaration_kind, method_info):
+        """
+        驗證單一 Javadoc 區塊。
+
+        說明 tags 只走訪一次並同時完成排序、描述與分類檢查；
+        問題輸出順序與逐項檢查時相同。設定 `profiler` 時，各規則階段的耗時與命中數
+        會記錄到 RuleProfiler；tag 單次走訪中的排序與描述檢查合併記為 `tag-pass`。
+
+        :param file_path: 檔案路徑。
+        :param block: `parse_javadoc_block` 的結果。
+        :param declaration_kind: `type` 或 `method`。
+        :param method_info: 方法資訊；型別宣告時為 None。
+        :returns: 問題清單。
+        """
+        issues = []
+        summary = block.get("summary")
+        tags = block.get("tags", [])
+        block_start_line = block.get("startLine") or (tags[0]["line"] if tags else 1)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin(issues)
+
+        if self.enforce_summary_sentence:
+            if not summary:
                 issues.append(
                     build_issue(
                         file_path,
                         block_start_line,
-                        "summary-fragment",
-                        "摘要句型不符合 Google Javadoc summary fragment 建議，請避免模板開頭。",
-                        extra={"pattern": pattern},
+                        "missing-summary",
+                        "Javadoc 缺少摘要句（summary sentence）。",
                     )
                 )
-                break
-
-    if tags and not block.get("hasBlankBeforeFirstTag"):
-        issues.append(
-            build_issue(
-                file_path,
-                block.get("firstTagLine") or block_start_line,
-                "missing-blank-before-tags",
-                "主描述與 block tags 之間應有空行。",
-            )
-        )
-
-    if block.get("hasTextAfterFirstTag"):
-        issues.append(
-            build_issue(
-                file_path,
-                block.get("firstTagLine") or block_start_line,
-                "text-after-tags",
-                "發現 block tags 後仍有主描述文字，請將描述移至 tags 之前。",
-            )
-        )
-
-    raw_tag_order = doclet_spec.get("tagOrder")
-    if isinstance(raw_tag_order, list) and raw_tag_order:
-        tag_order = [normalize_tag_name(str(name).lower()) for name in raw_tag_order]
-    else:
-        tag_order = list(DEFAULT_TAG_ORDER)
-
-    tag_rank = build_tag_rank(tag_order)
-    order_display = []
-    for name in tag_order:
-        if name not in order_display:
-            order_display.append(name)
-    expected_tag_order = " -> ".join(f"@{name}" for name in order_display)
-
-    if doclet_spec.get("enforceTagOrder", True):
-        previous_rank = 0
-        for tag in tags:
-            normalized_name = normalize_tag_name(tag["name"])
-            rank = tag_rank.get(normalized_name)
-            if rank is None:
-                continue
-            if rank < previous_rank:
+            elif not summary.endswith(SUMMARY_END_PUNCTUATION):
                 issues.append(
                     build_issue(
                         file_path,
-                        tag["line"],
-                        "tag-order",
-                        f"核心 tags 順序需為 {expected_tag_order}。",
+                        block_start_line,
+                        "summary-punctuation",
+                        "摘要句建議以句號結尾，符合 Standard Doclet 可讀性慣例。",
+                    )
+                )
+            if profiler is not None:
+                profiler.lap("summary-sentence", issues)
+
+        if self.enforce_summary_fragment and summary:
+            for pattern, regex in self.summary_patterns:
+                if regex.search(summary):
+                    issues.append(
+                        build_issue(
+                            file_path,
+                            block_start_line,
+                            "summary-fragment",
+                            "摘要句型不符合 Google Javadoc summary fragment 建議，請避免模板開頭。",
+                            extra={"pattern": pattern},
+                        )
                     )
+                    if profiler is not None:
+                        profiler.lap(f"summary-fragment:{pattern}", issues)
+                    break
+                if profiler is not None:
+                    profiler.lap(f"summary-fragment:{pattern}", issues)
+
+        if tags and not block.get("hasBlankBeforeFirstTag"):
+            issues.append(
+                build_issue(
+                    file_path,
+                    block.get("firstTagLine") or block_start_line,
+                    "missing-blank-before-tags",
+                    "主描述與 block tags 之間應有空行。",
                 )
-                break
-            previous_rank = rank
+            )
+
+        if block.get("hasTextAfterFirstTag"):
+            issues.append(
+                build_issue(
+                    file_path,
+                    block.get("firstTagLine") or block_start_line,
+                    "text-after-tags",
+                    "發現 block tags 後仍有主描述文字，請將描述移至 tags 之前。",
+                )
+            )
+        if profiler is not None:
+            profiler.lap("tag-layout", issues)
+
+        order_issue = None
+        description_issues = []
+        deprecated_tags = []
+        param_names = []
+        return_tags = []
+        throws_names = []
+        tag_rank = self.tag_rank
+        previous_rank = 0
+        check_order = self.enforce_tag_order
+        check_description = self.require_non_empty_tag_description
 
-    if doclet_spec.get("requireNonEmptyTagDescription", True):
         for tag in tags:
-            normalized_name = normalize_tag_name(tag["name"])
-            if normalized_name not in {"param", "return", "throws"}:
+            name = tag["name"]
+            normalized_name = "throws" if name == "exception" else name
+
+            if check_order and order_issue is None:
+                rank = tag_rank.get(normalized_name)
+                if rank is not None:
+                    if rank < previous_rank:
+                        order_issue = build_issue(file_path, tag["line"], "tag-order", self.tag_order_message)
+                    else:
+                        previous_rank = rank
+
+            if normalized_name == "param":
+                arg = tag.get("arg")
+                if arg and not arg.startswith("<"):
+                    param_names.append(arg)
+            elif normalized_name == "return":
+                return_tags.append(tag)
+            elif normalized_name == "throws":
+                throws_name = normalize_exception_name(tag.get("arg"))
+                if throws_name:
+                    throws_names.append(throws_name)
+            elif name == "deprecated":
+                deprecated_tags.append(tag)
+                continue
+            else:
                 continue
 
+            if not check_description:
+                continue
             if normalized_name in {"param", "throws"} and not (tag.get("arg") or "").strip():
-                issues.append(
+                description_issues.append(
                     build_issue(
                         file_path,
                         tag["line"],
@@ -416,9 +496,8 @@ def validate_doclet_structure(file_path, block, declaration_kind, method_info, d
                         f"@{normalized_name} 缺少必要目標名稱。",
                     )
                 )
-
             if not (tag.get("text") or "").strip():
-                issues.append(
+                description_issues.append(
                     build_issue(
                         file_path,
                         tag["line"],
@@ -427,154 +506,265 @@ def validate_doclet_structure(file_path, block, declaration_kind, method_info, d
                     )
                 )
 
-    deprecated_tags = [tag for tag in tags if tag["name"] == "deprecated"]
-    if len(deprecated_tags) > 1:
-        issues.append(
-            build_issue(
-                file_path,
-                deprecated_tags[1]["line"],
-                "duplicate-deprecated-tag",
-                "@deprecated 不可重複出現。",
+        if order_issue is not None:
+            issues.append(order_issue)
+        issues.extend(description_issues)
+        if profiler is not None:
+            profiler.lap("tag-pass", issues)
+
+        if len(deprecated_tags) > 1:
+            issues.append(
+                build_issue(
+                    file_path,
+                    deprecated_tags[1]["line"],
+                    "duplicate-deprecated-tag",
+                    "@deprecated 不可重複出現。",
+                )
             )
-        )
 
-    if doclet_spec.get("requireDeprecatedDescription", False):
-        for tag in deprecated_tags:
-            if not (tag.get("text") or "").strip():
-                issues.append(
-                    build_issue(
-                        file_path,
-                        tag["line"],
-                        "missing-deprecated-description",
-                        "@deprecated 需包含棄用原因與替代方案。",
+        if self.require_deprecated_description:
+            for tag in deprecated_tags:
+                if not (tag.get("text") or "").strip():
+                    issues.append(
+                        build_issue(
+                            file_path,
+                            tag["line"],
+                            "missing-deprecated-description",
+                            "@deprecated 需包含棄用原因與替代方案。",
+                        )
                     )
-                )
 
-    if doclet_spec.get("requireDeprecatedReplacementLink", False):
-        for tag in deprecated_tags:
-            text = (tag.get("text") or "").strip()
-            if not text:
-                continue
-            if not contains_link_reference(text):
+        if self.require_deprecated_link:
+            for tag in deprecated_tags:
+                text = (tag.get("text") or "").strip()
+                if not text:
+                    continue
+                if not contains_link_reference(text):
+                    issues.append(
+                        build_issue(
+                            file_path,
+                            tag["line"],
+                            "missing-deprecated-link",
+                            "@deprecated 建議包含 {@link ...} 指向替代 API。",
+                        )
+                    )
+        if profiler is not None:
+            profiler.lap("deprecated-tags", issues)
+
+        if declaration_kind != "method" or not method_info:
+            return issues
+
+        method_line = method_info.get("line") or block_start_line
+        expected_param_names = [extract_param_name(raw) for raw in method_info.get("params", [])]
+        expected_param_names = [name for name in expected_param_names if name]
+
+        if self.require_param_tags:
+            actual_set = set(param_names)
+            for name in expected_param_names:
+                if name not in actual_set:
+                    issues.append(
+                        build_issue(
+                            file_path,
+                            method_line,
+                            "missing-param-tag",
+                            f"參數 `{name}` 缺少對應的 @param 說明。",
+                        )
+                    )
+
+            counts = {}
+            for name in param_names:
+                counts[name] = counts.get(name, 0) + 1
+            for name in sorted(counts):
+                if counts[name] > 1:
+                    issues.append(
+                        build_issue(
+                            file_path,
+                            method_line,
+                            "duplicate-param-tag",
+                            f"參數 `{name}` 出現重複 @param。",
+                        )
+                    )
+
+            expected_set = set(expected_param_names)
+            for name in sorted(actual_set - expected_set):
                 issues.append(
                     build_issue(
                         file_path,
-                        tag["line"],
-                        "missing-deprecated-link",
-                        "@deprecated 建議包含 {@link ...} 指向替代 API。",
+                        method_line,
+                        "unexpected-param-tag",
+                        f"@param `{name}` 找不到對應的方法參數。",
                     )
                 )
+            if profiler is not None:
+                profiler.lap("param-tags", issues)
 
-    if declaration_kind != "method" or not method_info:
-        return issues
-
-    expected_param_names = [extract_param_name(raw) for raw in method_info.get("params", [])]
-    expected_param_names = [name for name in expected_param_names if name]
-
-    param_tags = [tag for tag in tags if tag["name"] == "param" and tag.get("arg")]
-    method_param_tags = [tag for tag in param_tags if not tag["arg"].startswith("<")]
-    actual_param_names = [tag["arg"] for tag in method_param_tags]
+        expected_return = (not method_info.get("isConstructor")) and method_info.get("returnType") != "void"
 
-    if doclet_spec.get("requireParamTags", True):
-        missing_params = [name for name in expected_param_names if name not in actual_param_names]
-        for name in missing_params:
+        if self.require_return_tag and expected_return and not return_tags:
             issues.append(
                 build_issue(
                     file_path,
-                    method_info.get("line") or block_start_line,
-                    "missing-param-tag",
-                    f"參數 `{name}` 缺少對應的 @param 說明。",
+                    method_line,
+                    "missing-return-tag",
+                    "非 void 且非建構子方法需提供 @return。",
                 )
             )
 
-        for name in sorted(set(actual_param_names)):
-            if actual_param_names.count(name) > 1:
-                issues.append(
-                    build_issue(
-                        file_path,
-                        method_info.get("line") or block_start_line,
-                        "duplicate-param-tag",
-                        f"參數 `{name}` 出現重複 @param。",
-                    )
+        if self.forbid_return_tag and (not expected_return) and return_tags:
+            issues.append(
+                build_issue(
+                    file_path,
+                    return_tags[0]["line"],
+                    "unexpected-return-tag",
+                    "void 或建構子方法不應出現 @return。",
                 )
+            )
 
-        unexpected_params = [name for name in actual_param_names if name not in expected_param_names]
-        for name in sorted(set(unexpected_params)):
+        if len(return_tags) > 1:
             issues.append(
                 build_issue(
                     file_path,
-                    method_info.get("line") or block_start_line,
-                    "unexpected-param-tag",
-                    f"@param `{name}` 找不到對應的方法參數。",
+                    return_tags[1]["line"],
+                    "duplicate-return-tag",
+                    "@return 不可重複出現。",
                 )
             )
+        if profiler is not None:
+            profiler.lap("return-tags", issues)
+
+        throws_counts = {}
+        for name in throws_names:
+            throws_counts[name] = throws_counts.get(name, 0) + 1
+        for name in sorted(throws_counts):
+            if throws_counts[name] > 1:
+                issues.append(
+                    build_issue(
+                        file_path,
+                        method_line,
+                        "duplicate-throws-tag",
+                        f"例外 `{name}` 出現重複 @throws/@exception。",
+                    )
+                )
 
-    return_tags = [tag for tag in tags if tag["name"] == "return"]
-    expected_return = (not method_info.get("isConstructor")) and method_info.get("returnType") != "void"
+        if self.require_declared_throws:
+            declared_throws = [normalize_exception_name(value) for value in method_info.get("throwsList", [])]
+            for name in declared_throws:
+                if name and name not in throws_counts:
+                    issues.append(
+                        build_issue(
+                            file_path,
+                            method_line,
+                            "missing-throws-tag",
+                            f"宣告 throws `{name}` 但缺少對應的 @throws。",
+                        )
+                    )
+        if profiler is not None:
+            profiler.lap("throws-tags", issues)
 
-    if doclet_spec.get("requireReturnTagForNonVoid", True) and expected_return and not return_tags:
-        issues.append(
-            build_issue(
-                file_path,
-                method_info.get("line") or block_start_line,
-                "missing-return-tag",
-                "非 void 且非建構子方法需提供 @return。",
-            )
-        )
+        return issues
 
-    if doclet_spec.get("forbidReturnTagForVoidOrConstructor", True) and (not expected_return) and return_tags:
-        issues.append(
-            build_issue(
-                file_path,
-                return_tags[0]["line"],
-                "unexpected-return-tag",
-                "void 或建構子方法不應出現 @return。",
-            )
-        )
 
-    if len(return_tags) > 1:
-        issues.append(
-            build_issue(
-                file_path,
-                return_tags[1]["line"],
-                "duplicate-return-tag",
-                "@return 不可重複出現。",
-            )
-        )
+def validate_doclet_structure(file_path, block, declaration_kind, method_info, doclet_spec):
+    """
+    驗證輸入資料是否符合規範。
+    
+    說明 `doclet_spec` 可傳入已編譯的 DocletRuleEngine；傳入原始設定時會臨時編譯，
+    僅適合單次呼叫，大量驗證時應先建立 engine 重複使用。
+    
+    :param file_path: 檔案路徑。
+    :param block: 此參數會影響函式的執行行為。
+    :param declaration_kind: 此參數會影響函式的執行行為。
+    :param method_info: 此參數會影響函式的執行行為。
+    :param doclet_spec: 此參數會影響函式的執行行為。
+    :returns: 函式回傳結果。
+    """
+    engine = doclet_spec if isinstance(doclet_spec, DocletRuleEngine) else DocletRuleEngine(doclet_spec)
+    return engine.validate(file_path, block, declaration_kind, method_info)
 
-    throws_tags = [tag for tag in tags if tag["name"] in {"throws", "exception"} and tag.get("arg")]
-    declared_throws = [normalize_exception_name(value) for value in method_info.get("throwsList", [])]
-    declared_throws = [name for name in declared_throws if name]
-    actual_throws = [normalize_exception_name(tag["arg"]) for tag in throws_tags]
-    actual_throws = [name for name in actual_throws if name]
 
-    for name in sorted(set(actual_throws)):
-        if actual_throws.count(name) > 1:
+def validate_symbol_references(rel_file, lines, declaration, block, method_info, symbols, context):
+    """
+    以符號索引驗證 Javadoc 中的參照。
+
+    說明 `{@link}`/`@see` 的型別必須能在索引中解析，或可能來自外部相依；
+    方法參照（含 `(`）必須存在於該型別或其索引內的父型別。
+    `@throws` 的例外型別需可解析，且 checked 例外必須是宣告 throws 的型別或其子型別。
+
+    :param rel_file: 相對路徑。
+    :param lines: 原始碼行清單。
+    :param declaration: JavaDeclaration。
+    :param block: `parse_javadoc_block` 的結果。
+    :param method_info: 方法資訊；型別宣告時為 None。
+    :param symbols: JavaSymbolIndex。
+    :param context: `symbols.file_context` 回傳的解析環境。
+    :returns: 問題清單。
+    """
+    issues = []
+    owner_name = declaration.name if declaration.kind == "type" else declaration.enclosing_type
+    owner = context["local"].get(owner_name or "")
+
+    for line, reference in iter_doc_references(lines, declaration.doc_start, declaration.doc_end):
+        type_name, member, is_method = split_reference(reference)
+        if type_name:
+            target = symbols.resolve_type(type_name, context)
+            if target is None:
+                if not symbols.is_external(type_name, context):
+                    issues.append(
+                        build_issue(
+                            rel_file,
+                            line,
+                            "unresolved-link",
+                            f"參照 `{reference}` 找不到對應的型別。",
+                        )
+                    )
+                continue
+        else:
+            target = owner
+        if target is not None and member and is_method and not symbols.has_member(target, member):
             issues.append(
                 build_issue(
-                    file_path,
-                    method_info.get("line") or block_start_line,
-                    "duplicate-throws-tag",
-                    f"例外 `{name}` 出現重複 @throws/@exception。",
+                    rel_file,
+                    line,
+                    "unresolved-link-member",
+                    f"參照 `{reference}` 找不到對應的方法。",
                 )
             )
 
-    if doclet_spec.get("requireDeclaredThrowsTags", True):
-        missing_throws = [name for name in declared_throws if name not in actual_throws]
-        for name in missing_throws:
+    declared = {normalize_exception_name(value) for value in (method_info or {}).get("throwsList", [])}
+    for tag in block.get("tags", []):
+        if tag["name"] not in {"throws", "exception"} or not tag.get("arg"):
+            continue
+        exception = tag["arg"]
+        target = symbols.resolve_type(exception, context)
+        if target is None:
+            if not symbols.is_external(exception, context):
+                issues.append(
+                    build_issue(
+                        rel_file,
+                        tag["line"],
+                        "unresolved-throws-type",
+                        f"@throws `{exception}` 找不到對應的例外型別。",
+                    )
+                )
+            continue
+        if method_info is None:
+            continue
+        if symbols.exception_category(target) == "checked" and not symbols.is_assignable(target, declared):
             issues.append(
                 build_issue(
-                    file_path,
-                    method_info.get("line") or block_start_line,
-                    "missing-throws-tag",
-                    f"宣告 throws `{name}` 但缺少對應的 @throws。",
+                    rel_file,
+                    tag["line"],
+                    "undeclared-throws-tag",
+                    f"@throws `{exception}` 為 checked 例外，但方法未宣告 throws 該型別或其父型別。",
                 )
             )
 
     return issues
 
 
-def scan_quality(file_path, root, include_private, profile, banned_patterns):
+def scan_quality(
+    file_path, root, include_private, profile, banned_patterns, rules=None, index=None, symbols=None, data=None
+):
     """
     執行 scan_quality 的核心流程並回傳結果。
     
@@ -585,151 +775,320 @@ def scan_quality(file_path, root, include_private, profile, banned_patterns):
     :param include_private: 此參數會影響函式的執行行為。
     :param profile: 此參數會影響函式的執行行為。
     :param banned_patterns: 此參數會影響函式的執行行為。
+    :param rules: 已編譯的 DocletRuleEngine；未提供時依 profile 編譯一次。
+    :param index: DeclarationIndex；內容未變的檔案直接沿用索引中的宣告。
+    :param symbols: JavaSymbolIndex；提供時驗證 `{@link}` 目標與 `@throws` 例外型別。
+    :param data: 已讀取的檔案原始位元組；None 時由 `file_path` 讀取。
     :returns: 函式回傳結果。
     """
-    content = Path(file_path).read_text(encoding="utf-8")
-    lines = re.split(r"\r?\n", content)
-    issues = []
-    rel_file = relative_path(file_path, root)
-
     doclet_spec = profile.get("docletSpec") or {}
-    class_name = Path(file_path).stem
-
-    i = 0
-    while i < len(lines):
-        trimmed = lines[i].strip()
+    if rules is None:
+        rules = DocletRuleEngine(doclet_spec)
+    profiler = rules.profiler
+    issues = []
+    if profiler is not None:
+        profiler.begin(issues)
 
-        if is_type_declaration(lines[i]):
-            if not has_javadoc(lines, i):
+    rel_file = relative_path(file_path, root)
+    symbol_context = symbols.file_context(rel_file) if symbols is not None else None
+    content, records, doc_blocks = load_file_declarations(file_path, rel_file, include_private, index, data)
+    lines = re.split(r"\r?\n", content)
+    if profiler is not None:
+        profiler.lap("load-declarations", issues)
+
+    for declaration, method_info in records:
+        if profiler is not None:
+            profiler.begin(issues)
+        if not declaration.has_javadoc:
+            if declaration.kind == "type":
                 issues.append(
                     build_issue(
                         rel_file,
-                        i + 1,
+                        declaration.line_index + 1,
                         "missing-javadoc",
                         "類別/介面/列舉缺少 Javadoc。",
                     )
                 )
-            else:
-                block_loc = locate_javadoc_block_before(lines, i)
-                if block_loc:
-                    block = parse_javadoc_block(lines, block_loc["start"], block_loc["end"])
-                    issues.extend(
-                        validate_doclet_structure(
-                            rel_file,
-                            block,
-                            declaration_kind="type",
-                            method_info=None,
-                            doclet_spec=doclet_spec,
-                        )
+            elif not (doclet_spec.get("allowMissingJavadocForOverrides", False) and declaration.is_override):
+                issues.append(
+                    build_issue(
+                        rel_file,
+                        declaration.line_index + 1,
+                        "missing-javadoc",
+                        "方法缺少 Javadoc。",
                     )
-
-            i += 1
+                )
+            if profiler is not None:
+                profiler.lap("missing-javadoc", issues)
             continue
 
-        if is_method_start_line(lines[i], include_private):
-            collected = collect_method_signature(lines, i)
-            if is_method_declaration(collected["signature"], include_private):
-                insertion_index = find_insertion_index(lines, i)
-                method_info = parse_method_declaration(collected["signature"], class_name)
-                if method_info:
-                    method_info["line"] = i + 1
-
-                if not has_javadoc(lines, insertion_index):
-                    is_override = has_override_annotation(lines, insertion_index, i)
-                    if not (doclet_spec.get("allowMissingJavadocForOverrides", False) and is_override):
+        if declaration.kind == "type":
+            method_info = None
+        block = parse_javadoc_block(lines, declaration.doc_start, declaration.doc_end)
+        if profiler is not None:
+            profiler.lap("parse-javadoc-block", issues)
+        issues.extend(
+            validate_doclet_structure(
+                rel_file,
+                block,
+                declaration_kind=declaration.kind,
+                method_info=method_info,
+                doclet_spec=rules,
+            )
+        )
+        if symbol_context is not None:
+            if profiler is not None:
+                profiler.begin(issues)
+            issues.extend(
+                validate_symbol_references(rel_file, lines, declaration, block, method_info, symbols, symbol_context)
+            )
+            if profiler is not None:
+                profiler.lap("symbol-references", issues)
+
+    if banned_patterns:
+        if profiler is not None:
+            profiler.begin(issues)
+        for doc_start, doc_end in doc_blocks:
+            for index in range(doc_start, min(doc_end, len(lines) - 1) + 1):
+                trimmed = lines[index].strip()
+                for rule in banned_patterns:
+                    if rule["regex"].search(trimmed):
                         issues.append(
                             build_issue(
                                 rel_file,
-                                i + 1,
-                                "missing-javadoc",
-                                "方法缺少 Javadoc。",
-                            )
-                        )
-                else:
-                    block_loc = locate_javadoc_block_before(lines, insertion_index)
-                    if block_loc:
-                        block = parse_javadoc_block(lines, block_loc["start"], block_loc["end"])
-                        issues.extend(
-                            validate_doclet_structure(
-                                rel_file,
-                                block,
-                                declaration_kind="method",
-                                method_info=method_info,
-                                doclet_spec=doclet_spec,
+                                index + 1,
+                                "weak-text",
+                                f"{trimmed} ({rule['reason']})",
+                                extra={"pattern": rule["pattern"]},
                             )
                         )
+                    if profiler is not None:
+                        profiler.lap(f"weak-text:{rule['pattern']}", issues)
 
-            i = collected["end_index"] + 1
-            continue
+    issues.sort(key=lambda issue: issue["line"])
+    return issues
 
-        for rule in banned_patterns:
-            if rule["regex"].search(trimmed):
-                issues.append(
-                    build_issue(
-                        rel_file,
-                        i + 1,
-                        "weak-text",
-                        f"{trimmed} ({rule['reason']})",
-                        extra={"pattern": rule["pattern"]},
-                    )
-                )
 
-        i += 1
+def init_lint_worker(root, include_private, profile, index=None, symbols=None, prefilter=True, profile_rules=False):
+    """
+    初始化 lint worker 的共用狀態。
+
+    說明每個 worker process 只編譯一次 banned patterns、DocletRuleEngine 與前置過濾器，
+    之後處理的所有檔案都重複使用。
+
+    :param root: 掃描根目錄。
+    :param include_private: 是否包含 private 宣告。
+    :param profile: 已載入的 style profile。
+    :param index: DeclarationIndex；None 表示不使用宣告索引。
+    :param symbols: JavaSymbolIndex；None 表示不驗證參照。
+    :param prefilter: 是否先以原始位元組略過不可能有問題的檔案。
+    :param profile_rules: 是否記錄每條規則的呼叫次數、命中數與耗時。
+    """
+    banned_patterns = normalize_banned_patterns(profile)
+    _WORKER_STATE["root"] = root
+    _WORKER_STATE["include_private"] = include_private
+    _WORKER_STATE["profile"] = profile
+    _WORKER_STATE["banned_patterns"] = banned_patterns
+    rules = DocletRuleEngine(profile.get("docletSpec") or {})
+    if profile_rules:
+        rules.profiler = RuleProfiler()
+    _WORKER_STATE["rules"] = rules
+    _WORKER_STATE["index"] = index
+    _WORKER_STATE["symbols"] = symbols
+    _WORKER_STATE["prefilter"] = SourcePrefilter(include_private, banned_patterns) if prefilter else None
+
+
+def lint_worker_file(file_path):
+    """
+    以 worker 共用狀態檢查單一檔案。
+
+    說明啟用前置過濾時，只套用必要字面字串出現在檔案中的 banned patterns；
+    既沒有可能的宣告也沒有可能命中的 banned pattern 時直接略過。
 
-    return issues
+    :param file_path: 檔案路徑。
+    :returns: (問題清單, 新建立的宣告索引項目, 是否被前置過濾略過, 規則成本統計)；
+        未使用索引、命中或略過時項目為 None，未啟用 `--profile-rules` 時統計為 None。
+    """
+    state = _WORKER_STATE
+    index = state["index"]
+    prefilter = state["prefilter"]
+    data = read_source_bytes(file_path)
+    banned_patterns = state["banned_patterns"]
+    if prefilter is not None:
+        banned_patterns = prefilter.banned_patterns_for(data)
+        if not banned_patterns and not prefilter.may_declare(data):
+            return [], None, True, None
+    rules = state["rules"]
+    issues = scan_quality(
+        file_path,
+        state["root"],
+        state["include_private"],
+        state["profile"],
+        banned_patterns,
+        rules,
+        index,
+        state["symbols"],
+        data,
+    )
+    costs = rules.profiler.drain() if rules.profiler is not None else None
+    if index is None:
+        return issues, None, False, costs
+    return issues, index.take_update(relative_path(file_path, state["root"])), False, costs
+
+
+def write_text_report(stream, summary, issues):
+    """
+    輸出文字格式報告。
+
+    說明此函式的主要流程、輸入限制與輸出語意。
+
+    :param stream: 可寫入的文字串流。
+    :param summary: 摘要資料。
+    :param issues: 問題清單。
+    """
+    stream.write("Javadoc quality lint\n")
+    stream.write(f"Root: {summary['root']}\n")
+    stream.write(f"Style: {summary['style']}\n")
+    stream.write(f"Style source: {summary['styleSource']}\n")
+    stream.write(f"Doclet spec: {summary['docletSpec']}\n")
+    stream.write(f"Scanned files: {summary['scannedFiles']}\n")
+    stream.write(f"Prefilter skipped: {summary['prefilterSkipped']}\n")
+    stream.write(f"Issues: {summary['issueCount']}\n")
+
+    if issues:
+        stream.write("\nIssue details:\n")
+        for issue in issues[:200]:
+            stream.write(f"- {issue['file']}:{issue['line']} [{issue['kind']}] {issue['detail']}\n")
+        if len(issues) > 200:
+            stream.write(f"... {len(issues) - 200} more issues\n")
+    if "ruleCosts" in summary:
+        write_cost_table(stream, summary["ruleCosts"])
+
+
+def build_stream_writer(report_format, stream, root, profile, symbol_index=False):
+    """
+    建立串流報告輸出器。
+
+    說明規則中繼資料只在此處由 doclet spec 產生一次。
+
+    :param report_format: `sarif` 或 `ndjson`。
+    :param stream: 可寫入的文字串流。
+    :param root: 掃描根目錄。
+    :param profile: 已載入的 style profile。
+    :param symbol_index: 是否啟用符號索引驗證。
+    :returns: 報告輸出器。
+    """
+    if report_format == "ndjson":
+        return NdjsonReportWriter(stream)
+    engine = DocletRuleEngine(profile.get("docletSpec") or {})
+    rules = engine.rule_metadata(normalize_banned_patterns(profile), symbol_index)
+    return SarifReportWriter(stream, "lint_javadocs", rules, root)
 
 
 def main():
     """
     執行 main 的核心流程並回傳結果。
     
-    說明此函式的主要流程、輸入限制與輸出語意。
+    說明 `sarif` 與 `ndjson` 格式逐檔串流輸出，不保留全部問題；
+    `text` 與 `json` 維持收集完畢後一次輸出。
     
     :returns: 函式回傳結果。
+    :raises ValueError: 當 `--format` 不受支援時拋出。
     :raises SystemExit: 當輸入不合法或處理失敗時拋出。
     """
     args = parse_args(sys.argv[1:])
-    root = resolve_root(args.root)
+    report_format = args.report_format or ("json" if args.json else "text")
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {report_format}. Expected one of: {', '.join(sorted(REPORT_FORMATS))}")
+
+    root = resolve_root(args.root, allow_archives=True)
     profile = load_style_profile(args, Path(__file__).resolve().parent)
-    banned_patterns = normalize_banned_patterns(profile)
-    files = list_java_files(root)
+    files = select_java_files(root, args, include_archives=args.include_archives)
+    incremental = is_incremental(args)
+    index = DeclarationIndex(args.index_cache, args.include_private) if args.index_cache else None
+    symbols = None
+    if args.symbol_index:
+        symbols = JavaSymbolIndex(args.symbol_index)
+        mapper = partial(iter_java_files, jobs=args.jobs)
+        if incremental and symbols.files:
+            symbols.refresh(files, root, mapper, prune=False)
+        else:
+            symbol_files = files
+            if incremental:
+                # 第一次建立符號索引時仍需涵蓋整個專案，否則未變更檔案中的型別都無法解析。
+                symbol_files = list_java_files(root, configured_source_roots(args), include_archives=args.include_archives)
+            symbols.refresh(symbol_files, root, mapper)
+        symbols.save()
+
+    results = iter_java_files(
+        lint_worker_file,
+        files,
+        args.jobs,
+        initializer=init_lint_worker,
+        initargs=(root, args.include_private, profile, index, symbols, args.prefilter, args.profile_rules),
+    )
+    rel_files = [relative_path(file_path, root) for file_path in files]
+    stream = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    streaming = report_format in {"sarif", "ndjson"}
+    writer = build_stream_writer(report_format, stream, root, profile, symbols is not None) if streaming else None
 
     issues = []
-    for file_path in files:
-        issues.extend(scan_quality(file_path, root, args.include_private, profile, banned_patterns))
-
-    summary = {
-        "root": root,
-        "style": profile.get("name") or args.style,
-        "styleSource": profile.get("source"),
-        "docletSpec": (profile.get("docletSpec") or {}).get("source"),
-        "includePrivate": args.include_private,
-        "scannedFiles": len(files),
-        "issueCount": len(issues),
-        "issues": issues,
-    }
-
-    if args.json:
-        sys.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
-    else:
-        sys.stdout.write("Javadoc quality lint\n")
-        sys.stdout.write(f"Root: {summary['root']}\n")
-        sys.stdout.write(f"Style: {summary['style']}\n")
-        sys.stdout.write(f"Style source: {summary['styleSource']}\n")
-        sys.stdout.write(f"Doclet spec: {summary['docletSpec']}\n")
-        sys.stdout.write(f"Scanned files: {summary['scannedFiles']}\n")
-        sys.stdout.write(f"Issues: {summary['issueCount']}\n")
-
-        if issues:
-            sys.stdout.write("\nIssue details:\n")
-            for issue in issues[:200]:
-                sys.stdout.write(
-                    f"- {issue['file']}:{issue['line']} [{issue['kind']}] {issue['detail']}\n"
-                )
-            if len(issues) > 200:
-                sys.stdout.write(f"... {len(issues) - 200} more issues\n")
+    issue_count = 0
+    skipped = 0
+    profiler = RuleProfiler() if args.profile_rules else None
+    try:
+        if writer is not None:
+            writer.begin()
+        for rel_file, (file_issues, entry, prefiltered, costs) in zip(rel_files, results):
+            if profiler is not None:
+                profiler.merge(costs)
+            if prefiltered:
+                skipped += 1
+                continue
+            issue_count += len(file_issues)
+            if writer is not None:
+                writer.write_issues(file_issues)
+            else:
+                issues.extend(file_issues)
+            if index is not None:
+                index.record(rel_file, entry)
+        if writer is not None:
+            writer.close()
+
+        if index is not None:
+            index.save(rel_files, prune=not incremental)
+
+        summary = {
+            "root": root,
+            "style": profile.get("name") or args.style,
+            "styleSource": profile.get("source"),
+            "docletSpec": (profile.get("docletSpec") or {}).get("source"),
+            "includePrivate": args.include_private,
+            "scannedFiles": len(files),
+            "prefilterSkipped": skipped,
+            "issueCount": issue_count,
+            "issues": issues,
+        }
+        if index is not None:
+            summary["index"] = index.summary()
+        if symbols is not None:
+            summary["symbolIndex"] = symbols.summary()
+        if profiler is not None:
+            summary["ruleCosts"] = profiler.rows()
+
+        if streaming:
+            sys.stderr.write(f"[lint_javadocs] scanned {len(files)} files ({skipped} prefiltered), {issue_count} issues\n")
+            if profiler is not None:
+                write_cost_table(sys.stderr, summary["ruleCosts"])
+        elif report_format == "json":
+            stream.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
+        else:
+            write_text_report(stream, summary, issues)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
 
-    if issues:
+    if issue_count:
         raise SystemExit(2)
 
 
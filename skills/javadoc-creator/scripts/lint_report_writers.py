@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""
+lint_report_writers 模組的主要功能。
+
+提供 lint 結果的串流輸出器：NDJSON 每筆問題一行，SARIF 2.1.0 則先寫出
+規則中繼資料，再逐檔附加 results。兩者都在問題產生時立即寫出，
+記憶體用量與問題總數無關。
+"""
+
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+from javadoc_utils import is_archive_path, split_archive_path
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+SRCROOT = "%SRCROOT%"
+
+
+class NdjsonReportWriter:
+    """
+    NdjsonReportWriter 的核心行為實作。
+
+    說明每筆問題以單行 JSON 寫出，欄位與 `--json` 報告中的 issue 相同。
+    """
+
+    def __init__(self, stream):
+        """
+        建立輸出器。
+
+        :param stream: 可寫入的文字串流。
+        """
+        self.stream = stream
+        self.count = 0
+
+    def begin(self):
+        """
+        開始輸出；NDJSON 不需要檔頭。
+        """
+
+    def write_issues(self, issues):
+        """
+        寫出單一檔案的問題。
+
+        :param issues: 問題清單。
+        """
+        for issue in issues:
+            self.stream.write(json.dumps(issue, ensure_ascii=False) + "\n")
+        self.count += len(issues)
+        self.stream.flush()
+
+    def close(self):
+        """
+        結束輸出。
+        """
+        self.stream.flush()
+
+
+class SarifReportWriter:
+    """
+    SarifReportWriter 的核心行為實作。
+
+    說明檔頭（tool driver 與規則清單）在開始時一次寫出，`results` 陣列逐筆附加，
+    結束時補上收尾括號；規則索引在建構時建立，之後每筆結果只做一次字典查詢。
+    """
+
+    def __init__(self, stream, tool_name, rules, root, default_level="warning"):
+        """
+        建立輸出器。
+
+        :param stream: 可寫入的文字串流。
+        :param tool_name: SARIF `tool.driver.name`。
+        :param rules: 規則清單，每筆包含 `id`、`description`，可選 `level`、`properties`。
+        :param root: 掃描根目錄或壓縮檔；壓縮檔時以其所在目錄作為 `%SRCROOT%` 基準。
+        :param default_level: 規則未指定 level 時使用的等級。
+        """
+        self.stream = stream
+        self.tool_name = tool_name
+        self.rules = rules
+        # 與 `relative_path` 相同：根目錄是壓縮檔時，問題路徑相對於其所在目錄。
+        self.root = os.path.dirname(root) if is_archive_path(root) and os.path.isfile(root) else root
+        self.default_level = default_level
+        self.rule_index = {rule["id"]: position for position, rule in enumerate(rules)}
+        self.rule_level = {rule["id"]: rule.get("level", default_level) for rule in rules}
+        self.count = 0
+
+    def begin(self):
+        """
+        寫出 SARIF 檔頭與規則中繼資料。
+        """
+        driver_rules = []
+        for rule in self.rules:
+            descriptor = {
+                "id": rule["id"],
+                "name": rule["id"],
+                "shortDescription": {"text": rule["description"]},
+                "defaultConfiguration": {"level": rule.get("level", self.default_level)},
+            }
+            if rule.get("properties"):
+                descriptor["properties"] = rule["properties"]
+            driver_rules.append(descriptor)
+
+        run = {
+            "tool": {"driver": {"name": self.tool_name, "rules": driver_rules}},
+            "originalUriBaseIds": {SRCROOT: {"uri": Path(self.root).as_uri() + "/"}},
+            "columnKind": "unicodeCodePoints",
+        }
+        header = json.dumps(
+            {"$schema": SARIF_SCHEMA, "version": SARIF_VERSION, "runs": [run]},
+            ensure_ascii=False,
+        )
+        # 在 runs[0] 的結尾補上 results 陣列開頭，之後逐筆附加。
+        self.stream.write(header[: -len("}]}")] + ',"results":[\n')
+        self.stream.flush()
+
+    def artifact_location(self, rel_file):
+        """
+        將問題路徑轉為 SARIF artifactLocation。
+
+        說明一般檔案以百分比編碼的相對 URI 搭配 `%SRCROOT%`；壓縮檔 entry 沒有合法的相對寫法，
+        改以絕對的 `jar:file:///.../lib.jar!/pkg/A.java` 表示。
+
+        :param rel_file: `relative_path` 產生的相對路徑。
+        :returns: SARIF artifactLocation 字典。
+        """
+        archive, entry = split_archive_path(rel_file)
+        if entry is None:
+            return {"uri": quote(rel_file), "uriBaseId": SRCROOT}
+        archive_path = Path(os.path.normpath(os.path.join(self.root, archive)))
+        return {"uri": f"jar:{archive_path.as_uri()}!/{quote(entry)}"}
+
+    def build_result(self, issue):
+        """
+        將單筆問題轉為 SARIF result。
+
+        :param issue: lint 問題。
+        :returns: SARIF result 字典。
+        """
+        kind = issue["kind"]
+        result = {
+            "ruleId": kind,
+            "level": self.rule_level.get(kind, self.default_level),
+            "message": {"text": issue["detail"]},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": self.artifact_location(issue["file"]),
+                        "region": {"startLine": max(1, int(issue["line"]))},
+                    }
+                }
+            ],
+        }
+        if kind in self.rule_index:
+            result["ruleIndex"] = self.rule_index[kind]
+        if issue.get("pattern"):
+            result["properties"] = {"pattern": issue["pattern"]}
+        return result
+
+    def write_issues(self, issues):
+        """
+        寫出單一檔案的問題。
+
+        :param issues: 問題清單。
+        """
+        for issue in issues:
+            prefix = "," if self.count else ""
+            self.stream.write(prefix + json.dumps(self.build_result(issue), ensure_ascii=False) + "\n")
+            self.count += 1
+        self.stream.flush()
+
+    def close(self):
+        """
+        寫出收尾括號。
+        """
+        self.stream.write("]}]}\n")
+        self.stream.flush()
@@ -11,18 +11,17 @@ import re
 import sys
 from pathlib import Path
 
+from java_lexer import scan_java_declarations
+from javadoc_pipeline import run_pipeline
 from javadoc_utils import (
-    collect_method_signature,
+    declaration_method_info,
     detect_eol,
-    is_method_declaration,
-    is_method_start_line,
-    is_type_declaration,
-    list_java_files,
     parse_args,
-    parse_method_declaration,
-    parse_type_declaration,
+    read_source_text,
     relative_path,
     resolve_root,
+    select_java_files,
+    write_source_text,
 )
 from style_profile_utils import (
     choose_method_summary,
@@ -35,25 +34,7 @@ from style_profile_utils import (
 
 SUMMARY_END_PUNCTUATION = ("。", ".", "！", "!", "？", "?")
 
-
-def find_declaration_index(lines, doc_end):
-    """
-    執行 find_declaration_index 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param lines: 此參數會影響函式的執行行為。
-    :param doc_end: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
-    """
-    i = doc_end + 1
-    while i < len(lines):
-        trimmed = lines[i].strip()
-        if not trimmed or trimmed.startswith("@"):
-            i += 1
-            continue
-        return i
-    return -1
+_WORKER_STATE = {}
 
 
 def is_weak_summary(text):
@@ -165,91 +146,93 @@ def refine_doc_block(lines, start, end, declaration_info, profile):
     return changed
 
 
-def process_file(file_path, root, include_private, profile):
+def refine_source(file_path, raw, include_private, profile):
     """
-    執行 process_file 的核心流程並回傳結果。
-    
-    說明此函式的主要流程、輸入限制與輸出語意。
-    
-    :param file_path: 檔案路徑。
-    :param root: 此參數會影響函式的執行行為。
+    精修單一檔案內容中既有的 Javadoc。
+
+    說明只處理記憶體中的文字，不讀寫檔案，可在管線的轉換階段或 worker process 中執行。
+
+    :param file_path: 檔案路徑，用於推得類別名稱。
+    :param raw: 檔案內容。
     :param include_private: 此參數會影響函式的執行行為。
     :param profile: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    :returns: 新內容；內容未變時回傳 None。
     """
-    raw = Path(file_path).read_text(encoding="utf-8")
     eol = detect_eol(raw)
     lines = re.split(r"\r?\n", raw)
     class_name = Path(file_path).stem
 
+    declarations, _ = scan_java_declarations(raw)
     changed = False
 
-    i = 0
-    while i < len(lines):
-        if not lines[i].strip().startswith("/**"):
-            i += 1
+    for declaration in declarations:
+        if not declaration.has_javadoc or not declaration.is_documentable(include_private):
             continue
 
-        doc_start = i
-        doc_end = i
-        while doc_end < len(lines) and "*/" not in lines[doc_end]:
-            doc_end += 1
-        if doc_end >= len(lines):
-            break
+        if declaration.kind == "type":
+            declaration_info = {"kind": "type", "type": declaration.type_info()}
+        else:
+            method_info = declaration_method_info(declaration, class_name)
+            if not method_info:
+                continue
+            declaration_info = {"kind": "method", "method": method_info}
 
-        declaration_index = find_declaration_index(lines, doc_end)
-        if declaration_index < 0:
-            i = doc_end + 1
-            continue
+        if refine_doc_block(lines, declaration.doc_start, declaration.doc_end, declaration_info, profile):
+            changed = True
 
-        declaration_line = lines[declaration_index]
-        if is_type_declaration(declaration_line):
-            type_info = parse_type_declaration(declaration_line)
-            if type_info and refine_doc_block(lines, doc_start, doc_end, {"kind": "type", "type": type_info}, profile):
-                changed = True
-            i = doc_end + 1
-            continue
+    return eol.join(lines) if changed else None
 
-        if not is_method_start_line(declaration_line, include_private):
-            i = doc_end + 1
-            continue
 
-        collected = collect_method_signature(lines, declaration_index)
-        if not is_method_declaration(collected["signature"], include_private):
-            i = doc_end + 1
-            continue
+def init_refine_worker(include_private, profile):
+    """
+    初始化轉換階段的共用狀態。
 
-        method_info = parse_method_declaration(collected["signature"], class_name)
-        if method_info and refine_doc_block(lines, doc_start, doc_end, {"kind": "method", "method": method_info}, profile):
-            changed = True
+    :param include_private: 是否包含 private 宣告。
+    :param profile: 已載入的 style profile。
+    """
+    _WORKER_STATE["include_private"] = include_private
+    _WORKER_STATE["profile"] = profile
 
-        i = doc_end + 1
 
-    if changed:
-        Path(file_path).write_text(eol.join(lines), encoding="utf-8")
+def refine_worker(file_path, raw):
+    """
+    管線轉換階段：以共用狀態處理單一檔案內容。
 
-    return changed
+    :param file_path: 檔案路徑。
+    :param raw: 檔案內容。
+    :returns: (新內容, 是否變更)。
+    """
+    content = refine_source(file_path, raw, _WORKER_STATE["include_private"], _WORKER_STATE["profile"])
+    return content, content is not None
 
 
 def main():
     """
     執行 main 的核心流程並回傳結果。
     
-    說明此函式的主要流程、輸入限制與輸出語意。
+    說明讀取、轉換與寫回以管線方式重疊執行，summary 仍依檔案順序輸出。
     
     :returns: 函式回傳結果。
     """
     args = parse_args(sys.argv[1:])
     root = resolve_root(args.root)
     profile = load_style_profile(args, Path(__file__).resolve().parent)
-    files = list_java_files(root)
-
-    changed_files = 0
-    refined = []
-    for file_path in files:
-        if process_file(file_path, root, args.include_private, profile):
-            changed_files += 1
-            refined.append(relative_path(file_path, root))
+    files = select_java_files(root, args)
+
+    results = run_pipeline(
+        files,
+        read_source_text,
+        refine_worker,
+        write_source_text,
+        readers=args.readers,
+        jobs=args.jobs,
+        writers=args.writers,
+        queue_depth=args.queue_depth,
+        initializer=init_refine_worker,
+        initargs=(args.include_private, profile),
+    )
+    refined = [relative_path(file_path, root) for file_path, changed in zip(files, results) if changed]
+    changed_files = len(refined)
 
     summary = {
         "root": root,
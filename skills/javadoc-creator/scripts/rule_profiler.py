@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""
+rule_profiler 模組的主要功能。
+
+記錄每條 lint 規則（或規則階段）的呼叫次數、命中問題數與累計耗時。
+呼叫端只在啟用時建立 RuleProfiler，停用時各檢查點只多一次 `is not None` 判斷。
+"""
+
+from time import perf_counter
+
+
+class RuleProfiler:
+    """
+    RuleProfiler 的核心行為實作。
+
+    說明以「檢查點」方式計時：`begin` 記下起點與目前問題數，之後每個 `lap`
+    將距離上一個檢查點的耗時與新增問題數記到指定規則，再把起點移到現在。
+    計數器本身的記帳時間不會算進下一條規則。
+    """
+
+    def __init__(self):
+        """
+        建立空的統計。
+        """
+        self.stats = {}
+        self.mark = 0.0
+        self.seen = 0
+
+    def begin(self, issues):
+        """
+        設定新的檢查點起點。
+
+        :param issues: 目前累積問題的清單，用於計算之後各規則的命中數。
+        """
+        self.seen = len(issues)
+        self.mark = perf_counter()
+
+    def lap(self, rule, issues):
+        """
+        將上一個檢查點到現在的耗時與新增問題記到 `rule`。
+
+        :param rule: 規則名稱。
+        :param issues: 與 `begin` 相同的問題清單。
+        """
+        elapsed = perf_counter() - self.mark
+        entry = self.stats.get(rule)
+        if entry is None:
+            entry = self.stats[rule] = [0, 0, 0.0]
+        count = len(issues)
+        entry[0] += 1
+        entry[1] += count - self.seen
+        entry[2] += elapsed
+        self.seen = count
+        self.mark = perf_counter()
+
+    def drain(self):
+        """
+        取出並清空目前統計。
+
+        說明供 worker process 將單檔統計送回主程序合併。
+
+        :returns: `{rule: [invocations, matches, seconds]}`。
+        """
+        stats = self.stats
+        self.stats = {}
+        return stats
+
+    def merge(self, stats):
+        """
+        合併其他 RuleProfiler 的統計。
+
+        :param stats: `drain` 的結果；None 時忽略。
+        """
+        for rule, (invocations, matches, seconds) in (stats or {}).items():
+            entry = self.stats.get(rule)
+            if entry is None:
+                entry = self.stats[rule] = [0, 0, 0.0]
+            entry[0] += invocations
+            entry[1] += matches
+            entry[2] += seconds
+
+    def rows(self):
+        """
+        產生依累計耗時由高到低排序的成本表。
+
+        :returns: 每筆包含 `rule`、`invocations`、`matches`、`seconds`、`avgMicros` 與 `share` 的清單。
+        """
+        total = sum(entry[2] for entry in self.stats.values()) or 1.0
+        rows = []
+        for rule, (invocations, matches, seconds) in self.stats.items():
+            rows.append(
+                {
+                    "rule": rule,
+                    "invocations": invocations,
+                    "matches": matches,
+                    "seconds": round(seconds, 6),
+                    "avgMicros": round(seconds * 1e6 / invocations, 3) if invocations else 0.0,
+                    "share": round(seconds * 100.0 / total, 2),
+                }
+            )
+        rows.sort(key=lambda row: (-row["seconds"], row["rule"]))
+        return rows
+
+
+def write_cost_table(stream, rows):
+    """
+    輸出文字格式的規則成本表。
+
+    :param stream: 可寫入的文字串流。
+    :param rows: `RuleProfiler.rows` 的結果。
+    """
+    stream.write("\nRule cost (sorted by total time):\n")
+    width = max([len("rule")] + [len(row["rule"]) for row in rows])
+    stream.write(f"{'rule':<{width}}  {'calls':>10}  {'matches':>8}  {'total ms':>10}  {'avg us':>9}  {'share':>7}\n")
+    for row in rows:
+        stream.write(
+            f"{row['rule']:<{width}}  {row['invocations']:>10}  {row['matches']:>8}  "
+            f"{row['seconds'] * 1000:>10.3f}  {row['avgMicros']:>9.3f}  {row['share']:>6.2f}%\n"
+        )
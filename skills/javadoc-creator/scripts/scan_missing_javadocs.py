@@ -7,25 +7,29 @@ scan_missing_javadocs 模組的主要功能。
 """
 
 import json
-import re
 import sys
-from pathlib import Path
 
+from coverage_history import CoverageAggregator, CoverageHistory
+from declaration_index import DeclarationIndex, load_file_declarations
 from javadoc_utils import (
-    collect_method_signature,
-    find_insertion_index,
-    has_javadoc,
-    is_method_declaration,
-    is_method_start_line,
-    is_type_declaration,
-    list_java_files,
+    configured_source_roots,
+    is_incremental,
+    map_java_files,
     parse_args,
+    read_source_bytes,
     relative_path,
+    resolve_commit,
     resolve_root,
+    select_java_files,
+    source_location,
 )
+from source_prefilter import SourcePrefilter
 
 
-def scan_file(file_path, root, include_private):
+_WORKER_STATE = {}
+
+
+def scan_file(file_path, root, include_private, index=None, data=None):
     """
     執行 scan_file 的核心流程並回傳結果。
     
@@ -34,80 +38,114 @@ def scan_file(file_path, root, include_private):
     :param file_path: 檔案路徑。
     :param root: 此參數會影響函式的執行行為。
     :param include_private: 此參數會影響函式的執行行為。
-    :returns: 函式回傳結果。
+    :param index: DeclarationIndex；內容未變的檔案直接沿用索引中的宣告。
+    :param data: 已讀取的檔案原始位元組；None 時由 `file_path` 讀取。
+    :returns: (缺漏清單, 需要 Javadoc 的宣告數量)。
     """
-    content = Path(file_path).read_text(encoding="utf-8")
-    lines = re.split(r"\r?\n", content)
+    rel_file = relative_path(file_path, root)
+    _, records, _ = load_file_declarations(file_path, rel_file, include_private, index, data)
     missing = []
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        if is_type_declaration(line):
-            if not has_javadoc(lines, i):
-                missing.append(
-                    {
-                        "file": relative_path(file_path, root),
-                        "line": i + 1,
-                        "kind": "type",
-                        "signature": line.strip(),
-                    }
-                )
-            i += 1
+    for declaration, _ in records:
+        if declaration.has_javadoc:
             continue
+        missing.append(
+            {
+                "file": rel_file,
+                "line": declaration.line_index + 1,
+                "kind": "type" if declaration.kind == "type" else "method",
+                "signature": declaration.signature,
+            }
+        )
 
-        if not is_method_start_line(line, include_private):
-            i += 1
-            continue
+    return missing, len(records)
 
-        collected = collect_method_signature(lines, i)
-        if not is_method_declaration(collected["signature"], include_private):
-            i = collected["end_index"] + 1
-            continue
 
-        insertion_index = find_insertion_index(lines, i)
-        if not has_javadoc(lines, insertion_index):
-            missing.append(
-                {
-                    "file": relative_path(file_path, root),
-                    "line": i + 1,
-                    "kind": "method",
-                    "signature": collected["signature"].strip(),
-                }
-            )
+def init_scan_worker(root, include_private, index=None, prefilter=True):
+    """
+    初始化 scan worker 的共用狀態。
+
+    :param root: 掃描根目錄。
+    :param include_private: 是否包含 private 宣告。
+    :param index: DeclarationIndex；None 表示不使用宣告索引。
+    :param prefilter: 是否先以原始位元組略過不可能有缺漏的檔案。
+    """
+    _WORKER_STATE["root"] = root
+    _WORKER_STATE["include_private"] = include_private
+    _WORKER_STATE["index"] = index
+    _WORKER_STATE["prefilter"] = SourcePrefilter(include_private) if prefilter else None
+
 
-        i = collected["end_index"] + 1
+def scan_worker_file(file_path):
+    """
+    以 worker 共用狀態掃描單一檔案。
 
-    return missing
+    :param file_path: 檔案路徑。
+    :returns: (缺漏清單, 新建立的宣告索引項目, 是否被前置過濾略過, 需要 Javadoc 的宣告數量)；
+        未使用索引、命中或略過時項目為 None。
+    """
+    state = _WORKER_STATE
+    index = state["index"]
+    data = read_source_bytes(file_path)
+    if state["prefilter"] is not None and not state["prefilter"].may_declare(data):
+        return [], None, True, 0
+    missing, documentable = scan_file(file_path, state["root"], state["include_private"], index, data)
+    if index is None:
+        return missing, None, False, documentable
+    return missing, index.take_update(relative_path(file_path, state["root"])), False, documentable
 
 
 def main():
     """
     執行 main 的核心流程並回傳結果。
     
-    說明此函式的主要流程、輸入限制與輸出語意。
+    說明逐檔結果在同一個迴圈中彙總為 package 與模組覆蓋率；指定 `--history` 時
+    將本次快照以 commit 為鍵寫入 SQLite 歷史資料庫。
     
     :returns: 函式回傳結果。
+    :raises ValueError: 當 `--history` 與增量模式同時使用時拋出。
     """
     args = parse_args(sys.argv[1:])
-    root = resolve_root(args.root)
-    files = list_java_files(root)
+    if args.history and is_incremental(args):
+        raise ValueError("--history records full-project coverage and cannot be combined with incremental options")
+    root = resolve_root(args.root, allow_archives=True)
+    files = select_java_files(root, args, include_archives=args.include_archives)
+    source_roots = configured_source_roots(args)
 
     by_file = []
     all_missing = []
-
-    for file_path in files:
-        missing = scan_file(file_path, root, args.include_private)
+    coverage = CoverageAggregator()
+
+    index = DeclarationIndex(args.index_cache, args.include_private) if args.index_cache else None
+    results = map_java_files(
+        scan_worker_file,
+        files,
+        args.jobs,
+        initializer=init_scan_worker,
+        initargs=(root, args.include_private, index, args.prefilter),
+    )
+    rel_files = [relative_path(file_path, root) for file_path in files]
+    skipped = 0
+    for rel_file, (missing, entry, prefiltered, documentable) in zip(rel_files, results):
+        if prefiltered:
+            skipped += 1
+            continue
+        if index is not None:
+            index.record(rel_file, entry)
+        module, package = source_location(rel_file, source_roots)
+        coverage.add(module, package, documentable, documentable - len(missing))
         if missing:
             by_file.append(
                 {
-                    "file": relative_path(file_path, root),
+                    "file": rel_file,
                     "missing": len(missing),
                 }
             )
             all_missing.extend(missing)
 
+    if index is not None:
+        index.save(rel_files, prune=not is_incremental(args))
+
     by_file.sort(key=lambda item: (-item["missing"], item["file"]))
 
     result = {
@@ -116,11 +154,25 @@ def main():
         "styleFile": args.style_file,
         "includePrivate": args.include_private,
         "scannedFiles": len(files),
+        "prefilterSkipped": skipped,
         "filesWithMissing": len(by_file),
         "totalMissing": len(all_missing),
         "topFiles": by_file[: args.top],
+        "coverage": coverage.summary(),
+        "modules": coverage.module_rows(),
+        "packages": coverage.package_rows(),
         "missing": all_missing,
     }
+    if index is not None:
+        result["index"] = index.summary()
+    if args.history:
+        commit, commit_time = resolve_commit(root, args.commit)
+        history = CoverageHistory(args.history)
+        try:
+            history.record(commit, commit_time, root, args.include_private, coverage)
+        finally:
+            history.close()
+        result["history"] = {"file": args.history, "commit": commit}
 
     if args.json:
         sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
@@ -133,8 +185,20 @@ def main():
         style_context += f" + {result['styleFile']}"
     sys.stdout.write(f"Style context: {style_context}\n")
     sys.stdout.write(f"Scanned files: {result['scannedFiles']}\n")
+    sys.stdout.write(f"Prefilter skipped: {result['prefilterSkipped']}\n")
     sys.stdout.write(f"Files with missing Javadoc: {result['filesWithMissing']}\n")
     sys.stdout.write(f"Total missing declarations: {result['totalMissing']}\n")
+    summary = result["coverage"]
+    sys.stdout.write(f"Coverage: {summary['coverage']}% ({summary['documented']}/{summary['documentable']})\n")
+    if args.history:
+        sys.stdout.write(f"History: {args.history} @ {result['history']['commit']}\n")
+
+    if len(result["modules"]) > 1:
+        sys.stdout.write("\nLowest module coverage:\n")
+        for entry in sorted(result["modules"], key=lambda item: (item["coverage"], item["module"]))[: args.top]:
+            sys.stdout.write(
+                f"- {entry['module']}: {entry['coverage']}% ({entry['documented']}/{entry['documentable']})\n"
+            )
 
     if result["topFiles"]:
         sys.stdout.write("\nTop files with missing Javadoc:\n")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+"""
+source_prefilter 模組的主要功能。
+
+在解碼與 lexer 之前，以原始位元組的子字串搜尋判斷檔案是否可能產生任何結果。
+判斷只會偏向保守：凡是可能產生宣告、Javadoc 區塊或 banned pattern 命中的檔案都會完整掃描，
+因此略過的檔案一定沒有任何問題。
+
+型別宣告不論可見度都需要文件，一般原始碼幾乎每個檔案都含有型別，無法略過；
+實際能略過的主要是 package-info.java、module-info.java 與只有註解的檔案。
+對其餘檔案的效益在於只套用必要字面字串出現在檔案中的 banned patterns。
+"""
+
+import re
+
+
+TYPE_MARKERS = (b"class", b"interface", b"enum", b"record")
+VISIBILITY_MARKERS = (b"public", b"protected")
+PRIVATE_MARKER = b"private"
+DOC_MARKER = b"/**"
+
+QUANTIFIER_PATTERN = re.compile(r"\{(\d*)(?:,(\d*))?\}")
+
+
+def skip_group(pattern, index):
+    """
+    略過 regex 中的一組括號。
+
+    :param pattern: regex 原始字串。
+    :param index: `(` 的位置。
+    :returns: 對應 `)` 之後的位置。
+    """
+    depth = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            index = skip_class(pattern, index)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return index
+
+
+def skip_class(pattern, index):
+    """
+    略過 regex 中的字元類別 `[...]`。
+
+    :param pattern: regex 原始字串。
+    :param index: `[` 的位置。
+    :returns: 對應 `]` 之後的位置。
+    """
+    index += 1
+    if index < len(pattern) and pattern[index] == "^":
+        index += 1
+    if index < len(pattern) and pattern[index] == "]":
+        index += 1
+    while index < len(pattern) and pattern[index] != "]":
+        index += 2 if pattern[index] == "\\" else 1
+    return index + 1
+
+
+def required_literal(regex):
+    """
+    取出 regex 每次命中都必定包含的最長字面字串。
+
+    說明只分析頂層的連續字面字元；群組、字元類別、跳脫類別與可省略的量詞都會中斷字面段。
+    頂層含有 `|`，或使用 IGNORECASE/VERBOSE 時無法保證，回傳空字串。
+
+    :param regex: 已編譯的 regex。
+    :returns: 必要字面字串；無法判斷時為空字串。
+    """
+    if regex.flags & (re.IGNORECASE | re.VERBOSE):
+        return ""
+
+    pattern = regex.pattern
+    best = ""
+    current = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        atom = None
+        if char == "\\":
+            following = pattern[index + 1 : index + 2]
+            if following and not following.isalnum():
+                atom = following
+            index += 2
+        elif char == "[":
+            index = skip_class(pattern, index)
+        elif char == "(":
+            index = skip_group(pattern, index)
+        elif char == "|":
+            return ""
+        elif char in ".^$":
+            index += 1
+        else:
+            atom = char if char not in "\r\n" else None
+            index += 1
+
+        quantifier = pattern[index : index + 1]
+        bounds = QUANTIFIER_PATTERN.match(pattern, index) if quantifier == "{" else None
+        required = True
+        if quantifier in {"*", "?"}:
+            required = False
+            index += 1
+        elif bounds is not None:
+            required = int(bounds.group(1) or 0) >= 1
+            index = bounds.end()
+        elif quantifier == "+":
+            index += 1
+        else:
+            quantifier = ""
+
+        if quantifier and pattern[index : index + 1] in {"?", "+"}:
+            index += 1
+
+        if atom is not None and required:
+            current.append(atom)
+        if atom is None or quantifier:
+            if len(current) > len(best):
+                best = "".join(current)
+            current = []
+
+    if len(current) > len(best):
+        best = "".join(current)
+    return best
+
+
+class SourcePrefilter:
+    """
+    SourcePrefilter 的核心行為實作。
+
+    說明建構時決定宣告標記與各 banned pattern 的必要字面字串，之後每個檔案只做數次
+    `bytes` 子字串搜尋。型別宣告不論可見度都需要文件，因此任一型別關鍵字即代表需要掃描；
+    不在型別內的方法只有帶著可見度修飾詞時才需要文件。
+    """
+
+    def __init__(self, include_private=False, banned_patterns=None):
+        """
+        建立前置過濾器。
+
+        :param include_private: 是否包含 private 宣告。
+        :param banned_patterns: `normalize_banned_patterns` 的結果。
+        """
+        markers = TYPE_MARKERS + VISIBILITY_MARKERS
+        if include_private:
+            markers += (PRIVATE_MARKER,)
+        self.markers = markers
+        # 以完整單字比對：註解中的 `classes`、`publication` 等字不代表有宣告。
+        self.marker_pattern = re.compile(rb"\b(?:" + b"|".join(markers) + rb")\b")
+        self.banned_literals = [
+            (rule, required_literal(rule["regex"]).encode("utf-8")) for rule in (banned_patterns or [])
+        ]
+
+    def may_declare(self, data):
+        """
+        判斷檔案是否可能含有需要文件的宣告。
+
+        :param data: 檔案原始位元組。
+        :returns: 條件判斷結果。
+        """
+        return self.marker_pattern.search(data) is not None
+
+    def banned_patterns_for(self, data):
+        """
+        篩選此檔案可能命中的 banned patterns。
+
+        說明沒有 `/**` 的檔案沒有 Javadoc 區塊；必要字面字串不在檔案中的規則不可能命中。
+
+        :param data: 檔案原始位元組。
+        :returns: 需要套用的 banned pattern 清單。
+        """
+        if not self.banned_literals or DOC_MARKER not in data:
+            return []
+        return [rule for rule, literal in self.banned_literals if literal in data]
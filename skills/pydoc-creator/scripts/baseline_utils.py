@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+"""
+lint baseline 的指紋計算與檔案讀寫工具。
+
+baseline 檔記錄既有問題的穩定指紋，讓 lint 只針對新增問題失敗。
+指紋由檔案路徑、目標 qualified name、問題種類與 detail 雜湊組成，
+刻意不包含行號，因此程式碼搬移後仍可對應到同一筆問題。
+同一目標的相同問題會得到相同指紋，baseline 以出現次數記錄，
+重複的違規多出一筆時仍會被視為新增。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+
+
+BASELINE_MAGIC = b"PYDOCBL1"
+FINGERPRINT_BYTES = 8
+
+
+def detail_hash(detail: str) -> str:
+    """
+    計算問題說明文字的短雜湊。
+
+    說明 detail 內容可能很長，先壓縮為固定長度字串再參與指紋計算。
+
+    Args:
+        detail: 問題的說明文字。
+
+    Returns:
+        十六進位的短雜湊字串。
+    """
+    return hashlib.blake2b(detail.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def issue_fingerprint(issue: dict) -> int:
+    """
+    計算單筆問題的穩定指紋。
+
+    說明指紋只依賴檔案、目標名稱、種類與 detail 雜湊，不含行號。
+
+    Args:
+        issue: lint 產生的問題資料，需含 `file`、`kind`、`detail`，可選 `target`。
+
+    Returns:
+        64 位元無號整數指紋。
+    """
+    key = "\0".join(
+        (
+            issue.get("file", ""),
+            issue.get("target") or "",
+            issue.get("kind", ""),
+            detail_hash(issue.get("detail", "")),
+        )
+    )
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=FINGERPRINT_BYTES).digest()
+    return int.from_bytes(digest, "little")
+
+
+def load_baseline(file_path: str) -> Counter[int]:
+    """
+    載入 baseline 檔中的指紋與出現次數。
+
+    說明檔案格式為 magic header 加上排序後的 little-endian uint64 陣列，
+    同一指紋出現幾次就重複幾筆；可直接以 `array.frombytes` 讀入，百萬筆規模仍可快速載入。
+    檔案不存在時視為空 baseline。
+
+    Args:
+        file_path: baseline 檔路徑。
+
+    Returns:
+        指紋到出現次數的對照。
+
+    Raises:
+        ValueError: 當檔案格式不正確時拋出例外。
+    """
+    path = Path(file_path)
+    if not path.exists():
+        return Counter()
+
+    data = path.read_bytes()
+    if not data.startswith(BASELINE_MAGIC):
+        raise ValueError(f"Invalid baseline file: {file_path}")
+
+    payload = data[len(BASELINE_MAGIC) :]
+    if len(payload) % FINGERPRINT_BYTES:
+        raise ValueError(f"Corrupted baseline file: {file_path}")
+
+    values = array("Q")
+    values.frombytes(payload)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return Counter(values)
+
+
+def save_baseline(file_path: str, fingerprints: Counter[int]) -> int:
+    """
+    將指紋與出現次數寫入 baseline 檔。
+
+    說明指紋會依次數展開並排序後寫出，讓相同問題集合產生位元組完全一致的檔案，
+    方便納入版本控制並降低 diff 噪音。
+
+    Args:
+        file_path: baseline 檔路徑。
+        fingerprints: 要記錄的指紋與出現次數。
+
+    Returns:
+        寫入的問題筆數。
+    """
+    values = array("Q", sorted(fingerprints.elements()))
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(BASELINE_MAGIC + values.tobytes())
+    return len(values)
+
+
+def split_by_baseline(issues: list[dict], baseline: Counter[int]) -> tuple[list[dict], int, Counter[int]]:
+    """
+    依 baseline 將問題分為新增與既有兩類。
+
+    說明每筆問題只做一次指紋計算與查詢；同一指紋最多抑制 baseline 記錄的次數，
+    超出的部分列為新增問題。另回傳本次實際出現的指紋次數，
+    供呼叫端計算已修正（stale）的 baseline 項目與更新 baseline。
+
+    Args:
+        issues: lint 產生的全部問題。
+        baseline: 已載入的 baseline 指紋次數。
+
+    Returns:
+        新增問題清單、被 baseline 抑制的問題數量，以及本次出現的指紋次數。
+    """
+    new_issues = []
+    suppressed = 0
+    seen: Counter[int] = Counter()
+    for issue in issues:
+        fingerprint = issue_fingerprint(issue)
+        seen[fingerprint] += 1
+        if seen[fingerprint] <= baseline.get(fingerprint, 0):
+            suppressed += 1
+            continue
+        new_issues.append(issue)
+    return new_issues, suppressed, seen
+
+
+def count_stale(baseline: Counter[int], seen: Counter[int]) -> int:
+    """
+    計算本次已不再出現的 baseline 問題筆數。
+
+    Args:
+        baseline: 已載入的 baseline 指紋次數。
+        seen: 本次出現的指紋次數。
+
+    Returns:
+        baseline 中超出本次出現次數的筆數總和。
+    """
+    return sum((baseline - seen).values())
@@ -13,6 +13,7 @@ import sys
 from pathlib import Path
 
 from pydoc_utils import (
+    StagedWriter,
     apply_insertions,
     collect_doc_targets,
     detect_eol,
@@ -22,7 +23,12 @@ from pydoc_utils import (
     relative_path,
     render_docstring_block,
     resolve_root,
+    output_mode,
+    run_file_tasks,
     split_lines,
+    summarize_skipped,
+    write_skipped_report,
+    write_unified_diff,
 )
 from style_profile_utils import build_docstring_body, load_style_profile
 
@@ -74,15 +80,18 @@ def process_file(file_path: str, root: str, include_private: bool, profile: dict
         insertions.append((target.insert_line, doc_lines))
         inserted += 1
 
-    changed = inserted > 0
-    if changed:
+    content = None
+    if inserted > 0:
         apply_insertions(lines, insertions)
-        Path(file_path).write_text(eol.join(lines), encoding="utf-8")
+        content = eol.join(lines)
+    changed = content is not None and content != raw
 
     return {
         "file": relative_path(file_path, root),
         "inserted": inserted,
         "changed": changed,
+        "original": raw if changed else None,
+        "content": content if changed else None,
     }
 
 
@@ -101,33 +110,66 @@ def main() -> None:
     inserted_total = 0
     per_file = []
 
-    for file_path in files:
-        result = process_file(file_path, root, args.include_private, profile)
-        if result["changed"]:
+    outcomes = run_file_tasks(
+        process_file,
+        files,
+        (root, args.include_private, profile),
+        jobs=args.jobs,
+        timeout=args.file_timeout,
+        memory_mb=args.file_memory_mb,
+    )
+    skipped = summarize_skipped(outcomes, root)
+
+    mode = output_mode(args)
+    writer = StagedWriter()
+    try:
+        for outcome in outcomes:
+            if outcome.status != "ok":
+                continue
+            result = outcome.result
+            original = result.pop("original")
+            content = result.pop("content")
+            if not result["changed"]:
+                continue
+            if mode == "diff":
+                write_unified_diff(result["file"], original, content)
+            elif mode == "write":
+                writer.stage(outcome.file_path, content)
             changed_files += 1
             inserted_total += result["inserted"]
             per_file.append(result)
+        written = writer.commit()
+    finally:
+        writer.discard()
 
     summary = {
         "root": root,
+        "mode": mode,
         "style": profile.get("name") or args.style,
         "styleSource": profile.get("source"),
         "includePrivate": args.include_private,
         "changedFiles": changed_files,
         "insertedTotal": inserted_total,
         "files": per_file,
+        "writtenFiles": written,
+        "skippedFiles": skipped,
     }
 
+    out = sys.stderr if mode == "diff" else sys.stdout
     if args.json:
-        sys.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
-        return
-
-    sys.stdout.write("Python docstring generation completed\n")
-    sys.stdout.write(f"Root: {summary['root']}\n")
-    sys.stdout.write(f"Style: {summary['style']}\n")
-    sys.stdout.write(f"Style source: {summary['styleSource']}\n")
-    sys.stdout.write(f"Changed files: {summary['changedFiles']}\n")
-    sys.stdout.write(f"Inserted docstrings: {summary['insertedTotal']}\n")
+        out.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
+    else:
+        out.write("Python docstring generation completed\n")
+        out.write(f"Root: {summary['root']}\n")
+        out.write(f"Mode: {summary['mode']}\n")
+        out.write(f"Style: {summary['style']}\n")
+        out.write(f"Style source: {summary['styleSource']}\n")
+        out.write(f"Changed files: {summary['changedFiles']}\n")
+        out.write(f"Inserted docstrings: {summary['insertedTotal']}\n")
+        write_skipped_report(skipped, out)
+
+    if args.check and changed_files:
+        raise SystemExit(2)
 
 
 if __name__ == "__main__":
@@ -12,16 +12,23 @@ import json
 import re
 import sys
 from pathlib import Path
+from typing import Optional
 
+from baseline_utils import count_stale, load_baseline, save_baseline, split_by_baseline
 from pydoc_utils import (
     collect_doc_targets,
+    failed_files,
     list_python_files,
     parse_args,
     parse_python_source,
     relative_path,
     resolve_root,
+    run_file_tasks,
     split_lines,
+    summarize_skipped,
+    write_skipped_report,
 )
+from rule_profiler import RuleProfiler, write_cost_table
 from style_profile_utils import (
     choose_return_description,
     load_style_profile,
@@ -283,7 +290,9 @@ def has_rest_raises(docstring: str, exc_name: str) -> bool:
     return re.search(rf"(?m)^\s*:raises\s+{re.escape(exc_name)}\s*:", docstring) is not None
 
 
-def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
+def collect_structure_issues(
+    target, rel: str, profile: dict, profiler: Optional[RuleProfiler] = None
+) -> list[dict]:
     """
     執行 collect_structure_issues 的核心流程並回傳結果。
     
@@ -293,11 +302,14 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
         target: 這個參數會影響函式的執行行為。
         rel: 這個參數會影響函式的執行行為。
         profile: 這個參數會影響函式的執行行為。
+        profiler: 規則成本統計；None 表示不計時。
     
     Returns:
         符合條件的結果集合。
     """
     issues = []
+    if profiler is not None:
+        profiler.begin(issues)
     docstring = target.docstring or ""
     base_line = target.doc_start_line or target.lineno
 
@@ -305,21 +317,27 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
         issues.append(
             {
                 "file": rel,
+                "target": target.qualified_name,
                 "line": base_line,
                 "kind": "missing-detail",
                 "detail": "docstring 缺少摘要後的詳細描述段落。",
             }
         )
+    if profiler is not None:
+        profiler.lap("detail-description", issues)
 
     if not has_blank_line_after_summary(docstring):
         issues.append(
             {
                 "file": rel,
+                "target": target.qualified_name,
                 "line": base_line,
                 "kind": "missing-blank-line-after-summary",
                 "detail": "摘要行後方應保留一個空行，再開始詳細描述或區段。",
             }
         )
+    if profiler is not None:
+        profiler.lap("blank-line-after-summary", issues)
 
     if target.kind not in {"function", "method"}:
         return issues
@@ -335,11 +353,14 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
         has_yields = has_google_heading(docstring, "Yields:")
         has_raises = has_google_heading(docstring, "Raises:")
         has_examples = has_google_heading(docstring, "Examples:")
+        if profiler is not None:
+            profiler.lap("google-sections", issues)
 
         if target.params and not has_args:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": base_line,
                     "kind": "missing-args",
                     "detail": "Google style 需提供 Args 區段。",
@@ -351,6 +372,7 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": base_line,
                         "kind": "empty-args",
                         "detail": "Google style 的 Args 區段不可為空。",
@@ -364,17 +386,21 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": base_line,
                         "kind": "missing-arg-item",
                         "detail": f"Args 區段缺少參數 `{param}` 的說明。",
                     }
                 )
+        if profiler is not None:
+            profiler.lap("google-args", issues)
 
         if target.is_generator and profile.get("enforceYieldsSectionForGenerators", True):
             if not has_yields:
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": base_line,
                         "kind": "missing-yields",
                         "detail": "Generator 函式應提供 Yields 區段。",
@@ -384,6 +410,7 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": base_line,
                         "kind": "unexpected-returns-for-generator",
                         "detail": "Generator 函式應使用 Yields 區段，不應使用 Returns。",
@@ -398,6 +425,7 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": base_line,
                         "kind": "missing-returns",
                         "detail": "Google style 需提供 Returns 區段。",
@@ -408,6 +436,7 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": base_line,
                     "kind": "empty-returns",
                     "detail": "Google style 的 Returns 區段不可為空。",
@@ -418,16 +447,20 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": base_line,
                     "kind": "empty-yields",
                     "detail": "Google style 的 Yields 區段不可為空。",
                 }
             )
+        if profiler is not None:
+            profiler.lap("google-returns-yields", issues)
 
         if target.raises and not has_raises:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": base_line,
                     "kind": "missing-raises",
                     "detail": "Google style 需提供 Raises 區段。",
@@ -438,16 +471,20 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": base_line,
                     "kind": "empty-raises",
                     "detail": "Google style 的 Raises 區段不可為空。",
                 }
             )
+        if profiler is not None:
+            profiler.lap("google-raises", issues)
 
         if profile.get("requireGoogleExamples") and not has_examples:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": base_line,
                     "kind": "missing-examples",
                     "detail": "Google style 需提供 Examples 區段。",
@@ -459,11 +496,14 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": base_line,
                         "kind": "empty-examples",
                         "detail": "Google style 的 Examples 區段不可為空。",
                     }
                 )
+        if profiler is not None:
+            profiler.lap("google-examples", issues)
 
         return issues
 
@@ -474,21 +514,27 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
         issues.append(
             {
                 "file": rel,
+                "target": target.qualified_name,
                 "line": base_line,
                 "kind": "missing-param-field",
                 "detail": f"PEP 257/reST 風格缺少 :param {normalized}: 欄位。",
             }
         )
+    if profiler is not None:
+        profiler.lap("rest-param-fields", issues)
 
     if return_text and not has_rest_returns(docstring):
         issues.append(
             {
                 "file": rel,
+                "target": target.qualified_name,
                 "line": base_line,
                 "kind": "missing-returns-field",
                 "detail": "PEP 257/reST 風格缺少 :returns: 欄位。",
             }
         )
+    if profiler is not None:
+        profiler.lap("rest-returns-field", issues)
 
     for exc in target.raises:
         if has_rest_raises(docstring, exc):
@@ -496,16 +542,26 @@ def collect_structure_issues(target, rel: str, profile: dict) -> list[dict]:
         issues.append(
             {
                 "file": rel,
+                "target": target.qualified_name,
                 "line": base_line,
                 "kind": "missing-raises-field",
                 "detail": f"PEP 257/reST 風格缺少 :raises {exc}: 欄位。",
             }
         )
+    if profiler is not None:
+        profiler.lap("rest-raises-fields", issues)
 
     return issues
 
 
-def scan_quality(file_path: str, root: str, include_private: bool, profile: dict, banned_patterns: list[dict]) -> list[dict]:
+def scan_quality(
+    file_path: str,
+    root: str,
+    include_private: bool,
+    profile: dict,
+    banned_patterns: list[dict],
+    profiler: Optional[RuleProfiler] = None,
+) -> list[dict]:
     """
     執行 scan_quality 的核心流程並回傳結果。
     
@@ -517,50 +573,61 @@ def scan_quality(file_path: str, root: str, include_private: bool, profile: dict
         include_private: 這個參數會影響函式的執行行為。
         profile: 這個參數會影響函式的執行行為。
         banned_patterns: 這個參數會影響函式的執行行為。
+        profiler: 規則成本統計；None 表示不計時。
     
     Returns:
         符合條件的結果集合。
     """
+    issues = []
+    if profiler is not None:
+        profiler.begin(issues)
     raw, tree = parse_python_source(file_path)
     lines = split_lines(raw)
     targets = collect_doc_targets(raw, tree, file_path, include_private)
+    if profiler is not None:
+        profiler.lap("parse-source", issues)
 
-    issues = []
     rel = relative_path(file_path, root)
 
     for target in targets:
+        if profiler is not None:
+            profiler.begin(issues)
         if not target.has_docstring:
-            if (
+            allowed = (
                 target.kind == "method"
                 and target.is_override
                 and profile.get("allowMissingDocstringForOverrides", False)
-            ):
-                continue
-            if (
+            ) or (
                 target.kind == "module"
                 and profile.get("allowMissingModuleDocstringForTests", False)
                 and is_test_module_path(rel)
-            ):
-                continue
-            issues.append(
-                {
-                    "file": rel,
-                    "line": target.lineno,
-                    "kind": "missing-docstring",
-                    "detail": f"{target.kind} 缺少 docstring。",
-                }
             )
+            if not allowed:
+                issues.append(
+                    {
+                        "file": rel,
+                        "target": target.qualified_name,
+                        "line": target.lineno,
+                        "kind": "missing-docstring",
+                        "detail": f"{target.kind} 缺少 docstring。",
+                    }
+                )
+            if profiler is not None:
+                profiler.lap("missing-docstring", issues)
             continue
 
         if not target.docstring:
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": target.lineno,
                     "kind": "empty-docstring",
                     "detail": "docstring 內容為空。",
                 }
             )
+            if profiler is not None:
+                profiler.lap("empty-docstring", issues)
             continue
 
         summary = first_summary_line(target.docstring)
@@ -568,6 +635,7 @@ def scan_quality(file_path: str, root: str, include_private: bool, profile: dict
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": target.doc_start_line or target.lineno,
                     "kind": "missing-summary",
                     "detail": "docstring 缺少摘要首句。",
@@ -577,11 +645,14 @@ def scan_quality(file_path: str, root: str, include_private: bool, profile: dict
             issues.append(
                 {
                     "file": rel,
+                    "target": target.qualified_name,
                     "line": target.doc_start_line or target.lineno,
                     "kind": "summary-punctuation",
                     "detail": "摘要首句建議以句號收尾。",
                 }
             )
+        if profiler is not None:
+            profiler.lap("summary-sentence", issues)
 
         if profile.get("enforceSummaryLineMaxLength"):
             try:
@@ -592,13 +663,18 @@ def scan_quality(file_path: str, root: str, include_private: bool, profile: dict
                 issues.append(
                     {
                         "file": rel,
+                        "target": target.qualified_name,
                         "line": target.doc_start_line or target.lineno,
                         "kind": "summary-line-too-long",
                         "detail": f"摘要首句長度不應超過 {limit} 個字元。",
                     }
                 )
+            if profiler is not None:
+                profiler.lap("summary-line-length", issues)
 
-        issues.extend(collect_structure_issues(target, rel, profile))
+        issues.extend(collect_structure_issues(target, rel, profile, profiler))
+        if profiler is not None:
+            profiler.begin(issues)
 
         if target.doc_start_line is None or target.doc_end_line is None:
             continue
@@ -612,16 +688,43 @@ def scan_quality(file_path: str, root: str, include_private: bool, profile: dict
                     issues.append(
                         {
                             "file": rel,
+                            "target": target.qualified_name,
                             "line": line_no,
                             "kind": "weak-text",
                             "detail": f"{text} ({rule['reason']})",
                             "pattern": rule["pattern"],
                         }
                     )
+                if profiler is not None:
+                    profiler.lap(f"weak-text:{rule['pattern']}", issues)
 
     return issues
 
 
+def profiled_scan_quality(
+    file_path: str, root: str, include_private: bool, profile: dict, banned_patterns: list[dict]
+) -> tuple[list[dict], dict[str, list]]:
+    """
+    執行 scan_quality 並同時回傳該檔的規則成本統計。
+
+    說明供 `--profile-rules` 透過 run_file_tasks 使用；統計以單檔為單位送回主程序合併，
+    平行或隔離模式下也能取得完整的成本表。
+
+    Args:
+        file_path: 檔案路徑。
+        root: 掃描根目錄。
+        include_private: 是否包含 private 目標。
+        profile: 已載入的 style profile。
+        banned_patterns: 已編譯的 banned patterns。
+
+    Returns:
+        (問題清單, `{rule: [invocations, matches, seconds]}`)。
+    """
+    profiler = RuleProfiler()
+    issues = scan_quality(file_path, root, include_private, profile, banned_patterns, profiler)
+    return issues, profiler.drain()
+
+
 def main() -> None:
     """
     執行 main 的核心流程並回傳結果。
@@ -632,14 +735,57 @@ def main() -> None:
         SystemExit: 當輸入不合法或處理失敗時拋出例外。
     """
     args = parse_args(sys.argv[1:])
+    if args.update_baseline and not args.baseline:
+        raise ValueError("--update-baseline requires --baseline <file>")
     root = resolve_root(args.root)
     profile = load_style_profile(args, Path(__file__).resolve().parent)
     banned_patterns = normalize_banned_patterns(profile)
     files = list_python_files(root)
 
+    outcomes = run_file_tasks(
+        profiled_scan_quality if args.profile_rules else scan_quality,
+        files,
+        (root, args.include_private, profile, banned_patterns),
+        jobs=args.jobs,
+        timeout=args.file_timeout,
+        memory_mb=args.file_memory_mb,
+    )
+    skipped = summarize_skipped(outcomes, root)
+    if args.update_baseline and skipped:
+        # 指紋無法還原出所屬檔案，略過檔案在既有 baseline 中的項目無法沿用，改寫後下次會全部變成新增問題。
+        raise ValueError(
+            f"--update-baseline refused: {len(skipped)} file(s) were not scanned "
+            f"(first: {skipped[0]['file']} [{skipped[0]['status']}]); fix them or rerun before updating the baseline"
+        )
+
     issues = []
-    for file_path in files:
-        issues.extend(scan_quality(file_path, root, args.include_private, profile, banned_patterns))
+    profiler = RuleProfiler() if args.profile_rules else None
+    for outcome in outcomes:
+        if outcome.status != "ok":
+            continue
+        if profiler is not None:
+            file_issues, costs = outcome.result
+            issues.extend(file_issues)
+            profiler.merge(costs)
+        else:
+            issues.extend(outcome.result)
+
+    baseline_info = None
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        new_issues, suppressed, seen = split_by_baseline(issues, baseline)
+        baseline_info = {
+            "file": args.baseline,
+            "entries": sum(baseline.values()),
+            "suppressed": suppressed,
+            "stale": count_stale(baseline, seen),
+        }
+        if args.update_baseline:
+            baseline_info["entries"] = save_baseline(args.baseline, seen)
+            baseline_info["stale"] = 0
+            baseline_info["updated"] = True
+            new_issues = []
+        issues = new_issues
 
     summary = {
         "root": root,
@@ -649,7 +795,12 @@ def main() -> None:
         "scannedFiles": len(files),
         "issueCount": len(issues),
         "issues": issues,
+        "skippedFiles": skipped,
     }
+    if baseline_info is not None:
+        summary["baseline"] = baseline_info
+    if profiler is not None:
+        summary["ruleCosts"] = profiler.rows()
 
     if args.json:
         sys.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
@@ -659,6 +810,13 @@ def main() -> None:
         sys.stdout.write(f"Style: {summary['style']}\n")
         sys.stdout.write(f"Style source: {summary['styleSource']}\n")
         sys.stdout.write(f"Scanned files: {summary['scannedFiles']}\n")
+        if baseline_info is not None:
+            sys.stdout.write(f"Baseline: {baseline_info['file']} ({baseline_info['entries']} entries)\n")
+            if baseline_info.get("updated"):
+                sys.stdout.write("Baseline updated with current issues.\n")
+            else:
+                sys.stdout.write(f"Baselined issues: {baseline_info['suppressed']}\n")
+                sys.stdout.write(f"Stale baseline entries: {baseline_info['stale']}\n")
         sys.stdout.write(f"Issues: {summary['issueCount']}\n")
 
         if issues:
@@ -668,7 +826,15 @@ def main() -> None:
             if len(issues) > 200:
                 sys.stdout.write(f"... {len(issues) - 200} more issues\n")
 
-    if issues:
+        write_skipped_report(skipped)
+        if profiler is not None:
+            write_cost_table(sys.stdout, summary["ruleCosts"])
+
+    unscanned = failed_files(skipped)
+    if unscanned:
+        # 無法解析的檔案從未被檢查，不能視為通過。
+        sys.stderr.write(f"[lint_docstrings] {len(unscanned)} file(s) could not be scanned\n")
+    if issues or unscanned:
         raise SystemExit(2)
 
 
@@ -9,11 +9,24 @@ pydoc_utils 模組的主要功能。
 from __future__ import annotations
 
 import ast
+import difflib
+import multiprocessing
 import os
 import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
 from dataclasses import dataclass, field
+from multiprocessing import connection
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows 沒有 resource 模組
+    resource = None
 
 
 SPECIAL_PUBLIC_METHODS = {
@@ -53,6 +66,34 @@ class ScriptArgs:
     top: int = 20
     style: str = "pep257"
     style_file: Optional[str] = None
+    baseline: Optional[str] = None
+    update_baseline: bool = False
+    jobs: int = 1
+    file_timeout: Optional[float] = None
+    file_memory_mb: Optional[int] = None
+    rollup: bool = False
+    rollup_from: Optional[str] = None
+    csv: bool = False
+    depth: Optional[int] = None
+    min_missing: int = 0
+    check: bool = False
+    diff: bool = False
+    profile_rules: bool = False
+
+
+@dataclass
+class FileOutcome:
+    """
+    單一檔案處理結果與狀態。
+
+    說明 `status` 為 `ok` 時 `result` 為處理函式的回傳值；
+    其餘狀態（`parse-error`、`skipped-timeout`、`skipped-memory`、`error`）
+    代表檔案被略過，`error` 記錄原因。
+    """
+    file_path: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
 
 
 @dataclass
@@ -126,6 +167,83 @@ def parse_args(argv: list[str]) -> ScriptArgs:
             args.style_file = argv[i + 1]
             i += 2
             continue
+        if token == "--baseline" and i + 1 < len(argv):
+            args.baseline = argv[i + 1]
+            i += 2
+            continue
+        if token == "--update-baseline":
+            args.update_baseline = True
+            i += 1
+            continue
+        if token == "--check":
+            args.check = True
+            i += 1
+            continue
+        if token == "--diff":
+            args.diff = True
+            i += 1
+            continue
+        if token == "--profile-rules":
+            args.profile_rules = True
+            i += 1
+            continue
+        if token == "--rollup":
+            args.rollup = True
+            i += 1
+            continue
+        if token == "--rollup-from" and i + 1 < len(argv):
+            args.rollup_from = argv[i + 1]
+            i += 2
+            continue
+        if token == "--csv":
+            args.csv = True
+            i += 1
+            continue
+        if token == "--depth" and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value >= 0:
+                    args.depth = value
+            except ValueError:
+                pass
+            i += 2
+            continue
+        if token == "--min-missing" and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value >= 0:
+                    args.min_missing = value
+            except ValueError:
+                pass
+            i += 2
+            continue
+        if token == "--jobs" and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value > 0:
+                    args.jobs = value
+            except ValueError:
+                pass
+            i += 2
+            continue
+        if token == "--file-timeout" and i + 1 < len(argv):
+            try:
+                value = float(argv[i + 1])
+                if value > 0:
+                    args.file_timeout = value
+            except ValueError:
+                pass
+            i += 2
+            continue
+        if token == "--file-memory-mb" and i + 1 < len(argv):
+            try:
+                value = int(argv[i + 1])
+                if value > 0:
+                    args.file_memory_mb = value
+            except ValueError:
+                pass
+            i += 2
+            continue
         i += 1
     return args
 
@@ -236,7 +354,12 @@ def parse_python_source(file_path: str) -> tuple[str, ast.Module]:
     Returns:
         符合條件的結果集合。
     """
-    raw = Path(file_path).read_text(encoding="utf-8")
+    # 保留原始換行，讓 detect_eol 能看到 CRLF 並在寫回時沿用；只有舊式 Mac 的單獨 `\r`
+    # 仍比照 universal newlines 轉為 `\n`，split_lines 與 ast 的行號才會一致。
+    with open(file_path, encoding="utf-8", newline="") as fp:
+        raw = fp.read()
+    if "\r" in raw.replace("\r\n", ""):
+        raw = raw.replace("\r\n", "\n").replace("\r", "\n")
     tree = ast.parse(raw, filename=file_path)
     return raw, tree
 
@@ -926,3 +1049,373 @@ def apply_replacements(lines: list[str], replacements: list[tuple[int, int, list
         start_index = max(0, start_line - 1)
         end_index = max(start_index, end_line)
         lines[start_index:end_index] = new_lines
+
+
+PARSE_ERRORS = (SyntaxError, ValueError, UnicodeDecodeError, RecursionError)
+
+FAILED_STATUSES = ("parse-error", "error")
+
+
+def run_file_task(
+    func: Callable[..., Any],
+    file_path: str,
+    func_args: tuple,
+    capture_unexpected: bool = True,
+) -> FileOutcome:
+    """
+    執行單一檔案的處理函式並將例外轉為結果狀態。
+
+    說明解析失敗與記憶體不足會記錄為略過狀態，不會中斷整體流程。
+    其他未預期的例外只在 worker 行程中轉為 `error` 狀態送回主行程；
+    `capture_unexpected` 為 False 時直接往外拋出。
+
+    Args:
+        func: 逐檔處理函式，第一個參數為檔案路徑。
+        file_path: 要處理的檔案路徑。
+        func_args: 傳給處理函式的其餘位置參數。
+        capture_unexpected: 是否將未預期的例外轉為 `error` 狀態。
+
+    Returns:
+        檔案處理結果。
+    """
+    try:
+        return FileOutcome(file_path=file_path, status="ok", result=func(file_path, *func_args))
+    except MemoryError:
+        return FileOutcome(file_path=file_path, status="skipped-memory", error="MemoryError")
+    except PARSE_ERRORS as error:
+        return FileOutcome(file_path=file_path, status="parse-error", error=f"{type(error).__name__}: {error}")
+    except Exception as error:  # noqa: BLE001
+        if not capture_unexpected:
+            raise
+        return FileOutcome(file_path=file_path, status="error", error=f"{type(error).__name__}: {error}")
+
+
+def apply_memory_limit(memory_mb: Optional[int]) -> None:
+    """
+    設定目前行程的位址空間上限。
+
+    說明僅在提供 `resource` 模組的平台生效，超出上限時 Python 會拋出 MemoryError。
+
+    Args:
+        memory_mb: 記憶體上限（MB），為 None 時不設定。
+    """
+    if not memory_mb or resource is None:
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_loop(conn, func: Callable[..., Any], func_args: tuple, memory_mb: Optional[int]) -> None:
+    """
+    在 worker 行程中逐一接收檔案並回傳處理結果。
+
+    說明收到 None 或連線關閉時結束迴圈。
+
+    Args:
+        conn: 與主行程溝通的 Pipe 端點。
+        func: 逐檔處理函式。
+        func_args: 傳給處理函式的其餘位置參數。
+        memory_mb: 每個 worker 的記憶體上限（MB）。
+    """
+    apply_memory_limit(memory_mb)
+    while True:
+        try:
+            file_path = conn.recv()
+        except (EOFError, OSError):
+            break
+        if file_path is None:
+            break
+        conn.send(run_file_task(func, file_path, func_args))
+
+
+def _stop_worker(conn, process, graceful: bool) -> None:
+    """
+    停止 worker 行程並關閉連線。
+
+    說明 graceful 為 True 時先送出結束訊號，否則直接終止行程。
+
+    Args:
+        conn: 與 worker 溝通的 Pipe 端點。
+        process: worker 行程。
+        graceful: 是否先嘗試正常結束。
+    """
+    if graceful:
+        try:
+            conn.send(None)
+        except (BrokenPipeError, EOFError, OSError):
+            pass
+        process.join(1)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    conn.close()
+
+
+def run_file_tasks(
+    func: Callable[..., Any],
+    files: list[str],
+    func_args: tuple,
+    jobs: int = 1,
+    timeout: Optional[float] = None,
+    memory_mb: Optional[int] = None,
+) -> list[FileOutcome]:
+    """
+    以可隔離崩潰的方式逐檔執行處理函式。
+
+    說明未指定平行度與資源上限時直接在目前行程執行，未預期的例外會直接拋出；否則每個檔案交由
+    worker 行程處理，逾時的 worker 會被終止並重啟，該檔記錄為
+    `skipped-timeout`，worker 異常結束時記錄為 `parse-error`。
+    回傳結果固定依輸入檔案順序排列。
+
+    Args:
+        func: 逐檔處理函式，第一個參數為檔案路徑，需可被 pickle。
+        files: 要處理的檔案清單。
+        func_args: 傳給處理函式的其餘位置參數，需可被 pickle。
+        jobs: worker 行程數量。
+        timeout: 單檔處理時間上限（秒）。
+        memory_mb: 每個 worker 的記憶體上限（MB）。
+
+    Returns:
+        依輸入順序排列的檔案處理結果。
+    """
+    if jobs <= 1 and timeout is None and memory_mb is None:
+        return [run_file_task(func, file_path, func_args, capture_unexpected=False) for file_path in files]
+
+    context = multiprocessing.get_context()
+    outcomes: list[Optional[FileOutcome]] = [None] * len(files)
+    pending = deque(enumerate(files))
+    idle: list[tuple[Any, Any]] = []
+    busy: dict[Any, tuple[Any, int, Optional[float]]] = {}
+
+    def spawn() -> None:
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_loop,
+            args=(child_conn, func, func_args, memory_mb),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        idle.append((parent_conn, process))
+
+    for _ in range(min(max(jobs, 1), len(files))):
+        spawn()
+
+    try:
+        while pending or busy:
+            while idle and pending:
+                conn, process = idle.pop()
+                index, file_path = pending.popleft()
+                conn.send(file_path)
+                deadline = time.monotonic() + timeout if timeout is not None else None
+                busy[conn] = (process, index, deadline)
+
+            wait_for = None
+            if timeout is not None and busy:
+                nearest = min(deadline for _, _, deadline in busy.values() if deadline is not None)
+                wait_for = max(0.0, nearest - time.monotonic())
+
+            for conn in connection.wait(list(busy), wait_for):
+                process, index, _ = busy.pop(conn)
+                try:
+                    outcomes[index] = conn.recv()
+                    idle.append((conn, process))
+                except (EOFError, OSError):
+                    _stop_worker(conn, process, graceful=False)
+                    outcomes[index] = FileOutcome(
+                        file_path=files[index],
+                        status="parse-error",
+                        error=f"worker exited with code {process.exitcode}",
+                    )
+                    if pending:
+                        spawn()
+
+            now = time.monotonic()
+            for conn, (process, index, deadline) in list(busy.items()):
+                if deadline is None or now < deadline:
+                    continue
+                del busy[conn]
+                _stop_worker(conn, process, graceful=False)
+                outcomes[index] = FileOutcome(
+                    file_path=files[index],
+                    status="skipped-timeout",
+                    error=f"exceeded {timeout:g}s",
+                )
+                if pending:
+                    spawn()
+    finally:
+        for conn, process in idle:
+            _stop_worker(conn, process, graceful=True)
+        for conn, (process, _, _) in busy.items():
+            _stop_worker(conn, process, graceful=False)
+
+    return [outcome for outcome in outcomes if outcome is not None]
+
+
+def failed_files(skipped: list[dict]) -> list[dict]:
+    """
+    取出因解析失敗或錯誤而未完成處理的檔案。
+
+    說明逾時與記憶體上限屬於使用者設定的預算，不在此列。
+
+    Args:
+        skipped: `summarize_skipped` 回傳的略過檔案清單。
+
+    Returns:
+        狀態為 `parse-error` 或 `error` 的項目。
+    """
+    return [item for item in skipped if item["status"] in FAILED_STATUSES]
+
+
+def summarize_skipped(outcomes: list[FileOutcome], root: str) -> list[dict]:
+    """
+    整理被略過的檔案清單。
+
+    說明只收錄狀態不為 `ok` 的結果，供 summary 輸出使用。
+
+    Args:
+        outcomes: 逐檔處理結果。
+        root: 掃描根目錄，用於計算相對路徑。
+
+    Returns:
+        含 `file`、`status`、`error` 的略過檔案清單。
+    """
+    return [
+        {"file": relative_path(outcome.file_path, root), "status": outcome.status, "error": outcome.error}
+        for outcome in outcomes
+        if outcome.status != "ok"
+    ]
+
+
+def write_skipped_report(skipped: list[dict], stream=None) -> None:
+    """
+    以文字格式輸出被略過的檔案。
+
+    說明沒有略過檔案時不輸出任何內容。
+
+    Args:
+        skipped: `summarize_skipped` 產生的略過檔案清單。
+        stream: 輸出目標，預設為 stdout。
+    """
+    if not skipped:
+        return
+    out = stream or sys.stdout
+    out.write(f"\nSkipped files: {len(skipped)}\n")
+    for entry in skipped:
+        out.write(f"- {entry['file']} [{entry['status']}] {entry['error']}\n")
+
+
+class StagedWriter:
+    """
+    以暫存檔分批寫入並在最後一次提交的檔案寫入器。
+
+    說明每個輸出先寫入同目錄的暫存檔，`commit` 時才以 `os.replace` 原子替換；
+    未提交前中斷（例外、Ctrl-C）時 `discard` 會移除暫存檔，原始檔案保持不變。
+    """
+
+    def __init__(self) -> None:
+        """
+        建立空的暫存清單。
+
+        說明暫存清單保存 (目標路徑, 暫存路徑) 配對，依加入順序提交。
+        """
+        self.staged: list[tuple[str, str]] = []
+
+    def stage(self, file_path: str, content: str) -> None:
+        """
+        將輸出內容寫入目標檔同目錄的暫存檔。
+
+        說明以 UTF-8 寫入且不轉換換行字元，並沿用原檔權限位元。
+
+        Args:
+            file_path: 最終要替換的目標檔案路徑。
+            content: 新的檔案內容。
+        """
+        target = Path(file_path)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as fp:
+                fp.write(content)
+            if target.exists():
+                shutil.copymode(str(target), temp_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        self.staged.append((file_path, temp_path))
+
+    def commit(self) -> int:
+        """
+        以原子 rename 一次提交所有暫存檔。
+
+        說明提交後清空暫存清單。
+
+        Returns:
+            提交的檔案數量。
+        """
+        committed = 0
+        try:
+            for file_path, temp_path in self.staged:
+                os.replace(temp_path, file_path)
+                committed += 1
+        finally:
+            self.staged = self.staged[committed:]
+        return committed
+
+    def discard(self) -> None:
+        """
+        移除所有尚未提交的暫存檔。
+
+        說明可在 finally 區塊中安全呼叫；已提交時不做任何事。
+        """
+        for _, temp_path in self.staged:
+            Path(temp_path).unlink(missing_ok=True)
+        self.staged = []
+
+
+def write_unified_diff(rel: str, original: str, content: str, stream=None) -> None:
+    """
+    輸出單一檔案的 unified diff。
+
+    說明標頭使用 `a/` 與 `b/` 前綴，與 `git diff` 的慣例一致。
+
+    Args:
+        rel: 檔案相對路徑。
+        original: 原始內容。
+        content: 新內容。
+        stream: 輸出目標，預設為 stdout。
+    """
+    out = stream or sys.stdout
+    diff = difflib.unified_diff(
+        split_lines(original),
+        split_lines(content),
+        fromfile=f"a/{rel}",
+        tofile=f"b/{rel}",
+        lineterm="",
+    )
+    for line in diff:
+        out.write(line + "\n")
+
+
+def output_mode(args: ScriptArgs) -> str:
+    """
+    回傳改寫腳本的輸出模式。
+
+    說明 `--diff` 優先於 `--check`；兩者皆不寫入任何檔案。
+
+    Args:
+        args: 命令列參數。
+
+    Returns:
+        `diff`、`check` 或 `write`。
+    """
+    if args.diff:
+        return "diff"
+    if args.check:
+        return "check"
+    return "write"
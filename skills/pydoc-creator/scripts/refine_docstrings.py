@@ -14,6 +14,7 @@ import sys
 from pathlib import Path
 
 from pydoc_utils import (
+    StagedWriter,
     apply_replacements,
     collect_doc_targets,
     detect_eol,
@@ -23,7 +24,12 @@ from pydoc_utils import (
     relative_path,
     render_docstring_block,
     resolve_root,
+    output_mode,
+    run_file_tasks,
     split_lines,
+    summarize_skipped,
+    write_skipped_report,
+    write_unified_diff,
 )
 from style_profile_utils import (
     build_docstring_body,
@@ -464,15 +470,18 @@ def process_file(file_path: str, root: str, include_private: bool, profile: dict
         doc_lines = render_docstring_block(body_lines, target.indent)
         replacements.append((target.doc_start_line, target.doc_end_line, doc_lines))
 
-    changed = len(replacements) > 0
-    if changed:
+    content = None
+    if replacements:
         apply_replacements(lines, replacements)
-        Path(file_path).write_text(eol.join(lines), encoding="utf-8")
+        content = eol.join(lines)
+    changed = content is not None and content != raw
 
     return {
         "file": relative_path(file_path, root),
         "changed": changed,
         "refined": len(replacements),
+        "original": raw if changed else None,
+        "content": content if changed else None,
     }
 
 
@@ -491,33 +500,66 @@ def main() -> None:
     refined_total = 0
     refined_files = []
 
-    for file_path in files:
-        result = process_file(file_path, root, args.include_private, profile)
-        if result["changed"]:
+    outcomes = run_file_tasks(
+        process_file,
+        files,
+        (root, args.include_private, profile),
+        jobs=args.jobs,
+        timeout=args.file_timeout,
+        memory_mb=args.file_memory_mb,
+    )
+    skipped = summarize_skipped(outcomes, root)
+
+    mode = output_mode(args)
+    writer = StagedWriter()
+    try:
+        for outcome in outcomes:
+            if outcome.status != "ok":
+                continue
+            result = outcome.result
+            original = result.pop("original")
+            content = result.pop("content")
+            if not result["changed"]:
+                continue
+            if mode == "diff":
+                write_unified_diff(result["file"], original, content)
+            elif mode == "write":
+                writer.stage(outcome.file_path, content)
             changed_files += 1
             refined_total += result["refined"]
             refined_files.append(result["file"])
+        written = writer.commit()
+    finally:
+        writer.discard()
 
     summary = {
         "root": root,
+        "mode": mode,
         "style": profile.get("name") or args.style,
         "styleSource": profile.get("source"),
         "includePrivate": args.include_private,
         "changedFiles": changed_files,
         "refinedTotal": refined_total,
         "files": refined_files,
+        "writtenFiles": written,
+        "skippedFiles": skipped,
     }
 
+    out = sys.stderr if mode == "diff" else sys.stdout
     if args.json:
-        sys.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
-        return
-
-    sys.stdout.write("Python docstring refinement completed\n")
-    sys.stdout.write(f"Root: {summary['root']}\n")
-    sys.stdout.write(f"Style: {summary['style']}\n")
-    sys.stdout.write(f"Style source: {summary['styleSource']}\n")
-    sys.stdout.write(f"Refined files: {summary['changedFiles']}\n")
-    sys.stdout.write(f"Refined blocks: {summary['refinedTotal']}\n")
+        out.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
+    else:
+        out.write("Python docstring refinement completed\n")
+        out.write(f"Root: {summary['root']}\n")
+        out.write(f"Mode: {summary['mode']}\n")
+        out.write(f"Style: {summary['style']}\n")
+        out.write(f"Style source: {summary['styleSource']}\n")
+        out.write(f"Refined files: {summary['changedFiles']}\n")
+        out.write(f"Refined blocks: {summary['refinedTotal']}\n")
+        write_skipped_report(skipped, out)
+
+    if args.check and changed_files:
+        raise SystemExit(2)
 
 
 if __name__ == "__main__":
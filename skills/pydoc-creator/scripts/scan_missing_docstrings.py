@@ -8,9 +8,12 @@ scan_missing_docstrings 模組的主要功能。
 
 from __future__ import annotations
 
+import csv
 import json
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
 
 from pydoc_utils import (
     collect_doc_targets,
@@ -19,10 +22,16 @@ from pydoc_utils import (
     parse_python_source,
     relative_path,
     resolve_root,
+    run_file_tasks,
+    summarize_skipped,
+    write_skipped_report,
 )
 from style_profile_utils import load_style_profile
 
 
+COVERAGE_KINDS = ("module", "class", "method", "function")
+
+
 def target_signature(target) -> str:
     """
     執行 target_signature 的核心流程並回傳結果。
@@ -45,36 +54,36 @@ def target_signature(target) -> str:
     return f"{prefix} {target.qualified_name}({params})"
 
 
-def scan_file(file_path: str, root: str, include_private: bool, profile: dict) -> list[dict]:
+def scan_file_coverage(file_path: str, root: str, include_private: bool, profile: dict) -> dict:
     """
-    執行 scan_file 的核心流程並回傳結果。
-    
-    說明函式處理流程、輸入限制與輸出語意。
-    
+    掃描單一檔案的缺漏宣告並統計各種類的應補數量。
+
+    說明依 profile 豁免的宣告（例如 override 方法、測試模組）不列入總數，
+    讓覆蓋率只反映實際需要 docstring 的宣告。
+
     Args:
-        file_path: 這個參數會影響函式的執行行為。
-        root: 這個參數會影響函式的執行行為。
-        include_private: 這個參數會影響函式的執行行為。
-        profile: 這個參數會影響函式的執行行為。
-    
+        file_path: 要掃描的 Python 檔案路徑。
+        root: 掃描根目錄，用於計算相對路徑。
+        include_private: 是否納入私有宣告。
+        profile: 已載入的風格 profile。
+
     Returns:
-        符合條件的結果集合。
+        含 `missing`（缺漏宣告清單）與 `totals`（各種類應補宣告數）的結果。
     """
     raw, tree = parse_python_source(file_path)
     targets = collect_doc_targets(raw, tree, file_path, include_private)
 
     missing: list[dict] = []
+    totals: dict[str, int] = {}
     rel = relative_path(file_path, root)
     module_stem = Path(file_path).stem
 
     for target in targets:
-        if target.has_docstring:
-            continue
-
         if (
             target.kind == "method"
             and target.is_override
             and profile.get("allowMissingDocstringForOverrides", False)
+            and not target.has_docstring
         ):
             continue
 
@@ -82,9 +91,14 @@ def scan_file(file_path: str, root: str, include_private: bool, profile: dict) -
             target.kind == "module"
             and profile.get("allowMissingModuleDocstringForTests", False)
             and (module_stem.startswith("test_") or module_stem.endswith("_test"))
+            and not target.has_docstring
         ):
             continue
 
+        totals[target.kind] = totals.get(target.kind, 0) + 1
+        if target.has_docstring:
+            continue
+
         missing.append(
             {
                 "file": rel,
@@ -94,7 +108,268 @@ def scan_file(file_path: str, root: str, include_private: bool, profile: dict) -
             }
         )
 
-    return missing
+    return {"missing": missing, "totals": totals}
+
+
+def scan_file(file_path: str, root: str, include_private: bool, profile: dict) -> list[dict]:
+    """
+    執行 scan_file 的核心流程並回傳結果。
+    
+    說明函式處理流程、輸入限制與輸出語意。
+    
+    Args:
+        file_path: 這個參數會影響函式的執行行為。
+        root: 這個參數會影響函式的執行行為。
+        include_private: 這個參數會影響函式的執行行為。
+        profile: 這個參數會影響函式的執行行為。
+    
+    Returns:
+        符合條件的結果集合。
+    """
+    return scan_file_coverage(file_path, root, include_private, profile)["missing"]
+
+
+@dataclass
+class CoverageNode:
+    """
+    覆蓋率彙總樹的目錄節點。
+
+    說明每個節點累計其子樹內所有檔案的應補與缺漏數，並依宣告種類分開統計。
+    """
+    name: str
+    path: str
+    depth: int
+    is_package: bool = False
+    totals: dict[str, int] = field(default_factory=dict)
+    missing: dict[str, int] = field(default_factory=dict)
+    children: dict[str, "CoverageNode"] = field(default_factory=dict)
+
+
+def coverage_ratio(total: int, missing: int) -> float:
+    """
+    計算覆蓋率比例。
+
+    說明沒有任何應補宣告時視為完全覆蓋。
+
+    Args:
+        total: 應補宣告數。
+        missing: 缺漏宣告數。
+
+    Returns:
+        介於 0 與 1 的覆蓋率，取四位小數。
+    """
+    if total <= 0:
+        return 1.0
+    return round((total - missing) / total, 4)
+
+
+def build_coverage_tree(file_coverage: list[dict]) -> CoverageNode:
+    """
+    將逐檔統計彙總為目錄前綴樹。
+
+    說明每個檔案只沿路徑走訪一次並累加到各層祖先節點，總成本與路徑深度總和成正比。
+    目錄內含 `__init__.py` 時標記為 package。
+
+    Args:
+        file_coverage: 逐檔統計，含 `file`、`totals`、`missing`。
+
+    Returns:
+        根節點（路徑為 `.`）。
+    """
+    root = CoverageNode(name=".", path=".", depth=0)
+
+    for entry in file_coverage:
+        parts = entry["file"].split("/")
+        directories = parts[:-1]
+        nodes = [root]
+        node = root
+        for index, part in enumerate(directories):
+            child = node.children.get(part)
+            if child is None:
+                child = CoverageNode(name=part, path="/".join(directories[: index + 1]), depth=index + 1)
+                node.children[part] = child
+            node = child
+            nodes.append(node)
+
+        if parts[-1] == "__init__.py":
+            node.is_package = True
+
+        for current in nodes:
+            for kind, count in entry["totals"].items():
+                current.totals[kind] = current.totals.get(kind, 0) + count
+            for kind, count in entry["missing"].items():
+                current.missing[kind] = current.missing.get(kind, 0) + count
+
+    return root
+
+
+def coverage_kinds(node: CoverageNode) -> dict[str, dict]:
+    """
+    整理節點的各種類覆蓋率。
+
+    說明固定依 module、class、method、function 順序輸出，沒有宣告的種類會略過。
+
+    Args:
+        node: 覆蓋率樹節點。
+
+    Returns:
+        以宣告種類為鍵的統計資料。
+    """
+    kinds = {}
+    for kind in COVERAGE_KINDS:
+        total = node.totals.get(kind, 0)
+        if not total:
+            continue
+        missing = node.missing.get(kind, 0)
+        kinds[kind] = {"total": total, "missing": missing, "coverage": coverage_ratio(total, missing)}
+    return kinds
+
+
+def render_coverage_tree(node: CoverageNode, max_depth: Optional[int], min_missing: int) -> Optional[dict]:
+    """
+    將覆蓋率樹轉為可序列化的階層資料並套用篩選。
+
+    說明缺漏數低於門檻的節點連同子樹一起略過（子樹缺漏數不會超過父節點），
+    超過深度上限的子節點不輸出。根節點一律保留。
+
+    Args:
+        node: 覆蓋率樹節點。
+        max_depth: 最大輸出深度，None 表示不限制。
+        min_missing: 最小缺漏數門檻。
+
+    Returns:
+        節點資料；被篩選掉時回傳 None。
+    """
+    total = sum(node.totals.values())
+    missing = sum(node.missing.values())
+    if node.depth > 0 and missing < min_missing:
+        return None
+
+    children = []
+    if max_depth is None or node.depth < max_depth:
+        for name in sorted(node.children):
+            rendered = render_coverage_tree(node.children[name], max_depth, min_missing)
+            if rendered is not None:
+                children.append(rendered)
+
+    return {
+        "path": node.path,
+        "depth": node.depth,
+        "isPackage": node.is_package,
+        "total": total,
+        "missing": missing,
+        "coverage": coverage_ratio(total, missing),
+        "kinds": coverage_kinds(node),
+        "children": children,
+    }
+
+
+def flatten_coverage_tree(rendered: dict) -> list[dict]:
+    """
+    將階層資料攤平為前序排列的節點清單。
+
+    說明供 CSV 與文字輸出使用。
+
+    Args:
+        rendered: `render_coverage_tree` 產生的根節點資料。
+
+    Returns:
+        依前序排列的節點清單（不含 children 欄位）。
+    """
+    rows = []
+    stack = [rendered]
+    while stack:
+        node = stack.pop()
+        rows.append({key: value for key, value in node.items() if key != "children"})
+        stack.extend(reversed(node["children"]))
+    return rows
+
+
+def write_coverage_csv(rendered: dict) -> None:
+    """
+    以 CSV 格式輸出覆蓋率彙總。
+
+    說明每列為一個目錄節點，並附上各宣告種類的應補與缺漏數。
+
+    Args:
+        rendered: `render_coverage_tree` 產生的根節點資料。
+    """
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    header = ["path", "depth", "isPackage", "total", "missing", "coverage"]
+    for kind in COVERAGE_KINDS:
+        header.extend([f"{kind}Total", f"{kind}Missing"])
+    writer.writerow(header)
+
+    for row in flatten_coverage_tree(rendered):
+        values = [row["path"], row["depth"], row["isPackage"], row["total"], row["missing"], row["coverage"]]
+        for kind in COVERAGE_KINDS:
+            stats = row["kinds"].get(kind, {})
+            values.extend([stats.get("total", 0), stats.get("missing", 0)])
+        writer.writerow(values)
+
+
+def write_coverage_text(rendered: dict) -> None:
+    """
+    以縮排文字輸出覆蓋率彙總。
+
+    說明每層目錄縮排兩格，package 以 `[pkg]` 標示。
+
+    Args:
+        rendered: `render_coverage_tree` 產生的根節點資料。
+    """
+    sys.stdout.write("\nCoverage by directory:\n")
+    for row in flatten_coverage_tree(rendered):
+        indent = "  " * row["depth"]
+        marker = " [pkg]" if row["isPackage"] else ""
+        sys.stdout.write(
+            f"{indent}- {row['path']}{marker}: {row['coverage'] * 100:.1f}% "
+            f"({row['total'] - row['missing']}/{row['total']}, missing {row['missing']})\n"
+        )
+
+
+def load_file_coverage(report_path: str) -> dict:
+    """
+    讀取先前 `--rollup --json` 輸出的掃描報告。
+
+    說明報告需含 `fileCoverage` 欄位，才能在不重新掃描的情況下重建彙總。
+
+    Args:
+        report_path: 掃描報告 JSON 路徑。
+
+    Returns:
+        掃描報告內容。
+
+    Raises:
+        ValueError: 當報告不存在或缺少 `fileCoverage` 時拋出例外。
+    """
+    path = Path(report_path)
+    if not path.exists():
+        raise ValueError(f"Rollup report not found: {report_path}")
+    with path.open("r", encoding="utf-8") as fp:
+        report = json.load(fp)
+    if not isinstance(report.get("fileCoverage"), list):
+        raise ValueError(f"Report has no fileCoverage data (rerun with --rollup --json): {report_path}")
+    return report
+
+
+def emit_rollup(args, file_coverage: list[dict]) -> dict:
+    """
+    由逐檔統計建立覆蓋率彙總並依輸出格式寫出。
+
+    說明 `--csv` 時直接輸出 CSV；其餘情況回傳階層資料，由呼叫端決定輸出方式。
+
+    Args:
+        args: 命令列參數，使用 `depth`、`min_missing`、`csv`。
+        file_coverage: 逐檔統計。
+
+    Returns:
+        套用篩選後的階層彙總資料。
+    """
+    tree = build_coverage_tree(file_coverage)
+    rendered = render_coverage_tree(tree, args.depth, args.min_missing)
+    if args.csv:
+        write_coverage_csv(rendered)
+    return rendered
 
 
 def main() -> None:
@@ -104,17 +379,50 @@ def main() -> None:
     說明此函式的主要流程、輸入限制與輸出語意。
     """
     args = parse_args(sys.argv[1:])
+
+    if args.rollup_from:
+        report = load_file_coverage(args.rollup_from)
+        rendered = emit_rollup(args, report["fileCoverage"])
+        if args.csv:
+            return
+        if args.json:
+            sys.stdout.write(json.dumps({"root": report.get("root"), "rollup": rendered}, ensure_ascii=False, indent=2) + "\n")
+            return
+        sys.stdout.write("Python docstring coverage rollup\n")
+        sys.stdout.write(f"Report: {args.rollup_from}\n")
+        write_coverage_text(rendered)
+        return
+
     root = resolve_root(args.root)
     profile = load_style_profile(args, Path(__file__).resolve().parent)
     files = list_python_files(root)
 
     by_file = []
     all_missing = []
+    file_coverage = []
+
+    outcomes = run_file_tasks(
+        scan_file_coverage,
+        files,
+        (root, args.include_private, profile),
+        jobs=args.jobs,
+        timeout=args.file_timeout,
+        memory_mb=args.file_memory_mb,
+    )
+    skipped = summarize_skipped(outcomes, root)
 
-    for file_path in files:
-        missing = scan_file(file_path, root, args.include_private, profile)
+    for outcome in outcomes:
+        if outcome.status != "ok":
+            continue
+        rel = relative_path(outcome.file_path, root)
+        missing = outcome.result["missing"]
+        if args.rollup:
+            missing_by_kind: dict[str, int] = {}
+            for item in missing:
+                missing_by_kind[item["kind"]] = missing_by_kind.get(item["kind"], 0) + 1
+            file_coverage.append({"file": rel, "totals": outcome.result["totals"], "missing": missing_by_kind})
         if missing:
-            by_file.append({"file": relative_path(file_path, root), "missing": len(missing)})
+            by_file.append({"file": rel, "missing": len(missing)})
             all_missing.extend(missing)
 
     by_file.sort(key=lambda item: (-item["missing"], item["file"]))
@@ -130,8 +438,17 @@ def main() -> None:
         "totalMissing": len(all_missing),
         "topFiles": by_file[: args.top],
         "missing": all_missing,
+        "skippedFiles": skipped,
     }
 
+    rendered = None
+    if args.rollup:
+        rendered = emit_rollup(args, file_coverage)
+        if args.csv:
+            return
+        result["rollup"] = rendered
+        result["fileCoverage"] = file_coverage
+
     if args.json:
         sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
         return
@@ -149,6 +466,11 @@ def main() -> None:
         for entry in result["topFiles"]:
             sys.stdout.write(f"- {entry['file']}: {entry['missing']}\n")
 
+    if rendered is not None:
+        write_coverage_text(rendered)
+
+    write_skipped_report(skipped)
+
     if result["totalMissing"] > 0:
         sys.stdout.write("\nTip: run generate_docstrings.py, then refine_docstrings.py, then lint_docstrings.py.\n")
 